@@ -0,0 +1,411 @@
+import re
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import threading
+from collections import OrderedDict
+from enum import Enum
+from datetime import date, datetime
+from urllib.parse import parse_qs, urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from data_manager import get_shared_data_manager
+from task_backlog import get_shared_backlog
+from metrics_exporter import pomodoros_completed, tasks_completed
+from src.core.timer import PomodoroTimer, TimerMode
+from src.core.scheduler import get_shared_scheduler
+from src.core.session_store import TimerSync, get_shared_session_store
+from src.models.task import Task, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+REASONS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    408: "Request Timeout", 413: "Payload Too Large", 431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+# Task fields a client may set
+TASK_FIELDS = ("description", "notes", "status", "due_date")
+
+
+class HTTPError(Exception):
+    """Turned into a JSON error response with ``status``"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Task):
+        return value.to_dict()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_json(payload):
+    return json.dumps(payload, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+class PomodoroAPI:
+    """
+    Timer, task and stats operations behind the JSON API.
+
+    Handlers are plain blocking functions of ``(params, query, body)``
+    returning ``(status, payload)``; the server runs them on its executor.
+    Timers are per session id, like the app's ``?session=`` parameter, and go
+    through the same session store with compare-and-swap, so a timer started
+    here shows up in the browser and the other way round. Finished work
+    sessions are recorded by whichever process wins the swap.
+
+    Only mutating requests create a timer for a new session id. Timers are
+    kept for at most ``max_timers`` sessions and dropped after
+    ``timer_idle_timeout`` seconds without a request; a dropped timer still
+    fires from the scheduler and is rebuilt from the store on its next request.
+    """
+
+    def __init__(self, data_manager, tasks, session_store, scheduler, max_timers=1024,
+                 timer_idle_timeout=3600.0):
+        self.data_manager = data_manager
+        self.tasks = tasks
+        self.session_store = session_store
+        self.scheduler = scheduler
+        self.max_timers = max_timers
+        self.timer_idle_timeout = timer_idle_timeout
+        self._timers = OrderedDict()  # session id -> (TimerSync, last used), least recent first
+        self._timers_lock = threading.Lock()
+        # (method, path pattern, handler, blocking)
+        self.routes = [
+            ("GET", r"/health", self.health, False),
+            ("GET", r"/timers/(?P<session>[\w-]+)", self.get_timer, True),
+            ("POST", r"/timers/(?P<session>[\w-]+)/(?P<action>start|pause|reset|skip)", self.control_timer, True),
+            ("GET", r"/tasks", self.list_tasks, True),
+            ("POST", r"/tasks", self.create_task, True),
+            ("GET", r"/tasks/(?P<task_id>\d+)", self.get_task, True),
+            ("PATCH", r"/tasks/(?P<task_id>\d+)", self.update_task, True),
+            ("DELETE", r"/tasks/(?P<task_id>\d+)", self.delete_task, True),
+            ("POST", r"/tasks/(?P<task_id>\d+)/complete", self.complete_task, True),
+            ("GET", r"/stats/daily", self.daily_stats, True),
+            ("GET", r"/stats/weekly", self.weekly_summary, True),
+            ("GET", r"/stats/tasks", self.tasks_stats, True),
+        ]
+        self.routes = [(method, re.compile(pattern + "$"), handler, blocking)
+                       for method, pattern, handler, blocking in self.routes]
+
+    @staticmethod
+    def call(handler, params, query, body):
+        """Run a handler and encode its payload (on the executor for blocking ones)"""
+        status, payload = handler(params, query, body)
+        return status, encode_json(payload)
+
+    def resolve(self, method, path):
+        """``(handler, params, blocking)`` for a request; raises 404 or 405"""
+        allowed = False
+        for route_method, pattern, handler, blocking in self.routes:
+            match = pattern.match(path)
+            if match:
+                if route_method == method:
+                    return handler, match.groupdict(), blocking
+                allowed = True
+        if allowed:
+            raise HTTPError(405, f"{method} not allowed on {path}")
+        raise HTTPError(404, f"No route for {path}")
+
+    def health(self, params, query, body):
+        return 200, {"status": "ok"}
+
+    # Timers
+
+    def _timer_sync(self, session_id, create=True):
+        """The session's TimerSync; without ``create``, 404 unless it is known here or stored"""
+        now = time.monotonic()
+        with self._timers_lock:
+            entry = self._timers.pop(session_id, None)
+            if entry is not None:
+                sync = entry[0]
+            else:
+                if not create and not self.session_store.version(session_id):
+                    raise HTTPError(404, f"No timer for session {session_id}")
+                timer = PomodoroTimer()
+                sync = TimerSync(self.session_store, session_id, timer)
+                timer.on_complete(lambda timer, completed, next_mode: self._on_phase_complete(sync, completed))
+            self._timers[session_id] = (sync, now)
+            # Least recently used first: drop the overflow and idle sessions
+            while self._timers:
+                oldest, (_, last_used) = next(iter(self._timers.items()))
+                if len(self._timers) <= self.max_timers and now - last_used < self.timer_idle_timeout:
+                    break
+                del self._timers[oldest]
+        sync.pull()
+        return sync
+
+    def _on_phase_complete(self, sync, completed_mode):
+        """Timer callback (request or scheduler thread): record a finished work session once"""
+        if not sync.push():
+            return
+        if completed_mode == TimerMode.WORK:
+            self.data_manager.save_pomodoro_completed()
+            pomodoros_completed.inc()
+
+    def _timer_payload(self, sync):
+        snapshot = sync.timer.snapshot()
+        snapshot["session"] = sync.session_id
+        snapshot["version"] = sync.version
+        return snapshot
+
+    def get_timer(self, params, query, body):
+        return 200, self._timer_payload(self._timer_sync(params["session"], create=False))
+
+    def control_timer(self, params, query, body):
+        sync = self._timer_sync(params["session"])
+        getattr(sync.timer, params["action"])()
+        sync.push()
+        self.scheduler.schedule(sync.timer)
+        return 200, self._timer_payload(sync)
+
+    # Tasks
+
+    def _task(self, params):
+        task = self.tasks.get(int(params["task_id"]))
+        if task is None:
+            raise HTTPError(404, f"No task {params['task_id']}")
+        return task
+
+    def _task_fields(self, body, required=()):
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Expected a JSON object")
+        unknown = set(body) - set(TASK_FIELDS)
+        if unknown:
+            raise HTTPError(400, f"Unknown fields: {', '.join(sorted(unknown))}")
+        for name in required:
+            if not body.get(name):
+                raise HTTPError(400, f"{name} is required")
+        try:
+            # Converts status and due_date the way the store will, so bad
+            # values are rejected before anything is changed
+            Task(**dict({"description": ""}, **body))
+        except (TypeError, ValueError) as exc:
+            raise HTTPError(400, str(exc))
+        return body
+
+    def list_tasks(self, params, query, body):
+        try:
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query["limit"][0]) if "limit" in query else None
+            statuses = query.get("status") or None
+            start = query.get("start", [None])[0]
+            end = query.get("end", [None])[0]
+            total = self.tasks.count(statuses, start, end)
+            tasks = self.tasks.query(statuses, start, end, offset, limit)
+        except (KeyError, ValueError) as exc:
+            raise HTTPError(400, f"Bad query: {exc}")
+        return 200, {"total": total, "offset": offset, "tasks": tasks}
+
+    def create_task(self, params, query, body):
+        task = Task(created_at=datetime.now(), **self._task_fields(body, required=("description",)))
+        self.tasks.add(task)
+        return 201, task
+
+    def get_task(self, params, query, body):
+        return 200, self._task(params)
+
+    def update_task(self, params, query, body):
+        task = self._task(params)
+        return 200, self.tasks.update(task.id, **self._task_fields(body))
+
+    def _remove(self, params):
+        try:
+            return self.tasks.remove(int(params["task_id"]))
+        except KeyError:
+            raise HTTPError(404, f"No task {params['task_id']}")
+
+    def delete_task(self, params, query, body):
+        return 200, self._remove(params)
+
+    def complete_task(self, params, query, body):
+        """Mark done, move out of the backlog and record it in today's stats, like the app's second ✓"""
+        task = self._remove(params)
+        task.status = TaskStatus.DONE
+        task.completed_at = datetime.now()
+        self.data_manager.save_task_completed(task)
+        tasks_completed.inc()
+        return 200, task
+
+    # Stats
+
+    def daily_stats(self, params, query, body):
+        return 200, self.data_manager.load_daily_stats()
+
+    def weekly_summary(self, params, query, body):
+        return 200, self.data_manager.get_weekly_summary()
+
+    def tasks_stats(self, params, query, body):
+        return 200, self.data_manager.get_tasks_stats()
+
+
+class APIServer:
+    """
+    Minimal HTTP/1.1 JSON server on ``asyncio.start_server``.
+
+    Connections are kept alive and requests on one connection are answered
+    in order. Parsing and routing happen on the event loop; every handler
+    that touches the data layer, session store or backlog runs on a
+    ``ThreadPoolExecutor`` so file and SQLite I/O never stall other
+    connections.
+    """
+
+    def __init__(self, api, host="127.0.0.1", port=8765, max_workers=8, max_body=1 << 20,
+                 max_header=16 * 1024, keepalive_timeout=30.0):
+        self.api = api
+        self.host = host
+        self.requested_port = port
+        self.max_body = max_body
+        self.max_header = max_header
+        self.keepalive_timeout = keepalive_timeout
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="pomodoro-api")
+        self._server = None
+
+    @property
+    def port(self):
+        """Bound port (useful with port 0)"""
+        if self._server is None:
+            return self.requested_port
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.requested_port,
+                                                  limit=self.max_header)
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=True)
+
+    async def _serve(self, reader, writer):
+        """One connection: read requests until the client closes or asks to"""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.keepalive_timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    self._respond(writer, 431, encode_json({"error": REASONS[431]}), keep_alive=False)
+                    break
+                status, body, keep_alive = await self._request(head, reader)
+                self._respond(writer, status, body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _request(self, head, reader):
+        """Parse and answer one request; returns ``(status, JSON body, keep_alive)``"""
+        try:
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            method, target, version = request_line.split(" ")
+            headers = {}
+            for line in header_lines:
+                if line:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+        except ValueError:
+            return 400, encode_json({"error": "Malformed request"}), False
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        try:
+            try:
+                length = int(headers.get("content-length", "0"))
+            except ValueError:
+                length = -1
+            if length < 0:
+                # The body cannot be framed, so the connection cannot be reused
+                return 400, encode_json({"error": "Invalid Content-Length"}), False
+            if length > self.max_body:
+                raise HTTPError(413, f"Body over {self.max_body} bytes")
+            body = await reader.readexactly(length) if length else b""
+            url = urlsplit(target)
+            handler, params, blocking = self.api.resolve(method, url.path)
+            query = parse_qs(url.query)
+            try:
+                body = json.loads(body) if body else None
+            except ValueError:
+                raise HTTPError(400, "Body is not valid JSON")
+            if blocking:
+                loop = asyncio.get_running_loop()
+                return (*await loop.run_in_executor(self.executor, self.api.call, handler, params, query, body),
+                        keep_alive)
+            return (*self.api.call(handler, params, query, body), keep_alive)
+        except HTTPError as exc:
+            return exc.status, encode_json({"error": exc.message}), keep_alive and exc.status != 413
+        except asyncio.IncompleteReadError:
+            return 400, encode_json({"error": "Truncated body"}), False
+        except Exception:
+            logger.exception("API request %s %s failed", method, target)
+            return 500, encode_json({"error": REASONS[500]}), keep_alive
+
+    def _respond(self, writer, status, body, keep_alive):
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+        )
+
+
+def create_api(data_dir="data"):
+    """API over the same shared data manager, backlog, session store and scheduler the app uses"""
+    return PomodoroAPI(
+        get_shared_data_manager(data_dir, write_behind=True),
+        get_shared_backlog(data_dir),
+        get_shared_session_store(),
+        get_shared_scheduler(),
+    )
+
+
+async def serve(host, port, data_dir, max_workers):
+    api = create_api(data_dir)
+    server = await APIServer(api, host, port, max_workers=max_workers).start()
+    # First line of output; bench_api reads the port from it
+    print(f"Serving on http://{server.host}:{server.port}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+        api.data_manager.close()
+
+
+def main(argv=None):
+    """Run the API server from the command line."""
+    parser = argparse.ArgumentParser(description="Local JSON API for timers, tasks and stats")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--workers", type=int, default=8, help="Executor threads for data layer calls")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.data_dir, args.workers))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,23 @@
 import streamlit as st
+import math
 import time
+import uuid
+from functools import partial
 from datetime import timedelta, datetime, date
-import os
-import base64
-from io import BytesIO
-from PIL import Image
-from utils import get_sound_html, create_directories
-from data_manager import PomodoroDataManager
-from stats_page import show_stats_page
+from utils import get_sound_html, create_directories, fragment, rerun
+from assets import css_html
+from instrumentation import instrumentation, span
+from metrics_exporter import get_shared_exporter, pomodoros_completed, sessions, tasks_completed
+from data_manager import get_shared_data_manager
+from src.core.timer import PomodoroTimer, TimerMode
+from src.core.scheduler import get_shared_scheduler
+from src.core.session_store import TimerSync, get_shared_session_store
+from src.utils.notifications import get_shared_notifier
+from src.models.task import Task, TaskStatus
+from src.models.task_store import page_bounds
+from task_backlog import get_shared_backlog
+
+rerun_started = time.perf_counter()
 
 # Set page configuration
 st.set_page_config(
@@ -16,16 +26,27 @@ st.set_page_config(
     layout="centered",
 )
 
-# Initialize data manager
-data_manager = PomodoroDataManager()
-
-# Load CSS file
+# Shared by every session in this process so cached stats survive reruns.
+# Completions are persisted by a background writer, off the rerun path.
+data_manager = get_shared_data_manager(write_behind=True)
+# One thread completes every session's timer at its deadline, even when the
+# browser is not rerunning the script
+scheduler = get_shared_scheduler()
+# Desktop/webhook/log notifications (see POMODORO_NOTIFY_*), sent off-thread
+notifier = get_shared_notifier()
+# Timer state per session id; SQLite shared by all workers when
+# POMODORO_SESSION_STORE is set, in memory otherwise
+session_store = get_shared_session_store()
+# Prometheus text metrics on POMODORO_METRICS_PORT, off when it is unset
+metrics_exporter = get_shared_exporter(data_manager, scheduler)
+
+# Load CSS file (read once per process, see assets.py)
 def local_css(file_name):
-    with open(file_name) as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+    st.markdown(css_html(file_name), unsafe_allow_html=True)
 
 try:
-    local_css("style.css")
+    with span("rerun/css"):
+        local_css("style.css")
 except FileNotFoundError:
     # Fallback to inline CSS if file not found
     st.markdown("""
@@ -64,170 +85,126 @@ except FileNotFoundError:
     </style>
     """, unsafe_allow_html=True)
 
-# Function to get image as base64 for beep sound
-def get_base64_audio_html(audio_path):
-    """Generate base64 encoded html audio tag"""
-    with open(audio_path, "rb") as audio_file:
-        audio_bytes = audio_file.read()
-        b64 = base64.b64encode(audio_bytes).decode()
-        html = f"""
-            <audio autoplay>
-                <source src="data:audio/wav;base64,{b64}" type="audio/wav">
-            </audio>
-        """
-        return html
+def on_phase_complete(completed_phases, timer_sync, timer, completed_mode, next_mode):
+    """Timer callback: persist finished pomodoros and queue the alert"""
+    # Usually runs on the scheduler thread, where st.session_state is not
+    # available, so the session's alert list and store sync are bound in
+    # with partial()
+    if not timer_sync.push():
+        # Another worker holding this session already recorded the transition
+        return
+    if completed_mode == TimerMode.WORK:
+        data_manager.save_pomodoro_completed()
+        pomodoros_completed.inc()
+        notifier.send_notification("Pomodoro Complete", "Time for a break!")
+    else:
+        notifier.send_notification("Break Over", "Time to focus!")
+    completed_phases.append(completed_mode)
 
 # Initialize session state
-if 'timer_running' not in st.session_state:
-    st.session_state.timer_running = False
+if 'timer' not in st.session_state:
     st.session_state.work_duration = 25
     st.session_state.short_break_duration = 5
     st.session_state.long_break_duration = 15
-    st.session_state.pomodoro_count = 0
-    st.session_state.current_mode = "Work"
-    st.session_state.remaining_time = st.session_state.work_duration * 60
-    st.session_state.start_time = None
-    st.session_state.tasks = []
+    st.session_state.timer = PomodoroTimer(
+        work_duration=st.session_state.work_duration * 60,
+        break_duration=st.session_state.short_break_duration * 60,
+        long_break_duration=st.session_state.long_break_duration * 60,
+    )
+    st.session_state.completed_phases = []
+    # The session id travels in the URL, so a reload or a different worker
+    # behind the load balancer finds the same timer in the session store
+    session_id = st.query_params.get("session")
+    if not session_id:
+        session_id = uuid.uuid4().hex
+        st.query_params["session"] = session_id
+    st.session_state.timer_sync = TimerSync(session_store, session_id, st.session_state.timer)
+    st.session_state.timer.on_complete(
+        partial(on_phase_complete, st.session_state.completed_phases, st.session_state.timer_sync)
+    )
     st.session_state.completed_tasks = []
     st.session_state.show_stats = False
     st.session_state.show_add_task = False
-    st.session_state.task_statuses = ["Open", "In Progress", "Done", "Blocked"]
+    st.session_state.task_statuses = [status.value for status in TaskStatus]
+    # Pending tasks live in data_dir and survive reloads; loaded on first read
+    st.session_state.tasks = get_shared_backlog(data_manager.data_dir)
+    # Ids of tasks whose edit form is open (UI state, kept off the tasks)
+    st.session_state.editing_task_ids = set()
+    # Rows rendered per page of the pending and completed lists
+    st.session_state.task_page_size = 20
 
 # Ensure directories exist
 create_directories()
 
-# Choose which page to display
-if st.session_state.show_stats:
-    show_stats_page()
-else:
-    # App title
-    st.markdown('<div class="main-title">Pomodoro Timer</div>', unsafe_allow_html=True)
-    
-    # Display current date
-    current_date = date.today().strftime("%A, %B %d, %Y")
-    st.markdown(f'<div class="date-display">📅 {current_date}</div>', unsafe_allow_html=True)
-    
-    # Add real-time clock display with seconds - initialize with current server time
-    current_time = datetime.now().strftime("%H:%M:%S")
-    
-    # Custom JavaScript for all time-related displays - more reliable implementation
-    st.markdown(f"""
-    <div class="clock-display" id="clock">{current_time}</div>
-    <script>
-        // Initialize or get the global timers object to avoid duplicate intervals
-        window.pomodoroTimers = window.pomodoroTimers || {{}};
-        
-        // Clear any existing clock interval
-        if (window.pomodoroTimers.clockIntervalId) {{
-            clearInterval(window.pomodoroTimers.clockIntervalId);
-            window.pomodoroTimers.clockIntervalId = null;
-        }}
-        
-        // Function to update the clock
-        function updateClock() {{
-            console.log("Updating clock");
-            const now = new Date();
-            const hours = String(now.getHours()).padStart(2, '0');
-            const minutes = String(now.getMinutes()).padStart(2, '0');
-            const seconds = String(now.getSeconds()).padStart(2, '0');
-            
-            const clockElement = document.getElementById('clock');
-            if (clockElement) {{
-                clockElement.textContent = `${{hours}}:${{minutes}}:${{seconds}}`;
-                console.log("Clock updated:", `${{hours}}:${{minutes}}:${{seconds}}`);
-            }}
-        }}
-        
-        // Start the clock immediately and set interval
-        console.log("Starting clock");
-        updateClock();
-        window.pomodoroTimers.clockIntervalId = setInterval(updateClock, 1000);
-        console.log("Clock started with interval ID:", window.pomodoroTimers.clockIntervalId);
-    </script>
-    """, unsafe_allow_html=True)
-
-    # Sidebar for settings
-    with st.sidebar:
-        st.header("⚙️ Settings")
-        
-        # Timer durations
-        col1, col2 = st.columns(2)
-        with col1:
-            new_work_duration = st.number_input("Work Duration (min)", min_value=1, max_value=60, value=st.session_state.work_duration)
-        with col2:
-            new_short_break = st.number_input("Short Break (min)", min_value=1, max_value=30, value=st.session_state.short_break_duration)
-        
-        new_long_break = st.number_input("Long Break (min)", min_value=1, max_value=60, value=st.session_state.long_break_duration)
-        
-        # Apply settings if changed
-        if (new_work_duration != st.session_state.work_duration or 
-            new_short_break != st.session_state.short_break_duration or 
-            new_long_break != st.session_state.long_break_duration):
-            
-            st.session_state.work_duration = new_work_duration
-            st.session_state.short_break_duration = new_short_break
-            st.session_state.long_break_duration = new_long_break
-            
-            # Reset timer if settings changed
-            if not st.session_state.timer_running:
-                if st.session_state.current_mode == "Work":
-                    st.session_state.remaining_time = st.session_state.work_duration * 60
-                elif st.session_state.current_mode == "Short Break":
-                    st.session_state.remaining_time = st.session_state.short_break_duration * 60
-                else:  # Long Break
-                    st.session_state.remaining_time = st.session_state.long_break_duration * 60
-        
-        # Task management
-        st.header("📝 Task Management")
-        if st.button("Add New Task"):
-            st.session_state.show_add_task = True
-            st.experimental_rerun()
-        
-        # Statistics toggle
-        st.header("📊 Statistics")
-        if st.button("View Statistics"):
-            st.session_state.show_stats = True
-            st.experimental_rerun()
-
-    # Task addition form
-    if st.session_state.show_add_task:
-        st.subheader("Add New Task")
-        with st.form("add_task_form"):
-            new_task = st.text_input("Task Description")
-            col1, col2 = st.columns(2)
-            with col1:
-                task_status = st.selectbox("Status", st.session_state.task_statuses)
-            with col2:
-                due_date = st.date_input("Due Date", min_value=date.today())
-            
-            submit = st.form_submit_button("Add Task")
-            if submit and new_task:
-                # Create a task dictionary with all information
-                task = {
-                    "description": new_task,
-                    "status": task_status,
-                    "due_date": due_date.isoformat(),
-                    "created_at": datetime.now().isoformat()
-                }
-                st.session_state.tasks.append(task)
-                st.session_state.show_add_task = False
-                st.experimental_rerun()
-        
-        if st.button("Cancel"):
-            st.session_state.show_add_task = False
-            st.experimental_rerun()
+def pull_timer():
+    """Adopt timer state saved by another worker or before a restart"""
+    if st.session_state.timer_sync.pull():
+        timer = st.session_state.timer
+        st.session_state.work_duration = timer.work_duration // 60
+        st.session_state.short_break_duration = timer.break_duration // 60
+        st.session_state.long_break_duration = timer.long_break_duration // 60
+        scheduler.schedule(timer)
+
+def push_timer():
+    """Save the timer to the session store and reschedule it"""
+    st.session_state.timer_sync.push()
+    scheduler.schedule(st.session_state.timer)
+
+sessions.seen(st.session_state.timer_sync.session_id)
+pull_timer()
+
+# Timer, sidebar and task list are separate units (Streamlit fragments where
+# available): a click inside one reruns only that function, not this script.
+# Buttons use on_click callbacks so state is updated before the unit redraws
+# and no extra rerun is needed.
+
+def toggle_timer():
+    pull_timer()
+    st.session_state.timer.toggle()
+    push_timer()
+
+def reset_timer():
+    pull_timer()
+    st.session_state.timer.reset()
+    push_timer()
+
+def skip_phase():
+    # Skipping a work session still counts it (saved by on_phase_complete),
+    # but without the completion alert
+    pull_timer()
+    st.session_state.timer.skip()
+    push_timer()
+    st.session_state.completed_phases.clear()
+
+@fragment(run_every=1)
+def render_timer():
+    """Timer display and controls; also reruns every second to tick"""
+    # One version check against the session store per tick
+    pull_timer()
+    # Reading the timer advances it past any expired deadline and fires
+    # on_phase_complete, so this snapshot is all the rerun needs
+    timer_state = st.session_state.timer.snapshot()
+    current_mode = timer_state["mode"]
+    timer_running = timer_state["is_running"]
+    remaining_time = int(math.ceil(timer_state["remaining"]))
+
+    # Alert for phases that finished since the last rerun
+    if st.session_state.completed_phases:
+        st.session_state.completed_phases.clear()
+        st.markdown(get_sound_html(), unsafe_allow_html=True)
+        st.balloons()
 
     # Main container for the timer
-    mode_class = "work-mode" if st.session_state.current_mode == "Work" else "break-mode"
-    mode_emoji = "🍅" if st.session_state.current_mode == "Work" else "☕"
+    mode_class = "work-mode" if current_mode == TimerMode.WORK else "break-mode"
+    mode_emoji = "🍅" if current_mode == TimerMode.WORK else "☕"
 
     st.markdown(f'<div class="{mode_class}">', unsafe_allow_html=True)
 
     # Display current mode
-    st.markdown(f'<div class="session-info">{mode_emoji} {st.session_state.current_mode} Session</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="session-info">{mode_emoji} {current_mode.value} Session</div>', unsafe_allow_html=True)
 
     # Calculate initial timer value in HH:MM:SS format
-    hours, remainder = divmod(st.session_state.remaining_time, 3600)
+    hours, remainder = divmod(remaining_time, 3600)
     mins, secs = divmod(remainder, 60)
     timer_text = f"{hours:02d}:{mins:02d}:{secs:02d}"
     
@@ -240,8 +217,8 @@ else:
     <script>
         // Initialize or update timer variables - use the same global object
         window.pomodoroTimers = window.pomodoroTimers || {{}};
-        window.pomodoroTimers.remainingSeconds = {st.session_state.remaining_time};
-        window.pomodoroTimers.timerRunning = {str(st.session_state.timer_running).lower()};
+        window.pomodoroTimers.remainingSeconds = {remaining_time};
+        window.pomodoroTimers.timerRunning = {str(timer_running).lower()};
         
         // Clear any existing timer interval
         if (window.pomodoroTimers.timerIntervalId) {{
@@ -293,41 +270,27 @@ else:
     """, unsafe_allow_html=True)
 
     # Progress bar
-    total_seconds = 0
-    if st.session_state.current_mode == "Work":
-        total_seconds = st.session_state.work_duration * 60
-    elif st.session_state.current_mode == "Short Break":
-        total_seconds = st.session_state.short_break_duration * 60
-    else:  # Long Break
-        total_seconds = st.session_state.long_break_duration * 60
-
-    progress = 1.0 - (st.session_state.remaining_time / total_seconds) if total_seconds > 0 else 0
-    st.progress(progress)
+    total_seconds = timer_state["duration"]
+    progress = 1.0 - (timer_state["remaining"] / total_seconds) if total_seconds > 0 else 0
+    st.progress(min(max(progress, 0.0), 1.0))
 
     # Display pomodoro count
-    st.markdown(f"<div class='session-info'>Completed Pomodoros: {st.session_state.pomodoro_count}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='session-info'>Completed Pomodoros: {timer_state['sessions_completed']}</div>", unsafe_allow_html=True)
     
-    # Add debug info to verify timer status
-    if st.session_state.timer_running:
-        debug_status = "Running"
-    else:
-        debug_status = "Paused"
-    st.markdown(f"<div class='debug-info'>Timer Status: {debug_status} • Remaining Time: {st.session_state.remaining_time}s</div>", unsafe_allow_html=True)
-
     st.markdown('</div>', unsafe_allow_html=True)  # Close the mode container
 
     # Timer control buttons
     col1, col2, col3 = st.columns([1, 1, 1])
     with col1:
         button_id = "start_stop_button"
-        start_stop_text = "▶️ Start" if not st.session_state.timer_running else "⏸️ Pause"
-        start_stop_button = st.button(start_stop_text, key=button_id)
+        start_stop_text = "▶️ Start" if not timer_running else "⏸️ Pause"
+        st.button(start_stop_text, key=button_id, on_click=toggle_timer)
         
     with col2:
-        reset_button = st.button("🔄 Reset")
+        st.button("🔄 Reset", key="reset_button", on_click=reset_timer)
         
     with col3:
-        skip_button = st.button("⏭️ Skip")
+        st.button("⏭️ Skip", key="skip_button", on_click=skip_phase)
 
     # Add JavaScript to enable immediate response to button clicks
     st.markdown(f"""
@@ -370,45 +333,167 @@ else:
     </script>
     """, unsafe_allow_html=True)
 
-    # Handle button clicks
-    if start_stop_button:
-        st.session_state.timer_running = not st.session_state.timer_running
-        if st.session_state.timer_running:
-            st.session_state.start_time = time.time()
-        # Force reload to update JavaScript timer state
-        st.experimental_rerun()
-
-    if reset_button:
-        st.session_state.timer_running = False
-        if st.session_state.current_mode == "Work":
-            st.session_state.remaining_time = st.session_state.work_duration * 60
-        elif st.session_state.current_mode == "Short Break":
-            st.session_state.remaining_time = st.session_state.short_break_duration * 60
-        else:  # Long Break
-            st.session_state.remaining_time = st.session_state.long_break_duration * 60
-        # Force reload to update JavaScript timer state
-        st.experimental_rerun()
-
-    if skip_button:
-        st.session_state.timer_running = False
+    # The scheduler completes the phase at its deadline; the browser only
+    # needs to reload when its countdown reaches zero
+    if timer_running:
+        # Add JavaScript to listen for timer completion
+        st.markdown("""
+        <script>
+            // Listen for timer completion
+            window.addEventListener('message', function(e) {
+                // Check if the message is about the timer ending
+                if (e.data && e.data.type === 'timer_ended') {
+                    // Reload the page to trigger server-side timer end processing
+                    window.location.reload();
+                }
+            });
+        </script>
+        """, unsafe_allow_html=True)
+
+@fragment
+def render_sidebar():
+    """Duration settings and navigation; call inside ``with st.sidebar``"""
+    st.header("⚙️ Settings")
+    
+    # Timer durations
+    col1, col2 = st.columns(2)
+    with col1:
+        new_work_duration = st.number_input("Work Duration (min)", min_value=1, max_value=60, value=st.session_state.work_duration)
+    with col2:
+        new_short_break = st.number_input("Short Break (min)", min_value=1, max_value=30, value=st.session_state.short_break_duration)
+    
+    new_long_break = st.number_input("Long Break (min)", min_value=1, max_value=60, value=st.session_state.long_break_duration)
+    
+    # Apply settings if changed
+    if (new_work_duration != st.session_state.work_duration or 
+        new_short_break != st.session_state.short_break_duration or 
+        new_long_break != st.session_state.long_break_duration):
+        
+        st.session_state.work_duration = new_work_duration
+        st.session_state.short_break_duration = new_short_break
+        st.session_state.long_break_duration = new_long_break
         
-        # Switch modes
-        if st.session_state.current_mode == "Work":
-            st.session_state.pomodoro_count += 1
-            # Save completed pomodoro to stats
-            data_manager.save_pomodoro_completed()
+        # A running phase keeps its elapsed time and moves its deadline; the
+        # timer unit picks the change up on its next tick
+        timer = st.session_state.timer
+        timer.work_duration = new_work_duration * 60
+        timer.break_duration = new_short_break * 60
+        timer.long_break_duration = new_long_break * 60
+        push_timer()
+    
+    # Task management (the form lives in the task list unit)
+    st.header("📝 Task Management")
+    page_sizes = [10, 20, 50, 100]
+    new_page_size = st.selectbox("Tasks per page", page_sizes,
+                                 index=page_sizes.index(st.session_state.task_page_size))
+    if new_page_size != st.session_state.task_page_size:
+        st.session_state.task_page_size = new_page_size
+        rerun()
+    if st.button("Add New Task"):
+        st.session_state.show_add_task = True
+        rerun()
+    
+    # Statistics toggle
+    st.header("📊 Statistics")
+    if st.button("View Statistics"):
+        st.session_state.show_stats = True
+        rerun()
+
+def show_add_task_form():
+    st.session_state.show_add_task = True
+
+def hide_add_task_form():
+    st.session_state.show_add_task = False
+
+def start_editing(task_id):
+    st.session_state.editing_task_ids.add(task_id)
+
+def stop_editing(task_id):
+    st.session_state.editing_task_ids.discard(task_id)
+
+def task_gone(task_id):
+    """
+    Warn about a task another session completed or deleted meanwhile. Called
+    from button callbacks, after which Streamlit reruns the script anyway
+    (``st.rerun`` is a no-op there), so the list is redrawn without it.
+    """
+    stop_editing(task_id)
+    st.warning("That task was completed or deleted in another session.")
+
+def save_task_edit(task_id):
+    try:
+        st.session_state.tasks.update(
+            task_id,
+            status=st.session_state[f"status_{task_id}"],
+            due_date=st.session_state[f"due_date_{task_id}"],
+        )
+    except KeyError:
+        task_gone(task_id)
+        return
+    stop_editing(task_id)
+
+def complete_task(task_id):
+    task = st.session_state.tasks.get(task_id)
+    if task is None:
+        task_gone(task_id)
+        return
+    # If already done, move to completed tasks
+    if task.status == TaskStatus.DONE:
+        try:
+            task = st.session_state.tasks.remove(task_id)
+        except KeyError:
+            task_gone(task_id)
+            return
+        st.session_state.completed_tasks.append(task)
+        stop_editing(task_id)
+        # Save completed task to stats
+        task.completed_at = datetime.now()
+        data_manager.save_task_completed(task)
+        tasks_completed.inc()
+    # Otherwise, mark as done
+    else:
+        try:
+            st.session_state.tasks.update(task_id, status="Done")
+        except KeyError:
+            task_gone(task_id)
+
+def render_pager(key, total):
+    """
+    Page picker for a list of ``total`` rows; returns the offset of the page
+    to render. Only one page of rows is ever sent to the browser.
+    """
+    page_size = st.session_state.task_page_size
+    page, page_count, offset = page_bounds(total, st.session_state.get(key, 1), page_size)
+    if page_count > 1:
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count,
+                               value=page, key=f"{key}_input")
+        offset = (page - 1) * page_size
+    st.session_state[key] = page
+    st.caption(f"Showing {offset + 1}–{min(offset + page_size, total)} of {total}")
+    return offset
+
+@fragment
+def render_task_list():
+    """Add-task form, filters, pending and completed tasks"""
+    # Task addition form
+    if st.session_state.show_add_task:
+        st.subheader("Add New Task")
+        with st.form("add_task_form"):
+            new_task = st.text_input("Task Description")
+            col1, col2 = st.columns(2)
+            with col1:
+                task_status = st.selectbox("Status", st.session_state.task_statuses)
+            with col2:
+                due_date = st.date_input("Due Date", min_value=date.today())
             
-            if st.session_state.pomodoro_count % 4 == 0:
-                st.session_state.current_mode = "Long Break"
-                st.session_state.remaining_time = st.session_state.long_break_duration * 60
-            else:
-                st.session_state.current_mode = "Short Break"
-                st.session_state.remaining_time = st.session_state.short_break_duration * 60
-        else:  # If in a break
-            st.session_state.current_mode = "Work"
-            st.session_state.remaining_time = st.session_state.work_duration * 60
+            submit = st.form_submit_button("Add Task")
+            if submit and new_task:
+                task = Task(new_task, due_date=due_date, status=task_status, created_at=datetime.now())
+                st.session_state.tasks.add(task)
+                st.session_state.show_add_task = False
+                rerun(scope="fragment")
         
-        st.experimental_rerun()
+        st.button("Cancel", on_click=hide_add_task_form)
 
     # Task lists
     st.markdown("---")
@@ -428,59 +513,54 @@ else:
                                    ["All", "Today", "This Week", "Overdue"], 
                                    horizontal=True)
         
-        # Function to check if a task should be displayed based on filters
-        def should_display_task(task):
-            # Status filter
-            if task["status"] not in filter_status:
-                return False
-            
-            # Date filter
-            task_due_date = date.fromisoformat(task["due_date"])
-            today = date.today()
-            
-            if filter_date == "Today" and task_due_date != today:
-                return False
-            elif filter_date == "This Week":
-                # Check if the due date is within the next 7 days
-                week_from_now = today + timedelta(days=7)
-                if not (today <= task_due_date <= week_from_now):
-                    return False
-            elif filter_date == "Overdue":
-                if task_due_date >= today:
-                    return False
-            
-            return True
+        # Filters map onto the task store's indexes: statuses select index
+        # lists and due-date filters become an inclusive date range
+        today = date.today()
+        if filter_date == "Today":
+            due_range = (today, today)
+        elif filter_date == "This Week":
+            # Due within the next 7 days
+            due_range = (today, today + timedelta(days=7))
+        elif filter_date == "Overdue":
+            due_range = (None, today - timedelta(days=1))
+        else:
+            due_range = (None, None)
         
         # Pending tasks
         st.subheader("Pending Tasks")
+        # Counted from the indexes; only the current page of rows is built
+        with span("task_list/count"):
+            total = st.session_state.tasks.count(filter_status, *due_range)
         if not st.session_state.tasks:
             st.info("No pending tasks. Add a task using the sidebar.")
+        elif not total:
+            st.info("No tasks match your filter criteria.")
         else:
-            # Filter tasks
-            filtered_tasks = [task for task in st.session_state.tasks if should_display_task(task)]
-            
-            if not filtered_tasks:
-                st.info("No tasks match your filter criteria.")
+            offset = render_pager("pending_page", total)
+            # Already in due-date order
+            with span("task_list/query"):
+                page_tasks = st.session_state.tasks.query(
+                    filter_status, *due_range, offset=offset, limit=st.session_state.task_page_size
+                )
             
-            # Sort tasks by due date
-            filtered_tasks.sort(key=lambda x: date.fromisoformat(x["due_date"]))
-            
-            for idx, task in enumerate(filtered_tasks):
+            for idx, task in enumerate(page_tasks, start=offset):
+                # Keys use the stable task id so widgets keep their state
+                # when other tasks are added or removed
+                task_id = task.id
                 with st.container():
-                    st.markdown(f'<div class="task-card status-{task["status"].lower().replace(" ", "-")}">', unsafe_allow_html=True)
+                    st.markdown(f'<div class="task-card status-{task.status.value.lower().replace(" ", "-")}">', unsafe_allow_html=True)
                     
                     # Task details row
                     col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
                     
                     with col1:
-                        st.markdown(f"**{idx+1}. {task['description']}**")
+                        st.markdown(f"**{idx+1}. {task.description}**")
                     
                     with col2:
-                        due_date = date.fromisoformat(task["due_date"])
-                        due_text = due_date.strftime("%b %d")
+                        due_text = task.due_date.strftime("%b %d")
                         
                         # Highlight overdue tasks
-                        if due_date < date.today():
+                        if task.due_date < today:
                             st.markdown(f"<span class='overdue-date'>🚨 {due_text}</span>", unsafe_allow_html=True)
                         else:
                             st.write(f"📅 {due_text}")
@@ -493,122 +573,153 @@ else:
                             "Done": "🟢", 
                             "Blocked": "🔴"
                         }
-                        status_emoji = status_colors.get(task["status"], "⚪️")
-                        st.write(f"{status_emoji} {task['status']}")
+                        status_emoji = status_colors.get(task.status, "⚪️")
+                        st.write(f"{status_emoji} {task.status.value}")
                     
                     with col4:
                         # Action buttons
                         action_col1, action_col2 = st.columns(2)
                         with action_col1:
                             # Update status button
-                            if st.button("✏️", key=f"edit_{idx}"):
-                                # Show status update form for this task
-                                task["_editing"] = True
-                                st.experimental_rerun()
+                            # Show status update form for this task
+                            st.button("✏️", key=f"edit_{task_id}", on_click=start_editing, args=(task_id,))
                         
                         with action_col2:
                             # Complete/Done button
-                            if st.button("✓", key=f"done_{idx}"):
-                                # If already done, move to completed tasks
-                                if task["status"] == "Done":
-                                    st.session_state.completed_tasks.append(task)
-                                    st.session_state.tasks.remove(task)
-                                    # Save completed task to stats
-                                    data_manager.save_task_completed(task["description"])
-                                # Otherwise, mark as done
-                                else:
-                                    task["status"] = "Done"
-                                st.experimental_rerun()
+                            st.button("✓", key=f"done_{task_id}", on_click=complete_task, args=(task_id,))
                     
                     # Status update form if editing
-                    if task.get("_editing", False):
-                        new_status = st.selectbox(
+                    if task_id in st.session_state.editing_task_ids:
+                        st.selectbox(
                             "Update Status",
                             st.session_state.task_statuses,
-                            index=st.session_state.task_statuses.index(task["status"]),
-                            key=f"status_{idx}"
+                            index=st.session_state.task_statuses.index(task.status.value),
+                            key=f"status_{task_id}"
                         )
-                        new_due_date = st.date_input(
+                        st.date_input(
                             "Update Due Date",
-                            date.fromisoformat(task["due_date"]),
-                            key=f"due_date_{idx}"
+                            task.due_date,
+                            key=f"due_date_{task_id}"
                         )
                         
                         col1, col2 = st.columns(2)
                         with col1:
-                            if st.button("Save", key=f"save_{idx}"):
-                                task["status"] = new_status
-                                task["due_date"] = new_due_date.isoformat()
-                                task.pop("_editing", None)
-                                st.experimental_rerun()
+                            st.button("Save", key=f"save_{task_id}", on_click=save_task_edit, args=(task_id,))
                         with col2:
-                            if st.button("Cancel", key=f"cancel_{idx}"):
-                                task.pop("_editing", None)
-                                st.experimental_rerun()
+                            st.button("Cancel", key=f"cancel_{task_id}", on_click=stop_editing, args=(task_id,))
                     
                     st.markdown('</div>', unsafe_allow_html=True)
 
         # Add "Add Task" button at the bottom of the list
-        if st.button("➕ Add New Task", key="add_task_bottom"):
-            st.session_state.show_add_task = True
-            st.experimental_rerun()
+        st.button("➕ Add New Task", key="add_task_bottom", on_click=show_add_task_form)
 
         # Completed tasks
         st.subheader("Completed Tasks")
-        if not st.session_state.completed_tasks:
+        completed_tasks = st.session_state.completed_tasks
+        if not completed_tasks:
             st.info("No completed tasks yet.")
         else:
-            for idx, task in enumerate(st.session_state.completed_tasks):
-                description = task["description"] if isinstance(task, dict) else task
+            offset = render_pager("completed_page", len(completed_tasks))
+            page_tasks = completed_tasks[offset:offset + st.session_state.task_page_size]
+            for idx, task in enumerate(page_tasks, start=offset):
+                description = task.description
                 st.markdown(f'<div class="completed-tasks task-card">✅ {idx+1}. {description}</div>', unsafe_allow_html=True)
 
-    # Update timer
-    if st.session_state.timer_running:
-        # For server-side timer updates
-        elapsed_time = time.time() - st.session_state.start_time
-        st.session_state.remaining_time = max(0, st.session_state.remaining_time - int(elapsed_time))
-        st.session_state.start_time = time.time()
+@fragment
+def render_debug_panel():
+    """Timer status and rerun timings; shown when the URL has ?debug=1"""
+    with st.expander("🔧 Debug", expanded=True):
+        timer_state = st.session_state.timer.snapshot()
+        debug_status = "Running" if timer_state["is_running"] else "Paused"
+        remaining_time = int(math.ceil(timer_state["remaining"]))
+        st.markdown(f"<div class='debug-info'>Timer Status: {debug_status} • Remaining Time: {remaining_time}s</div>", unsafe_allow_html=True)
+
+        # Recording is process-wide: it also feeds the /metrics latency
+        # histograms, so it cannot be switched off while those are served
+        if metrics_exporter is not None:
+            st.toggle("Record timings", value=True, disabled=True,
+                      help="Always on while the metrics endpoint is running")
+        else:
+            enabled = st.toggle("Record timings", value=instrumentation.enabled,
+                                help="Applies to every session of this app process")
+            if enabled != instrumentation.enabled:
+                instrumentation.enabled = enabled
+        summary = instrumentation.summary()
+        if summary:
+            st.dataframe(
+                [{"span": name, **stats} for name, stats in summary.items()],
+                use_container_width=True,
+                hide_index=True,
+            )
+        else:
+            st.caption("No timings recorded yet.")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Export JSON", instrumentation.to_json(),
+                               file_name="pomodoro-timings.json", mime="application/json")
+        with col2:
+            st.button("Reset timings", on_click=instrumentation.reset)
+
+# Choose which page to display
+if st.session_state.show_stats:
+    # Imported on first use: the timer page never needs pandas or altair
+    from stats_page import show_stats_page
+    show_stats_page(data_manager)
+else:
+    # App title
+    st.markdown('<div class="main-title">Pomodoro Timer</div>', unsafe_allow_html=True)
+    
+    # Display current date
+    current_date = date.today().strftime("%A, %B %d, %Y")
+    st.markdown(f'<div class="date-display">📅 {current_date}</div>', unsafe_allow_html=True)
+    
+    # Add real-time clock display with seconds - initialize with current server time
+    current_time = datetime.now().strftime("%H:%M:%S")
+    
+    # Custom JavaScript for all time-related displays - more reliable implementation
+    st.markdown(f"""
+    <div class="clock-display" id="clock">{current_time}</div>
+    <script>
+        // Initialize or get the global timers object to avoid duplicate intervals
+        window.pomodoroTimers = window.pomodoroTimers || {{}};
         
-        # If timer ends
-        if st.session_state.remaining_time <= 0:
-            st.session_state.timer_running = False
-            
-            # Play notification sound using our utility function
-            st.markdown(get_sound_html(), unsafe_allow_html=True)
-            st.balloons()
-            
-            # Switch modes
-            if st.session_state.current_mode == "Work":
-                st.session_state.pomodoro_count += 1
-                # Save completed pomodoro to stats
-                data_manager.save_pomodoro_completed()
-                
-                if st.session_state.pomodoro_count % 4 == 0:
-                    st.session_state.current_mode = "Long Break"
-                    st.session_state.remaining_time = st.session_state.long_break_duration * 60
-                else:
-                    st.session_state.current_mode = "Short Break"
-                    st.session_state.remaining_time = st.session_state.short_break_duration * 60
-            else:  # If in a break
-                st.session_state.current_mode = "Work"
-                st.session_state.remaining_time = st.session_state.work_duration * 60
+        // Clear any existing clock interval
+        if (window.pomodoroTimers.clockIntervalId) {{
+            clearInterval(window.pomodoroTimers.clockIntervalId);
+            window.pomodoroTimers.clockIntervalId = null;
+        }}
+        
+        // Function to update the clock
+        function updateClock() {{
+            console.log("Updating clock");
+            const now = new Date();
+            const hours = String(now.getHours()).padStart(2, '0');
+            const minutes = String(now.getMinutes()).padStart(2, '0');
+            const seconds = String(now.getSeconds()).padStart(2, '0');
             
-            # Force page reload to reset timer
-            st.experimental_rerun()
+            const clockElement = document.getElementById('clock');
+            if (clockElement) {{
+                clockElement.textContent = `${{hours}}:${{minutes}}:${{seconds}}`;
+                console.log("Clock updated:", `${{hours}}:${{minutes}}:${{seconds}}`);
+            }}
+        }}
         
-        # Add JavaScript to listen for timer completion
-        st.markdown("""
-        <script>
-            // Listen for timer completion
-            window.addEventListener('message', function(e) {
-                // Check if the message is about the timer ending
-                if (e.data && e.data.type === 'timer_ended') {
-                    // Reload the page to trigger server-side timer end processing
-                    window.location.reload();
-                }
-            });
-        </script>
-        """, unsafe_allow_html=True)
+        // Start the clock immediately and set interval
+        console.log("Starting clock");
+        updateClock();
+        window.pomodoroTimers.clockIntervalId = setInterval(updateClock, 1000);
+        console.log("Clock started with interval ID:", window.pomodoroTimers.clockIntervalId);
+    </script>
+    """, unsafe_allow_html=True)
+
+    # Sidebar for settings
+    with st.sidebar:
+        render_sidebar()
+
+    render_timer()
+    render_task_list()
+    if st.query_params.get("debug") == "1":
+        render_debug_panel()
 
     # Add explanatory text at the bottom
     st.markdown("""
@@ -626,4 +737,6 @@ else:
     st.markdown(
         '<div class="footer">Pomodoro Timer App • Made with ❤️ using Streamlit</div>',
         unsafe_allow_html=True
-    ) 
\ No newline at end of file
+    ) 
+
+instrumentation.record("rerun/script", time.perf_counter() - rerun_started)
@@ -0,0 +1,60 @@
+import os
+import base64
+import functools
+import streamlit as st
+
+# Served by Streamlit at app/static/<name> when server.enableStaticServing is
+# on (see .streamlit/config.toml); must sit next to app.py
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+NOTIFICATION_SOUND = "notification.wav"
+
+
+@functools.lru_cache(maxsize=32)
+def _read_css(path, mtime_ns):
+    """Wrap a stylesheet in a <style> tag; keyed by mtime so edits are picked up"""
+    with open(path) as f:
+        return f"<style>{f.read()}</style>"
+
+
+def css_html(path="style.css"):
+    """
+    ``<style>`` block for ``path``, read from disk once per process.
+
+    Raises FileNotFoundError when the stylesheet is missing.
+    """
+    return _read_css(path, os.stat(path).st_mtime_ns)
+
+
+def static_serving_enabled():
+    """Whether Streamlit serves the static/ directory"""
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def static_url(name):
+    """URL of a file in static/ as served by Streamlit"""
+    return f"app/static/{name}"
+
+
+@functools.lru_cache(maxsize=None)
+def _sound_html(static_serving):
+    """Audio tag for the notification sound, built once per mode"""
+    if static_serving:
+        # A plain URL: the browser fetches the file once and then caches it
+        src = static_url(NOTIFICATION_SOUND)
+    else:
+        with open(os.path.join(STATIC_DIR, NOTIFICATION_SOUND), "rb") as f:
+            src = "data:audio/wav;base64," + base64.b64encode(f.read()).decode()
+    return f'<audio autoplay src="{src}" type="audio/wav"></audio>'
+
+
+def sound_html():
+    """
+    HTML that plays the notification sound.
+
+    Points at the statically served WAV when static serving is on and falls
+    back to an inline data URI (encoded once per process) otherwise.
+    """
+    return _sound_html(static_serving_enabled())
@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for the Pomodoro app.
+
+Each ``bench_*`` module is runnable with ``python -m benchmarks.<module>`` and
+writes a machine-readable JSON report (see ``harness.write_report``) that can
+be diffed between commits with ``python -m benchmarks.compare``.
+"""
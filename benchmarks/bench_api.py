@@ -0,0 +1,170 @@
+"""
+Load test of the JSON API server.
+
+Usage:
+    python -m benchmarks.bench_api [--connections 100] [--requests 20000]
+                                   [--endpoint health stats_daily ...] [--cpu 0]
+                                   [--output report.json]
+
+Starts ``api_server.py`` in its own process on a throwaway data directory,
+pinned to one CPU (``--cpu``, where the platform supports it), seeds a few
+tasks and a completed pomodoro, then for each endpoint has ``--connections``
+concurrent keep-alive clients send ``--requests`` requests in total.
+``throughput_per_s`` is requests answered per second of wall time and the
+latency fields are per request, including time spent queued behind other
+connections.
+"""
+
+import os
+import re
+import sys
+import time
+import json
+import shutil
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from benchmarks.harness import build_report, summarize_latencies, write_report
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> (method, path)
+ENDPOINTS = {
+    "health": ("GET", "/health"),
+    "timer": ("GET", "/timers/bench"),
+    "tasks_page": ("GET", "/tasks?status=Open&limit=20"),
+    "stats_daily": ("GET", "/stats/daily"),
+    "stats_weekly": ("GET", "/stats/weekly"),
+    "stats_tasks": ("GET", "/stats/tasks"),
+}
+
+
+def start_server(data_dir, cpu=None, workers=8):
+    """Run api_server.py on a free port; returns (process, port)"""
+    def pin():
+        if cpu is not None and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {cpu})
+
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_ROOT, "api_server.py"), "--port", "0",
+         "--data-dir", data_dir, "--workers", str(workers)],
+        cwd=REPO_ROOT,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        preexec_fn=pin if os.name == "posix" else None,
+    )
+    line = process.stdout.readline()
+    match = re.search(r":(\d+)$", line.strip())
+    if not match:
+        process.kill()
+        raise RuntimeError(f"api_server.py did not start: {line!r}")
+    return process, int(match.group(1))
+
+
+class Client:
+    """One keep-alive connection speaking just enough HTTP/1.1"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        return self
+
+    async def request(self, method, path, payload=None):
+        """Send a request; returns ``(status, decoded JSON body)``"""
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1")
+            + body
+        )
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        length = 0
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        data = await self.reader.readexactly(length)
+        return int(status_line.split(" ")[1]), json.loads(data)
+
+    def close(self):
+        self.writer.close()
+
+
+async def seed(host, port, tasks=50):
+    """Some tasks and one completed pomodoro so the stats endpoints have data"""
+    client = await Client(host, port).connect()
+    for index in range(tasks):
+        await client.request("POST", "/tasks", {"description": f"task {index}", "due_date": "2030-01-01"})
+    await client.request("POST", "/timers/bench/start")
+    await client.request("POST", "/timers/bench/skip")
+    client.close()
+
+
+async def load(host, port, method, path, connections, requests):
+    """``requests`` requests over ``connections`` concurrent connections"""
+    clients = [await Client(host, port).connect() for _ in range(connections)]
+    latencies = []
+    errors = 0
+    remaining = requests
+
+    async def worker(client):
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            status, _ = await client.request(method, path)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(client) for client in clients))
+    total = time.perf_counter() - start
+    for client in clients:
+        client.close()
+    result = summarize_latencies(latencies, total)
+    result["errors"] = errors
+    return result
+
+
+async def run(port, endpoints, connections, requests, host="127.0.0.1"):
+    await seed(host, port)
+    results = {}
+    for name in endpoints:
+        method, path = ENDPOINTS[name]
+        results[f"api/{name}/c{connections}"] = await load(host, port, method, path, connections, requests)
+    return results
+
+
+def main(argv=None):
+    """Run the API load test from the command line."""
+    parser = argparse.ArgumentParser(description="Load test the JSON API server")
+    parser.add_argument("--endpoint", nargs="+", choices=sorted(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=20000, help="Requests per endpoint")
+    parser.add_argument("--workers", type=int, default=8, help="Server executor threads")
+    parser.add_argument("--cpu", type=int, default=0, help="CPU to pin the server to (-1: no pinning)")
+    parser.add_argument("--output", "-o", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    data_dir = tempfile.mkdtemp(prefix="pomodoro-api-")
+    process, port = start_server(data_dir, None if args.cpu < 0 else args.cpu, args.workers)
+    try:
+        results = asyncio.run(run(port, args.endpoint, args.connections, args.requests))
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = build_report("api", results, parameters=vars(args))
+    write_report(report, args.output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Hammer one data directory from several writer processes at once.
+
+Usage:
+    python -m benchmarks.bench_concurrency [--writers 4] [--writes 200]
+                                           [--storage json eventlog sqlite] [--output report.json]
+
+Every writer alternates ``save_pomodoro_completed`` and ``save_task_completed``
+on the same day. The report counts what actually landed on disk (any lost
+update shows up as ``lost > 0``) and the sustained writes per second.
+"""
+
+import time
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+from datetime import date
+from data_manager import PomodoroDataManager
+from benchmarks.harness import build_report, summarize_latencies, write_report
+
+
+def _writer(data_dir, storage, day_iso, writes, start_event, results):
+    """Body of one writer process"""
+    manager = PomodoroDataManager(data_dir=data_dir, storage=storage)
+    day = date.fromisoformat(day_iso)
+    manager._today = lambda: day
+    start_event.wait()
+
+    latencies = []
+    for i in range(writes):
+        begin = time.perf_counter()
+        if i % 2 == 0:
+            manager.save_pomodoro_completed()
+        else:
+            manager.save_task_completed("Concurrent task", {"description": "Concurrent task", "status": "Done"})
+        latencies.append(time.perf_counter() - begin)
+    manager.close()
+    results.put(latencies)
+
+
+def run_writers(data_dir, storage="json", writers=4, writes=200, day=None):
+    """Run ``writers`` processes doing ``writes`` completions each and verify the totals"""
+    day = day or date.today()
+    ctx = multiprocessing.get_context()
+    start_event = ctx.Event()
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_writer, args=(data_dir, storage, day.isoformat(), writes, start_event, results))
+        for _ in range(writers)
+    ]
+    for process in processes:
+        process.start()
+
+    began = time.perf_counter()
+    start_event.set()
+    latencies = []
+    for _ in processes:
+        latencies.extend(results.get())
+    elapsed = time.perf_counter() - began
+    for process in processes:
+        process.join()
+
+    manager = PomodoroDataManager(data_dir=data_dir, storage=storage)
+    stats = manager.storage.load_day(day)
+    manager.close()
+
+    expected_pomodoros = writers * ((writes + 1) // 2)
+    expected_tasks = writers * (writes // 2)
+    counted = stats["pomodoros_completed"] + len(stats.get("completed_tasks", []))
+    result = summarize_latencies(latencies, elapsed)
+    result.update({
+        "writers": writers,
+        "expected_pomodoros": expected_pomodoros,
+        "expected_tasks": expected_tasks,
+        "pomodoros": stats["pomodoros_completed"],
+        "tasks": len(stats.get("completed_tasks", [])),
+        "lost": expected_pomodoros + expected_tasks - counted,
+        "writes_per_s": (writers * writes) / elapsed if elapsed > 0 else 0.0,
+    })
+    return result
+
+
+def main(argv=None):
+    """Run the concurrent writer benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Concurrent writers against one data directory")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=200, help="Completions per writer")
+    parser.add_argument("--storage", nargs="+", default=["json"], choices=["json", "eventlog", "sqlite"])
+    parser.add_argument("--output", "-o", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for storage in args.storage:
+        data_dir = tempfile.mkdtemp(prefix="pomodoro-concurrency-")
+        try:
+            results[f"{storage}/{args.writers}_writers"] = run_writers(
+                data_dir, storage, writers=args.writers, writes=args.writes
+            )
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = build_report("concurrency", results, parameters=vars(args))
+    write_report(report, args.output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
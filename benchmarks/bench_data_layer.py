@@ -0,0 +1,80 @@
+"""
+Benchmark PomodoroDataManager against synthetic histories.
+
+Usage:
+    python -m benchmarks.bench_data_layer [--scenarios 1_day 1_year 10_years heavy_day]
+                                          [--storage json eventlog sqlite]
+                                          [--iterations 200] [--cold] [--output report.json]
+
+Every scenario/backend pair gets a fresh data directory. Writes run first and
+append to today's stats, so reads measure a day that has just been written.
+"""
+
+import argparse
+import shutil
+import tempfile
+from data_manager import PomodoroDataManager, StatsCache
+from benchmarks.harness import build_report, measure, write_report
+from benchmarks.synthetic import SCENARIOS, build_history
+
+OPERATIONS = (
+    "save_pomodoro_completed",
+    "save_task_completed",
+    "load_daily_stats",
+    "get_tasks_stats",
+    "get_weekly_summary",
+)
+
+
+def _operation(manager, name):
+    """Zero-argument callable for a data manager operation"""
+    if name == "save_task_completed":
+        task = {"description": "Benchmark task", "status": "Done"}
+        return lambda: manager.save_task_completed(task["description"], dict(task))
+    return getattr(manager, name)
+
+
+def run_scenario(scenario, storage, iterations, cold=False):
+    """Time every operation for one scenario and backend; returns ``{name: metrics}``"""
+    data_dir = tempfile.mkdtemp(prefix=f"pomodoro-bench-{scenario}-")
+    try:
+        build_history(data_dir, scenario, storage=storage)
+        # maxsize=0 turns every lookup into a miss, i.e. a cold read
+        cache = StatsCache(maxsize=0 if cold else 128)
+        manager = PomodoroDataManager(data_dir=data_dir, storage=storage, cache=cache)
+        results = {}
+        for name in OPERATIONS:
+            results[f"{scenario}/{storage}/{name}"] = measure(_operation(manager, name), iterations)
+        manager.close()
+        return results
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    """Run the data layer benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the Pomodoro data layer")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--storage", nargs="+", default=["json"], choices=["json", "eventlog", "sqlite"])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--cold", action="store_true", help="Disable the stats cache")
+    parser.add_argument("--output", "-o", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for scenario in args.scenarios:
+        for storage in args.storage:
+            results.update(run_scenario(scenario, storage, args.iterations, cold=args.cold))
+
+    report = build_report("data_layer", results, parameters={
+        "scenarios": args.scenarios,
+        "storage": args.storage,
+        "iterations": args.iterations,
+        "cold": args.cold,
+    })
+    write_report(report, args.output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Throughput and peak memory of streaming history export and import.
+
+Usage:
+    python -m benchmarks.bench_history_io [--scenarios 1_year 10_years]
+                                          [--format csv jsonl] [--storage json sqlite]
+                                          [--output report.json]
+
+For each scenario/backend/format, the synthetic history is exported to a
+file and imported into an empty data directory once each. Results report
+wall time, rows per second and ``peak_kib``, the ``tracemalloc`` peak during
+the run. Rows are streamed, so the peak does not grow with them; what grows
+with the history is only per-day bookkeeping (the list of stored day names,
+and the rollup index of the file backends).
+"""
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+from data_manager import PomodoroDataManager, StatsCache
+from history_io import FORMATS, export_history, import_history
+from benchmarks.harness import build_report, write_report
+from benchmarks.synthetic import SCENARIOS, build_history
+
+
+def traced(func):
+    """``(result, seconds, peak KiB)`` of one call"""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak / 1024
+
+
+def run_round_trip(scenario, storage, fmt):
+    """Export a scenario's history and import it into a fresh directory"""
+    workdir = tempfile.mkdtemp(prefix=f"pomodoro-history-{scenario}-")
+    try:
+        source_dir = os.path.join(workdir, "source")
+        build_history(source_dir, scenario, storage=storage)
+        path = os.path.join(workdir, f"history.{fmt}")
+        # Small caches so the cache does not grow with the history either
+        source = PomodoroDataManager(source_dir, storage=storage, cache=StatsCache(maxsize=8))
+        rows, export_s, export_peak = traced(lambda: export_history(source, path, fmt))
+        source.close()
+
+        target = PomodoroDataManager(os.path.join(workdir, "target"), storage=storage, cache=StatsCache(maxsize=8))
+        report, import_s, import_peak = traced(lambda: import_history(target, path, fmt))
+        target.close()
+        return {
+            f"{scenario}/{storage}/{fmt}/export": {
+                "rows": rows, "total_s": export_s, "rows_per_s": rows / export_s if export_s else 0.0,
+                "peak_kib": export_peak, "file_kib": os.path.getsize(path) / 1024,
+            },
+            f"{scenario}/{storage}/{fmt}/import": {
+                "rows": rows, "total_s": import_s, "rows_per_s": rows / import_s if import_s else 0.0,
+                "peak_kib": import_peak, "days": report["days"], "invalid": report["invalid"],
+            },
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv=None):
+    """Run the history import/export benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Streaming history export/import throughput and memory")
+    parser.add_argument("--scenarios", nargs="+", default=["1_year", "10_years"], choices=list(SCENARIOS))
+    parser.add_argument("--format", nargs="+", default=["csv", "jsonl"], choices=list(FORMATS))
+    parser.add_argument("--storage", nargs="+", default=["json"], choices=["json", "eventlog", "sqlite"])
+    parser.add_argument("--output", "-o", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for scenario in args.scenarios:
+        for storage in args.storage:
+            for fmt in args.format:
+                results.update(run_round_trip(scenario, storage, fmt))
+
+    report = build_report("history_io", results, parameters=vars(args))
+    write_report(report, args.output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Per-call overhead of the instrumentation layer, disabled and enabled.
+
+Usage:
+    python -m benchmarks.bench_instrumentation [--calls 100000] [--iterations 20]
+                                               [--spans 40] [--output report.json]
+
+Each iteration makes ``--calls`` calls of a trivial function: ``bare`` calls
+it directly, ``timed`` through an ``Instrumentation.timed`` wrapper and
+``span`` inside an ``Instrumentation.span`` block, each with instrumentation
+``disabled`` and ``enabled``. ``ns_per_call`` is the median iteration time
+divided by ``--calls``; subtract ``bare`` to get the overhead.
+
+``metrics/counter_inc`` is the per-call cost of a ``metrics_exporter``
+counter increment, and ``metrics/render`` the time of one scrape of
+``--spans`` populated histograms.
+"""
+
+import argparse
+from instrumentation import Instrumentation
+from metrics_exporter import MetricsRegistry
+from benchmarks.harness import build_report, measure, write_report
+
+
+def noop():
+    return None
+
+
+def run_overhead(calls, iterations):
+    """Time bare, timed and span calls with instrumentation off and on"""
+    results = {}
+    for enabled in (False, True):
+        inst = Instrumentation(enabled=enabled)
+        wrapped = inst.timed("bench/timed")(noop)
+        state = "enabled" if enabled else "disabled"
+
+        def bare_loop():
+            for _ in range(calls):
+                noop()
+
+        def timed_loop():
+            for _ in range(calls):
+                wrapped()
+
+        def span_loop():
+            for _ in range(calls):
+                with inst.span("bench/span"):
+                    noop()
+
+        for kind, loop in (("bare", bare_loop), ("timed", timed_loop), ("span", span_loop)):
+            if kind == "bare" and enabled:
+                continue
+            name = "instrumentation/bare" if kind == "bare" else f"instrumentation/{kind}/{state}"
+            result = measure(loop, iterations)
+            result["ns_per_call"] = result["p50_ms"] * 1e6 / calls
+            results[name] = result
+    return results
+
+
+def run_metrics(calls, iterations, spans):
+    """Time counter increments and rendering a registry of ``spans`` histograms"""
+    inst = Instrumentation(enabled=True)
+    registry = MetricsRegistry(inst)
+    counter = registry.counter("bench_total", "Benchmark counter")
+    for index in range(spans):
+        for sample in range(100):
+            inst.record(f"data_manager/method_{index}", sample / 1000)
+
+    def inc_loop():
+        for _ in range(calls):
+            counter.inc()
+
+    results = {"metrics/counter_inc": measure(inc_loop, iterations)}
+    results["metrics/counter_inc"]["ns_per_call"] = results["metrics/counter_inc"]["p50_ms"] * 1e6 / calls
+    results["metrics/render"] = measure(registry.render, iterations)
+    return results
+
+
+def main(argv=None):
+    """Run the instrumentation overhead benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Instrumentation overhead per call")
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--spans", type=int, default=40, help="Histograms in the metrics render benchmark")
+    parser.add_argument("--output", "-o", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run_overhead(args.calls, args.iterations)
+    results.update(run_metrics(args.calls, args.iterations, args.spans))
+    report = build_report("instrumentation", results, parameters=vars(args))
+    write_report(report, args.output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
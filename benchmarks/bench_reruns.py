@@ -0,0 +1,93 @@
+"""
+Measure what each UI interaction in app.py costs to rerun.
+
+Usage:
+    python -m benchmarks.bench_reruns [--iterations 20] [--output report.json]
+
+Drives ``app.py`` headlessly with Streamlit's ``AppTest`` and clicks each
+control. For every interaction the report has two entries:
+
+* ``full_script``: wall time of rerunning the whole script, which is what
+  every click cost before the page was split into units (and still costs on
+  Streamlit versions without fragments);
+* ``unit``: render time of the unit that owns the widget (``render_timer``,
+  ``render_task_list``), which is all that reruns when fragments are in use.
+
+The app runs in a temporary working directory so its ``data/`` files are
+throwaway.
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from benchmarks.harness import build_report, summarize_latencies, write_report
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# name -> (widget key, unit that owns it)
+INTERACTIONS = {
+    "start_pause": ("start_stop_button", "render_timer"),
+    "reset": ("reset_button", "render_timer"),
+    "skip": ("skip_button", "render_timer"),
+    "add_task_form": ("add_task_bottom", "render_task_list"),
+}
+
+
+def run_interactions(iterations=20, timeout=30):
+    """Click every control ``iterations`` times; returns {name: {full_script, unit}}"""
+    # Imported here so the other benchmarks do not need Streamlit installed
+    from streamlit.testing.v1 import AppTest
+
+    app_test = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    app_test.run()
+    measured = {}
+    for name, (key, unit) in INTERACTIONS.items():
+        full, partial = [], []
+        for _ in range(iterations):
+            app_test.button(key=key).click()
+            start = time.perf_counter()
+            app_test.run()
+            full.append(time.perf_counter() - start)
+            partial.append(app_test.session_state["unit_timings"][unit])
+            # Put the form away again so every click does the same work
+            app_test.session_state["show_add_task"] = False
+        measured[name] = {
+            "full_script": summarize_latencies(full),
+            "unit": summarize_latencies(partial),
+        }
+    return measured
+
+
+def main(argv=None):
+    """Run the rerun benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Rerun cost per interaction in app.py")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--output", "-o", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    repo_root = os.path.dirname(APP_PATH)
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+    workdir = tempfile.mkdtemp(prefix="pomodoro-reruns-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        measured = run_interactions(args.iterations)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {}
+    for name, entries in measured.items():
+        for kind, result in entries.items():
+            results[f"reruns/{name}/{kind}"] = result
+    report = build_report("reruns", results, parameters=vars(args))
+    write_report(report, args.output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Run thousands of concurrent timers through one TimerScheduler.
+
+Usage:
+    python -m benchmarks.bench_scheduler [--timers 10000] [--spread 2.0]
+                                         [--cancel-fraction 0.1] [--output report.json]
+
+Every timer gets a work phase of random length up to ``--spread`` seconds and
+is scheduled on a single scheduler thread; a fraction is cancelled and
+rescheduled to exercise lazy deletion. The report has per-call latencies for
+``schedule`` and ``cancel``, the firing lag (how late each completion callback
+ran after its deadline), duplicate or missing completions, and the CPU time
+the process used per wall-clock second while the timers were firing.
+"""
+
+import time
+import random
+import argparse
+import threading
+from src.core.timer import PomodoroTimer
+from src.core.scheduler import TimerScheduler
+from benchmarks.harness import build_report, summarize_latencies, write_report
+
+
+def run_timers(timers=10000, spread=2.0, cancel_fraction=0.1, seed=0):
+    """Schedule ``timers`` timers, wait for all of them to fire and report the costs"""
+    rng = random.Random(seed)
+    scheduler = TimerScheduler()
+    lags = []
+    completions = {}
+    lock = threading.Lock()
+    all_fired = threading.Event()
+
+    def on_complete(timer, completed_mode, next_mode):
+        lag = time.monotonic() - timer.expected_deadline
+        with lock:
+            lags.append(max(0.0, lag))
+            completions[id(timer)] = completions.get(id(timer), 0) + 1
+            if len(lags) >= timers:
+                all_fired.set()
+
+    pool = []
+    for _ in range(timers):
+        # Short padding so scheduling finishes before the first deadline
+        timer = PomodoroTimer(work_duration=0.5 + rng.random() * spread)
+        timer.on_complete(on_complete)
+        pool.append(timer)
+
+    schedule_latencies = []
+    for timer in pool:
+        timer.start()
+        timer.expected_deadline = timer.deadline
+        begin = time.perf_counter()
+        scheduler.schedule(timer)
+        schedule_latencies.append(time.perf_counter() - begin)
+
+    cancel_latencies = []
+    for timer in rng.sample(pool, int(timers * cancel_fraction)):
+        begin = time.perf_counter()
+        scheduler.cancel(timer)
+        cancel_latencies.append(time.perf_counter() - begin)
+        scheduler.schedule(timer)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    scheduler.start()
+    finished = all_fired.wait(timeout=spread + 30)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    scheduler.stop()
+
+    fire_lag = summarize_latencies(lags, wall)
+    fire_lag.update({
+        "timers": timers,
+        "completed": finished,
+        "fired": len(lags),
+        "duplicates": sum(count - 1 for count in completions.values()),
+        "missing": timers - len(completions),
+        "cpu_s": cpu,
+        "wall_s": wall,
+        "cpu_per_wall_s": cpu / wall if wall > 0 else 0.0,
+    })
+    return {
+        "schedule": summarize_latencies(schedule_latencies),
+        "cancel": summarize_latencies(cancel_latencies),
+        "fire_lag": fire_lag,
+    }
+
+
+def main(argv=None):
+    """Run the scheduler benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Many concurrent timers on one scheduler thread")
+    parser.add_argument("--timers", type=int, default=10000)
+    parser.add_argument("--spread", type=float, default=2.0, help="Deadlines are spread over this many seconds")
+    parser.add_argument("--cancel-fraction", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    measured = run_timers(args.timers, args.spread, args.cancel_fraction, args.seed)
+    results = {f"scheduler/{args.timers}_timers/{op}": result for op, result in measured.items()}
+    report = build_report("scheduler", results, parameters=vars(args))
+    write_report(report, args.output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
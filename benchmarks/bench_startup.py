@@ -0,0 +1,164 @@
+"""
+Cold-start import time and first-render latency of each entry point.
+
+Usage:
+    python -m benchmarks.bench_startup [--entry app stats_page main cli] [--runs 5]
+                                       [--no-render] [--output report.json]
+
+``cold_start`` runs the entry script in a fresh interpreter with
+``python -X importtime`` (Streamlit's bare mode, no server) and reports the
+process wall time and ``import_time``, the total import time parsed from the
+importtime log. The report also lists which of the known heavy packages
+(pandas, altair, plotly, PIL, numpy) the script imported, and the slowest
+top-level imports, so a dependency creeping back onto the startup path shows
+up in the diff. ``first_render`` times the first ``AppTest`` run of the page,
+which includes the imports done in-process. The headless ``cli`` entry point
+(``src/cli.py status``) has no page, so only its cold start is measured.
+
+Every run happens in a temporary working directory so ``data/`` files are
+throwaway.
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from benchmarks.harness import build_report, summarize_latencies, write_report
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> (script and arguments run by cold_start, AppTest source for first_render)
+ENTRY_POINTS = {
+    "app": (["app.py"], None),
+    "stats_page": (["stats_page.py"], "from stats_page import show_stats_page\nshow_stats_page()\n"),
+    "main": ([os.path.join("src", "main.py")], None),
+    "cli": ([os.path.join("src", "cli.py"), "status"], None),
+}
+
+# Entry points that are not Streamlit pages, so have no first render
+HEADLESS = {"cli"}
+
+HEAVY_PACKAGES = ("pandas", "altair", "plotly", "PIL", "numpy")
+
+
+def _importtime_entries(log):
+    """``(module, cumulative seconds)`` per importtime line; nested modules keep their indent"""
+    for line in log.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            # The header line
+            continue
+        yield fields[2][1:], int(fields[1]) / 1e6
+
+
+def parse_importtime(log):
+    """
+    ``{top-level module: cumulative seconds}`` from ``-X importtime`` output.
+
+    Nested imports are indented under their importer and already counted in
+    its cumulative time, so only unindented entries are kept.
+    """
+    return {name: seconds for name, seconds in _importtime_entries(log) if not name.startswith(" ")}
+
+
+def imported_modules(log):
+    """Every module named in an importtime log, nested ones included"""
+    return {name.strip() for name, _ in _importtime_entries(log)}
+
+
+def cold_start(script, workdir, python=sys.executable, args=()):
+    """Run ``script`` once in a fresh interpreter; returns (wall seconds, importtime log)"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    start = time.perf_counter()
+    result = subprocess.run(
+        [python, "-X", "importtime", script, *args],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        tail = "\n".join(line for line in result.stderr.splitlines()
+                         if not line.startswith("import time:"))[-2000:]
+        raise RuntimeError(f"{script} exited with {result.returncode}:\n{tail}")
+    return elapsed, result.stderr
+
+
+def measure_cold_start(script, runs, workdir, top=10, args=()):
+    """Cold-start ``script`` ``runs`` times; returns report entries"""
+    wall, totals, heavy, slowest = [], [], set(), {}
+    for _ in range(runs):
+        elapsed, log = cold_start(script, workdir, args=args)
+        imports = parse_importtime(log)
+        wall.append(elapsed)
+        totals.append(sum(imports.values()))
+        heavy.update(name for name in imported_modules(log) if name.split(".")[0] in HEAVY_PACKAGES)
+        for name, seconds in imports.items():
+            slowest[name] = max(slowest.get(name, 0.0), seconds)
+    import_time = summarize_latencies(totals)
+    import_time["heavy_packages"] = sorted({name.split(".")[0] for name in heavy})
+    import_time["slowest_ms"] = {
+        name: seconds * 1000
+        for name, seconds in sorted(slowest.items(), key=lambda item: -item[1])[:top]
+    }
+    return {"cold_start": summarize_latencies(wall), "import_time": import_time}
+
+
+def measure_first_render(script, source, timeout=60):
+    """Time the first ``AppTest`` run of an entry point"""
+    # Imported here so the import-time measurements run without it loaded
+    from streamlit.testing.v1 import AppTest
+
+    if source is not None:
+        app_test = AppTest.from_string(source, default_timeout=timeout)
+    else:
+        app_test = AppTest.from_file(os.path.join(REPO_ROOT, script), default_timeout=timeout)
+    start = time.perf_counter()
+    app_test.run()
+    return summarize_latencies([time.perf_counter() - start])
+
+
+def main(argv=None):
+    """Run the startup benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Cold-start import time and first render per entry point")
+    parser.add_argument("--entry", nargs="+", choices=sorted(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-render", dest="render", action="store_false",
+                        help="Skip the AppTest first-render measurement")
+    parser.add_argument("--output", "-o", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    workdir = tempfile.mkdtemp(prefix="pomodoro-startup-")
+    cwd = os.getcwd()
+    results = {}
+    try:
+        for name in args.entry:
+            (script, *script_args), source = ENTRY_POINTS[name]
+            entries = measure_cold_start(os.path.join(REPO_ROOT, script), args.runs, workdir, args=script_args)
+            if args.render and name not in HEADLESS:
+                os.chdir(workdir)
+                try:
+                    entries["first_render"] = measure_first_render(script, source)
+                finally:
+                    os.chdir(cwd)
+            for kind, result in entries.items():
+                results[f"startup/{name}/{kind}"] = result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = build_report("startup", results, parameters=vars(args))
+    write_report(report, args.output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Cost of persisting one task change as the backlog grows.
+
+Usage:
+    python -m benchmarks.bench_task_backlog [--tasks 100 10000] [--iterations 50]
+                                            [--no-fsync] [--output report.json]
+
+For each backlog size, ``rewrite`` saves a change the straightforward way:
+serialize the whole pending list and atomically replace ``tasks.json``.
+``append`` is ``TaskBacklog``, which appends one change record. Adding,
+editing and completing a task are timed separately, as is ``load``: replaying
+the log into a fresh backlog (what the first session after a restart pays).
+"""
+
+import os
+import json
+import shutil
+import argparse
+import tempfile
+from benchmarks.harness import build_report, measure, write_report
+from benchmarks.bench_task_store import synthetic_tasks
+from file_locking import atomic_write_text
+from src.models.task import Task
+from task_backlog import TaskBacklog
+
+
+def rewrite_all(path, tasks, fsync):
+    """Persist the whole pending list in one file"""
+    atomic_write_text(path, json.dumps([task.to_dict() for task in tasks.values()]), fsync=fsync)
+
+
+def run_backlog(count, iterations, fsync, seed=0):
+    """Time add/edit/complete both ways for a backlog of ``count`` tasks"""
+    workdir = tempfile.mkdtemp(prefix="pomodoro-backlog-")
+    try:
+        backlog = TaskBacklog(os.path.join(workdir, "log"), fsync=fsync,
+                              compact_min_records=10 * (count + iterations))
+        tasks = {}
+        for record in synthetic_tasks(count, seed):
+            task = Task.from_dict(record)
+            backlog.add(task)
+            tasks[task.id] = task
+        path = os.path.join(workdir, "tasks.json")
+
+        results = {}
+        ids = list(tasks)
+
+        def rewrite_add():
+            task = Task("New task", id=len(tasks) + 1)
+            tasks[task.id] = task
+            rewrite_all(path, tasks, fsync)
+
+        def rewrite_edit():
+            tasks[ids[0]].notes = "edited"
+            rewrite_all(path, tasks, fsync)
+
+        def rewrite_complete():
+            tasks.pop(ids.pop())
+            rewrite_all(path, tasks, fsync)
+
+        results[f"{count}_tasks/rewrite/add"] = measure(rewrite_add, iterations)
+        results[f"{count}_tasks/rewrite/edit"] = measure(rewrite_edit, iterations)
+        results[f"{count}_tasks/rewrite/complete"] = measure(rewrite_complete, iterations)
+
+        ids = [task.id for task in backlog]
+        results[f"{count}_tasks/append/add"] = measure(lambda: backlog.add(Task("New task")), iterations)
+        results[f"{count}_tasks/append/edit"] = measure(
+            lambda: backlog.update(ids[0], notes="edited"), iterations
+        )
+        results[f"{count}_tasks/append/complete"] = measure(lambda: backlog.remove(ids.pop()), iterations)
+        results[f"{count}_tasks/append/load"] = measure(
+            lambda: len(TaskBacklog(backlog.data_dir)), max(1, iterations // 10)
+        )
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main(argv=None):
+    """Run the task backlog benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Task persistence: full rewrite vs change log")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100, 10000])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--no-fsync", dest="fsync", action="store_false")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for count in args.tasks:
+        results.update(run_backlog(count, args.iterations, args.fsync, args.seed))
+    report = build_report("task_backlog", results, parameters=vars(args))
+    write_report(report, args.output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
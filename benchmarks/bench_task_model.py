@@ -0,0 +1,118 @@
+"""
+Memory and per-render cost of the Task model against the old task dicts.
+
+Usage:
+    python -m benchmarks.bench_task_model [--tasks 10000] [--iterations 20]
+                                          [--output report.json]
+
+``memory/<format>`` reports the bytes allocated per task (via ``tracemalloc``)
+for ``--tasks`` tasks held as the free-form dicts app.py used to keep
+(ISO date strings, status strings) and as slotted ``Task`` instances.
+``render/<format>`` times what one task list render needs from every task:
+its due date as a date (parsed from the string for dicts), the overdue check
+and its status. ``serialize`` and ``deserialize`` time ``Task.to_dict`` and
+``Task.from_dict`` over all tasks.
+"""
+
+import random
+import argparse
+import tracemalloc
+from datetime import date, datetime, timedelta
+from src.models.task import Task, TaskStatus
+from benchmarks.harness import build_report, measure, write_report
+
+TODAY = date(2025, 3, 25)
+
+
+def legacy_tasks(count, seed=0):
+    """Task dicts as app.py built them before the Task model"""
+    rng = random.Random(seed)
+    created = datetime(2025, 1, 1)
+    return [
+        {
+            "description": f"Task {i}",
+            "status": rng.choice(list(TaskStatus)).value,
+            "due_date": (TODAY + timedelta(days=rng.randint(-60, 60))).isoformat(),
+            "created_at": (created + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def allocated_bytes(build):
+    """Bytes still allocated by whatever ``build()`` returns"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def render_dicts(tasks):
+    """Per-task work of a render with dict tasks"""
+    overdue = 0
+    for task in tasks:
+        due = date.fromisoformat(task["due_date"])
+        due.strftime("%b %d")
+        if date.fromisoformat(task["due_date"]) < TODAY:
+            overdue += 1
+        task["status"].lower()
+    return overdue
+
+
+def render_tasks(tasks):
+    """Per-task work of a render with Task instances"""
+    overdue = 0
+    for task in tasks:
+        task.due_date.strftime("%b %d")
+        if task.due_date < TODAY:
+            overdue += 1
+        task.status.value.lower()
+    return overdue
+
+
+def run_model(count, iterations, seed=0):
+    """Measure memory and render/serialization costs; returns report results"""
+    # Both formats are built from scratch so each is charged for its own strings;
+    # the intermediate dicts behind the Task list are freed before measuring
+    dict_bytes = allocated_bytes(lambda: legacy_tasks(count, seed))
+    task_bytes = allocated_bytes(lambda: [Task.from_dict(task) for task in legacy_tasks(count, seed)])
+    dicts = legacy_tasks(count, seed)
+    tasks = [Task.from_dict(task) for task in dicts]
+    assert render_dicts(dicts) == render_tasks(tasks)
+
+    return {
+        f"{count}_tasks/memory/dict": {"bytes_total": dict_bytes, "bytes_per_task": dict_bytes / count},
+        f"{count}_tasks/memory/task": {
+            "bytes_total": task_bytes,
+            "bytes_per_task": task_bytes / count,
+            "reduction": 1 - task_bytes / dict_bytes if dict_bytes else 0.0,
+        },
+        f"{count}_tasks/render/dict": measure(lambda: render_dicts(dicts), iterations),
+        f"{count}_tasks/render/task": measure(lambda: render_tasks(tasks), iterations),
+        f"{count}_tasks/serialize/task": measure(lambda: [task.to_dict() for task in tasks], iterations),
+        f"{count}_tasks/deserialize/task": measure(lambda: [Task.from_dict(task) for task in dicts], iterations),
+    }
+
+
+def main(argv=None):
+    """Run the task model benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Task model memory and render cost")
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run_model(args.tasks, args.iterations, args.seed)
+    report = build_report("task_model", results, parameters=vars(args))
+    write_report(report, args.output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
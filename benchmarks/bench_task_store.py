@@ -0,0 +1,115 @@
+"""
+Compare task list filtering by scanning a list against the TaskStore indexes.
+
+Usage:
+    python -m benchmarks.bench_task_store [--tasks 10000] [--iterations 50]
+                                          [--page-size 20]
+                                          [--output report.json]
+
+``list_scan`` reproduces what app.py did on every rerun before the store:
+check each task against the status and due-date filters (parsing its ISO due
+date) and sort the survivors by parsed due date. ``task_store`` answers the
+same filter from the status and due-date indexes, and ``task_store_page``
+builds just one page of it (``--page-size`` rows from the middle of the
+results), which is all the task list renders. Completing a task (list
+``remove`` versus ``TaskStore.remove``) is timed as well.
+"""
+
+import random
+import argparse
+from datetime import date, timedelta
+from src.models.task import Task
+from src.models.task_store import DEFAULT_STATUSES, TaskStore
+from benchmarks.harness import build_report, measure, write_report
+
+TODAY = date(2025, 3, 25)
+
+FILTERS = {
+    "all": (list(DEFAULT_STATUSES), None, None),
+    "this_week": (list(DEFAULT_STATUSES), TODAY, TODAY + timedelta(days=7)),
+    "open_overdue": (["Open"], None, TODAY - timedelta(days=1)),
+}
+
+
+def synthetic_tasks(count, seed=0):
+    """``count`` task dicts (the pre-Task format) with random statuses and due dates around TODAY"""
+    rng = random.Random(seed)
+    return [
+        {
+            "description": f"Task {i}",
+            "status": rng.choice(DEFAULT_STATUSES).value,
+            "due_date": (TODAY + timedelta(days=rng.randint(-60, 60))).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def scan_filter(tasks, statuses, start, end):
+    """The pre-index filter: per-task checks, then a sort by parsed due date"""
+    selected = []
+    for task in tasks:
+        if task["status"] not in statuses:
+            continue
+        due = date.fromisoformat(task["due_date"])
+        if start is not None and due < start:
+            continue
+        if end is not None and due > end:
+            continue
+        selected.append(task)
+    selected.sort(key=lambda task: date.fromisoformat(task["due_date"]))
+    return selected
+
+
+def run_filters(count, iterations, seed=0, page_size=20):
+    """Time every filter both ways plus task completion; returns report results"""
+    tasks = synthetic_tasks(count, seed)
+    store = TaskStore()
+    for task in tasks:
+        store.add(Task.from_dict(task))
+
+    results = {}
+    for name, (statuses, start, end) in FILTERS.items():
+        expected = len(scan_filter(tasks, statuses, start, end))
+        assert store.count(statuses, start, end) == expected
+        results[f"{count}_tasks/list_scan/{name}"] = measure(
+            lambda: scan_filter(tasks, statuses, start, end), iterations
+        )
+        results[f"{count}_tasks/task_store/{name}"] = measure(
+            lambda: list(store.query(statuses, start, end)), iterations
+        )
+        offset = (expected // 2) // page_size * page_size
+        results[f"{count}_tasks/task_store_page/{name}"] = measure(
+            lambda: list(store.query(statuses, start, end, offset, page_size)), iterations
+        )
+
+    rng = random.Random(seed)
+    victims = rng.sample(range(1, count + 1), min(iterations, count))
+    remaining_list = list(tasks)
+    results[f"{count}_tasks/list_scan/complete"] = measure(
+        lambda: remaining_list.remove(tasks[victims.pop() - 1]), len(victims)
+    )
+    victims = rng.sample(range(1, count + 1), min(iterations, count))
+    results[f"{count}_tasks/task_store/complete"] = measure(
+        lambda: store.remove(victims.pop()), len(victims)
+    )
+    return results
+
+
+def main(argv=None):
+    """Run the task store benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Task filtering: list scan vs TaskStore")
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--output", "-o", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run_filters(args.tasks, args.iterations, args.seed, args.page_size)
+    report = build_report("task_store", results, parameters=vars(args))
+    write_report(report, args.output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare two benchmark reports and flag regressions.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--metric p50_ms] [--threshold 0.2]
+
+Exits with status 1 if any shared benchmark got slower by more than the
+threshold (a fraction, 0.2 = 20%).
+"""
+
+import sys
+import json
+import argparse
+
+
+def compare_reports(baseline, candidate, metric="p50_ms", threshold=0.2):
+    """Return ``(name, old, new, change)`` rows for benchmarks present in both reports"""
+    rows = []
+    for name, old in sorted(baseline["results"].items()):
+        new = candidate["results"].get(name)
+        if new is None or metric not in old or metric not in new:
+            continue
+        change = (new[metric] - old[metric]) / old[metric] if old[metric] else 0.0
+        rows.append((name, old[metric], new[metric], change))
+    regressions = [row for row in rows if row[3] > threshold]
+    return rows, regressions
+
+
+def main(argv=None):
+    """Print a comparison table of two reports."""
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON reports")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", default="p50_ms")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    rows, regressions = compare_reports(baseline, candidate, args.metric, args.threshold)
+    for name, old, new, change in rows:
+        marker = "  REGRESSION" if change > args.threshold else ""
+        print(f"{name:60s} {old:10.3f} -> {new:10.3f} {change:+7.1%}{marker}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Timing helpers and the JSON report format shared by all benchmarks."""
+
+import os
+import sys
+import json
+import math
+import time
+import platform
+import subprocess
+from datetime import datetime
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize_latencies(latencies, total_seconds=None):
+    """Turn a list of per-call latencies (seconds) into report fields"""
+    latencies = sorted(latencies)
+    total_seconds = total_seconds if total_seconds is not None else sum(latencies)
+    count = len(latencies)
+    return {
+        "iterations": count,
+        "total_s": total_seconds,
+        "throughput_per_s": count / total_seconds if total_seconds > 0 else 0.0,
+        "mean_ms": (sum(latencies) / count * 1000) if count else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def measure(func, iterations, setup=None):
+    """
+    Call ``func`` ``iterations`` times and report throughput and latency.
+
+    ``setup`` runs before every call and is not included in the timings.
+    """
+    latencies = []
+    total = 0.0
+    for _ in range(iterations):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        latencies.append(elapsed)
+        total += elapsed
+    return summarize_latencies(latencies, total)
+
+
+def _git_commit():
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+            check=True
+        )
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return None
+    return result.stdout.strip()
+
+
+def build_report(suite, results, parameters=None):
+    """Wrap benchmark results with the metadata needed to compare runs"""
+    return {
+        "suite": suite,
+        "created_at": datetime.now().isoformat(),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": parameters or {},
+        "results": results,
+    }
+
+
+def write_report(report, output=None):
+    """Write a report as JSON to ``output`` (a path) or stdout"""
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
@@ -0,0 +1,80 @@
+"""Synthetic stats histories for benchmarking the data layer."""
+
+import os
+import json
+import random
+from datetime import date, datetime, time, timedelta
+from rollup_index import DEFAULT_STATUSES
+from storage import SQLiteStorage
+
+# name -> (number of days of history, tasks completed per day)
+SCENARIOS = {
+    "1_day": (1, 5),
+    "1_year": (365, 5),
+    "10_years": (3650, 5),
+    "heavy_day": (1, 5000),
+}
+
+
+def synthetic_day(day, tasks_per_day, rng):
+    """Build one day's stats dict in the format the app writes"""
+    pomodoros = rng.randint(0, 12)
+    day_start = datetime.combine(day, time(9, 0))
+    stats = {
+        "date": day.isoformat(),
+        "pomodoros_completed": pomodoros,
+        "last_completed": (day_start + timedelta(minutes=30 * pomodoros)).isoformat() if pomodoros else None,
+    }
+    if tasks_per_day:
+        stats["completed_tasks"] = [
+            {
+                "description": f"Synthetic task {i}",
+                "status": rng.choice(DEFAULT_STATUSES),
+                "due_date": day.isoformat(),
+                "completed_at": (day_start + timedelta(seconds=i)).isoformat(),
+            }
+            for i in range(tasks_per_day)
+        ]
+    return stats
+
+
+def iter_history(days, tasks_per_day, end=None, seed=0):
+    """Yield ``days`` consecutive daily stats dicts ending at ``end`` (default today)"""
+    rng = random.Random(seed)
+    end = end or date.today()
+    for offset in range(days - 1, -1, -1):
+        yield synthetic_day(end - timedelta(days=offset), tasks_per_day, rng)
+
+
+def build_history(data_dir, scenario, storage="json", end=None, seed=0):
+    """
+    Populate ``data_dir`` with a scenario's history in a backend's native layout.
+
+    Returns the number of days written.
+    """
+    days, tasks_per_day = SCENARIOS[scenario]
+    os.makedirs(data_dir, exist_ok=True)
+    history = iter_history(days, tasks_per_day, end=end, seed=seed)
+
+    if storage == "sqlite":
+        target = SQLiteStorage(data_dir)
+        try:
+            for stats in history:
+                target.import_day(stats)
+        finally:
+            target.close()
+        return days
+
+    for stats in history:
+        if storage == "eventlog":
+            path = os.path.join(data_dir, f"events_{stats['date']}.jsonl")
+            with open(path, "w") as f:
+                for _ in range(stats["pomodoros_completed"]):
+                    f.write(json.dumps({"type": "pomodoro", "completed_at": stats["last_completed"]}) + "\n")
+                for task in stats.get("completed_tasks", []):
+                    f.write(json.dumps({"type": "task", "task": task}) + "\n")
+        else:
+            path = os.path.join(data_dir, f"stats_{stats['date']}.json")
+            with open(path, "w") as f:
+                json.dump(stats, f)
+    return days
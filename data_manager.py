@@ -1,68 +1,285 @@
 import os
-import json
+import threading
+from collections import OrderedDict
 from datetime import datetime, date, timedelta
+from event_log import copy_stats, pomodoro_event, task_event
+from storage import JsonFileStorage, StatsStorage, create_storage
+from write_behind import WriteBehindQueue
+from instrumentation import instrumentation
+
+
+class StatsCache:
+    """
+    Process-wide LRU cache of parsed daily stats files.
+
+    Entries are keyed by file path and validated against the file's mtime,
+    ctime, size and inode on every lookup, so a file rewritten by another
+    process (or atomically replaced) is re-read, while unchanged files skip
+    the disk read and JSON decoding entirely. Cached stats are shared between sessions and
+    must be treated as read-only; ``get`` returns a shallow copy.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def signature(path):
+        """Validation key for a file, or None if it does not exist"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino)
+
+    def get(self, path, loader):
+        """Return the parsed file at ``path``, calling ``loader(path)`` on a miss"""
+        signature = self.signature(path)
+        if signature is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return copy_stats(entry[1])
+            self.misses += 1
+
+        value = loader(path)
+        self.put(path, value, signature)
+        return copy_stats(value)
+
+    def put(self, path, value, signature=None):
+        """Store a freshly written value so the writer's next read is a hit"""
+        signature = signature or self.signature(path)
+        if signature is None:
+            return
+        with self._lock:
+            self._entries[path] = (signature, value)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path=None):
+        """Drop one path, or everything when ``path`` is None"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def info(self):
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+# Shared by every PomodoroDataManager in the process (all Streamlit sessions)
+stats_cache = StatsCache()
+
+_shared_managers = {}
+_shared_managers_lock = threading.Lock()
+
+
+def get_shared_data_manager(data_dir="data", **options):
+    """
+    Return the process-wide data manager for ``data_dir``.
+
+    Streamlit re-executes the page script on every interaction; reusing one
+    manager per data directory keeps its rollup index and event log state warm
+    across reruns and sessions instead of rebuilding them each time.
+    """
+    key = (os.path.abspath(data_dir), tuple(sorted(options.items())))
+    with _shared_managers_lock:
+        manager = _shared_managers.get(key)
+        if manager is None:
+            manager = _shared_managers[key] = PomodoroDataManager(data_dir, **options)
+        return manager
 
 class PomodoroDataManager:
     """Manages data persistence for the Pomodoro application"""
     
-    def __init__(self, data_dir="data"):
-        """Initialize the data manager with the data directory path"""
+    def __init__(self, data_dir="data", storage="json", cache=None, write_behind=False,
+                 flush_threshold=32, flush_interval=0.5, **storage_options):
+        """
+        Initialize the data manager with the data directory path.
+
+        ``storage`` is either a StatsStorage instance or the name of a backend:
+        ``"json"`` rewrites one ``stats_<date>.json`` file per completion,
+        ``"eventlog"`` appends each completion to an ``events_<date>.jsonl``
+        log and ``"sqlite"`` keeps everything in ``pomodoro.sqlite3``. Extra
+        keyword arguments are passed to the backend. Parsed JSON files are
+        kept in ``cache`` (the process-wide ``stats_cache`` by default).
+
+        With ``write_behind`` enabled, completions are buffered and written by
+        a background thread (see WriteBehindQueue) instead of inside the
+        caller; reads still include buffered completions.
+        """
         self.data_dir = data_dir
+        self.cache = cache if cache is not None else stats_cache
+        # Bumped on every write, so data_version() also covers buffered events
+        self._writes = 0
         self.ensure_data_dir_exists()
+        if isinstance(storage, StatsStorage):
+            self.storage = storage
+        else:
+            if storage == JsonFileStorage.name:
+                storage_options.setdefault("cache", self.cache)
+            self.storage = create_storage(storage, data_dir, **storage_options)
+        self.writer = None
+        if write_behind:
+            self.writer = WriteBehindQueue(
+                self.storage,
+                flush_threshold=flush_threshold,
+                flush_interval=flush_interval
+            )
         
     def ensure_data_dir_exists(self):
         """Ensure that the data directory exists"""
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
     
-    def get_stats_filepath(self):
-        """Get the filepath for storing stats for the current day"""
-        today = date.today().isoformat()
-        return os.path.join(self.data_dir, f"stats_{today}.json")
+    def _today(self):
+        """Return the current day (overridable in tests and benchmarks)"""
+        return date.today()
+
+    def get_stats_filepath(self, day=None):
+        """Get the filepath of the JSON stats file for the given day (default: today)"""
+        day_iso = (day or self._today()).isoformat()
+        return os.path.join(self.data_dir, f"stats_{day_iso}.json")
     
     def save_pomodoro_completed(self):
         """Record a completed pomodoro"""
-        filepath = self.get_stats_filepath()
-        stats = self.load_daily_stats()
-        
-        # Update stats
-        stats["pomodoros_completed"] += 1
-        stats["last_completed"] = datetime.now().isoformat()
-        
-        # Save to file
-        with open(filepath, 'w') as f:
-            json.dump(stats, f)
-        
-        return stats
+        return self._record_event(pomodoro_event())
     
     def load_daily_stats(self):
         """Load the daily stats"""
-        filepath = self.get_stats_filepath()
-        
-        if os.path.exists(filepath):
+        return self._load_stats_for_day(self._today())
+
+    def _load_stats_for_day(self, day):
+        """Load the stats recorded for a single day"""
+        if self.writer is not None:
+            return self.writer.load_day(day)
+        return self.storage.load_day(day)
+
+    def _record_event(self, event):
+        """Persist a completion event for today and return the updated stats"""
+        day = self._today()
+        self._writes += 1
+        if self.writer is not None:
+            self.writer.enqueue(day, event)
+            return self.writer.load_day(day)
+        return self.storage.append_event(day, event)
+
+    def data_version(self, start=None, end=None):
+        """
+        Token that changes whenever stats for ``[start, end]`` (default: today)
+        change, whether written here, still buffered or written by another
+        process. Equal tokens mean derived data can be reused as is.
+        """
+        start = start or self._today()
+        return (self._writes, self.storage.data_version(start, end or start))
+
+    def cache_info(self):
+        """Hit/miss counters of the stats cache used by this manager"""
+        return self.cache.info()
+
+    def refresh_rollup_index(self):
+        """Pick up stats written by other processes before the next summary"""
+        return self.storage.refresh()
+
+    def get_summary(self, start, end, include_daily=False):
+        """
+        Get pomodoro and task totals for the inclusive date range ``[start, end]``.
+
+        File backends answer from precomputed daily/weekly/monthly/yearly
+        buckets and SQLite from indexed aggregate queries, so a year costs
+        about the same as a week. Set ``include_daily`` to also get per-day
+        pomodoro counts.
+        """
+        if end < start:
+            raise ValueError("end must not be before start")
+        if self.writer is not None:
+            # Aggregates come from storage, so hand it everything buffered first
+            self.writer.flush()
+        return self.storage.summarize(start, end, include_daily=include_daily)
+
+    def load_stats(self, day):
+        """Stats for any ``date``, buffered completions included"""
+        return self._load_stats_for_day(day)
+
+    def iter_daily_stats(self, start=None, end=None):
+        """
+        Yield the stats of every stored day in ``[start, end]`` (either may be
+        None), oldest first, loading one day at a time.
+        """
+        if self.writer is not None:
+            self.writer.flush()
+        days = sorted(self.storage.stored_days())
+        for day_iso in days:
             try:
-                with open(filepath, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                # If file is corrupted or not found, return default stats
-                pass
-        
-        # Default stats
-        return {
-            "date": date.today().isoformat(),
-            "pomodoros_completed": 0,
-            "last_completed": None
-        }
+                day = date.fromisoformat(day_iso)
+            except ValueError:
+                continue
+            if (start is None or day >= start) and (end is None or day <= end):
+                yield self._load_stats_for_day(day)
+
+    def append_events(self, day, events):
+        """Persist several completion events for ``day`` in one write; returns the day's stats"""
+        self._writes += 1
+        if self.writer is not None:
+            self.writer.flush()
+        return self.storage.append_events(day, events)
+
+    def export_history(self, path, fmt=None, start=None, end=None):
+        """Stream stats history to a CSV, JSONL or Parquet file (see history_io)"""
+        import history_io
+        return history_io.export_history(self, path, fmt=fmt, start=start, end=end)
+
+    def import_history(self, path, fmt=None, strict=False):
+        """Validate and merge a CSV, JSONL or Parquet history file (see history_io)"""
+        import history_io
+        return history_io.import_history(self, path, fmt=fmt, strict=strict)
+
+    def sync(self):
+        """Force buffered writes to disk (write-behind queue and pending fsyncs)"""
+        if self.writer is not None:
+            self.writer.flush()
+        self.storage.sync()
+
+    def close(self):
+        """Flush and release any open storage handles"""
+        if self.writer is not None:
+            self.writer.close()
+        self.storage.close()
+
+    def recover_daily_stats(self, day=None):
+        """
+        Rebuild a day's stats from disk after a crash.
+
+        In event log mode a torn last line is dropped and every complete event
+        before it is kept. Other backends simply reload the day.
+        """
+        return self.storage.recover_day(day or self._today())
     
     def save_task_completed(self, task_description, task_data=None):
-        """Record a completed task"""
-        filepath = self.get_stats_filepath()
-        stats = self.load_daily_stats()
-        
-        # Initialize tasks list if it doesn't exist
-        if "completed_tasks" not in stats:
-            stats["completed_tasks"] = []
-        
+        """Record a completed task; ``task_description`` may also be a ``Task``"""
+        if hasattr(task_description, "to_dict"):
+            # A src.models.task.Task; its id only means something in one session
+            task_data = task_description.to_dict()
+            task_data.pop("id", None)
+            task_description = task_data["description"]
         # Add task to completed tasks
         if task_data is None:
             # For backward compatibility with old format
@@ -84,17 +301,10 @@ class PomodoroDataManager:
         if "completed_at" not in task_data:
             task_data["completed_at"] = datetime.now().isoformat()
             
-        stats["completed_tasks"].append(task_data)
-        
-        # Save to file
-        with open(filepath, 'w') as f:
-            json.dump(stats, f)
-        
-        return stats
+        return self._record_event(task_event(task_data))
     
     def get_tasks_stats(self):
         """Get statistics about completed tasks, grouped by status"""
-        filepath = self.get_stats_filepath()
         stats = self.load_daily_stats()
         
         # Default task stats
@@ -128,56 +338,9 @@ class PomodoroDataManager:
     
     def get_weekly_summary(self):
         """Get a summary of the pomodoros completed in the last 7 days"""
-        today = date.today()
-        summary = {
-            "total_pomodoros": 0,
-            "days_active": 0,
-            "daily_counts": {},
-            "task_counts": {
-                "total": 0,
-                "by_status": {
-                    "Open": 0,
-                    "In Progress": 0,
-                    "Done": 0,
-                    "Blocked": 0
-                }
-            }
-        }
-        
-        # Check the last 7 days
-        for i in range(7):
-            day = today - timedelta(days=i)
-            day_iso = day.isoformat()
-            day_file = os.path.join(self.data_dir, f"stats_{day_iso}.json")
-            
-            if os.path.exists(day_file):
-                try:
-                    with open(day_file, 'r') as f:
-                        day_stats = json.load(f)
-                        day_count = day_stats.get("pomodoros_completed", 0)
-                        
-                        if day_count > 0:
-                            summary["days_active"] += 1
-                            summary["total_pomodoros"] += day_count
-                            summary["daily_counts"][day_iso] = day_count
-                        
-                        # Count task statistics
-                        if "completed_tasks" in day_stats:
-                            tasks = day_stats["completed_tasks"]
-                            summary["task_counts"]["total"] += len(tasks)
-                            
-                            for task in tasks:
-                                if isinstance(task, dict) and "status" in task:
-                                    status = task["status"]
-                                    if status in summary["task_counts"]["by_status"]:
-                                        summary["task_counts"]["by_status"][status] += 1
-                                    else:
-                                        summary["task_counts"]["by_status"][status] = 1
-                                else:
-                                    # For old format tasks without status, count as "Done"
-                                    summary["task_counts"]["by_status"]["Done"] += 1
-                except:
-                    # Skip if there's an error reading the file
-                    pass
-        
-        return summary 
\ No newline at end of file
+        today = self._today()
+        return self.get_summary(today - timedelta(days=6), today, include_daily=True)
+
+
+# Every public method shows up as a data_manager/<method> span
+instrumentation.instrument_methods(PomodoroDataManager, "data_manager")
@@ -0,0 +1,296 @@
+import os
+import json
+import time
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+from file_locking import FileLock, atomic_write_text
+
+
+def default_daily_stats(day_iso):
+    """Return an empty stats record for the given ISO day"""
+    return {
+        "date": day_iso,
+        "pomodoros_completed": 0,
+        "last_completed": None
+    }
+
+
+def pomodoro_event(completed_at=None):
+    """Build the event recorded when a pomodoro is completed"""
+    return {
+        "type": "pomodoro",
+        "completed_at": completed_at or datetime.now().isoformat()
+    }
+
+
+def task_event(task_data):
+    """Build the event recorded when a task is completed"""
+    return {"type": "task", "task": task_data}
+
+
+def apply_event(stats, event):
+    """Apply a single completion event to a daily stats dict in place"""
+    if event["type"] == "pomodoro":
+        stats["pomodoros_completed"] = stats.get("pomodoros_completed", 0) + 1
+        stats["last_completed"] = event["completed_at"]
+    elif event["type"] == "task":
+        stats.setdefault("completed_tasks", []).append(event["task"])
+    return stats
+
+
+def copy_stats(stats):
+    """Copy a stats dict deep enough that appending tasks does not alias the original"""
+    stats = dict(stats)
+    if "completed_tasks" in stats:
+        stats["completed_tasks"] = list(stats["completed_tasks"])
+    return stats
+
+
+def read_jsonl_records(f, offset=0):
+    """
+    Scan a binary JSONL file from ``offset`` and yield ``(record, end_offset)``.
+
+    Lines that are not valid JSON are skipped. A final line without a trailing
+    newline is a torn write from a crash and is ignored; callers can compare the
+    last ``end_offset`` with the file size to detect it.
+    """
+    f.seek(offset)
+    for line in f:
+        if not line.endswith(b"\n"):
+            # Torn tail: the writer died before finishing the line
+            return
+        offset += len(line)
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        yield record, offset
+
+
+def _close_handles(handles):
+    """Fsync and close every open log handle (used at exit/garbage collection)"""
+    for state in handles.values():
+        fh = state.get("handle")
+        if fh is not None and not fh.closed:
+            try:
+                fh.flush()
+                os.fsync(fh.fileno())
+            except OSError:
+                pass
+            fh.close()
+    handles.clear()
+
+
+class EventLogStore:
+    """
+    Append-only JSONL storage of completion events, one log file per day.
+
+    Each completion is a single appended line, so writes cost O(1) regardless of
+    how many tasks were completed that day. Fsyncs are batched: the log is
+    flushed to the OS on every append but only fsynced every ``fsync_batch_size``
+    events or ``fsync_interval`` seconds, whichever comes first. Daily stats are
+    derived by replaying the log on top of the latest checkpoint.
+
+    Replayed state is kept for the ``max_cached_days`` most recently used days
+    only; older days are synced, closed and dropped, so walking years of
+    history does not keep all of it in memory.
+    """
+
+    def __init__(self, data_dir, fsync_batch_size=32, fsync_interval=1.0, checkpoint_every=256,
+                 retry_policy=None, max_cached_days=8):
+        self.data_dir = data_dir
+        self.retry_policy = retry_policy
+        self.fsync_batch_size = fsync_batch_size
+        self.fsync_interval = fsync_interval
+        self.checkpoint_every = checkpoint_every
+        self.max_cached_days = max_cached_days
+        # day_iso -> {"stats", "offset", "since_checkpoint", "handle", "unsynced", "last_sync"},
+        # least recently used first
+        self._days = OrderedDict()
+        self._finalizer = weakref.finalize(self, _close_handles, self._days)
+
+    def log_path(self, day_iso):
+        """Get the path of the event log for a day"""
+        return os.path.join(self.data_dir, f"events_{day_iso}.jsonl")
+
+    def checkpoint_path(self, day_iso):
+        """Get the path of the checkpoint for a day's event log"""
+        return os.path.join(self.data_dir, f"events_{day_iso}.checkpoint.json")
+
+    def legacy_stats_path(self, day_iso):
+        """Get the path of the plain JSON stats file for a day"""
+        return os.path.join(self.data_dir, f"stats_{day_iso}.json")
+
+    def append(self, day_iso, event):
+        """Append an event to the day's log and return the updated stats"""
+        log_path = self.log_path(day_iso)
+        line = json.dumps(event, separators=(",", ":")).encode("utf-8") + b"\n"
+        # The lock keeps torn-tail repair in one process from cutting off a
+        # line another process is appending at the same moment
+        with FileLock(log_path, self.retry_policy):
+            state = self._catch_up(day_iso)
+            fh = state["handle"]
+            if fh is None:
+                if os.path.exists(log_path) and os.path.getsize(log_path) > state["offset"]:
+                    # Drop a torn tail so our line does not get glued onto it
+                    with open(log_path, "r+b") as f:
+                        f.truncate(state["offset"])
+                fh = state["handle"] = open(log_path, "ab")
+
+            fh.write(line)
+            fh.flush()
+        state["unsynced"] += 1
+        if (state["unsynced"] >= self.fsync_batch_size
+                or time.monotonic() - state["last_sync"] >= self.fsync_interval):
+            self._fsync(state)
+
+        # Re-read from our last known offset so that lines appended by other
+        # processes (and our own) are applied in file order
+        return copy_stats(self._catch_up(day_iso)["stats"])
+
+    def load(self, day_iso):
+        """Return the daily stats for a day, replaying only what is new on disk"""
+        return copy_stats(self._catch_up(day_iso)["stats"])
+
+    def sync(self):
+        """Fsync every log with pending appends"""
+        for state in self._days.values():
+            if state["unsynced"]:
+                self._fsync(state)
+
+    def close(self):
+        """Fsync, checkpoint and close all open logs"""
+        for day_iso, state in self._days.items():
+            if state["since_checkpoint"]:
+                self._write_checkpoint(day_iso, state)
+        _close_handles(self._days)
+
+    def recover(self, day_iso):
+        """
+        Rebuild the day's stats from disk, ignoring any in-memory state.
+
+        A torn last line left behind by a crash is truncated so that the next
+        append starts on a clean line; everything before it is kept.
+        """
+        state = self._days.pop(day_iso, None)
+        if state and state["handle"] is not None:
+            state["handle"].close()
+        state = self._replay(day_iso)
+
+        log_path = self.log_path(day_iso)
+        if os.path.exists(log_path) and os.path.getsize(log_path) > state["offset"]:
+            with open(log_path, "r+b") as f:
+                f.truncate(state["offset"])
+        self._remember(day_iso, state)
+        return copy_stats(state["stats"])
+
+    def _remember(self, day_iso, state):
+        """Keep a day's state as most recently used, dropping the least recent beyond the cap"""
+        self._days[day_iso] = state
+        self._days.move_to_end(day_iso)
+        while len(self._days) > max(self.max_cached_days, 1):
+            _, old = self._days.popitem(last=False)
+            fh = old["handle"]
+            if fh is not None:
+                if old["unsynced"]:
+                    self._fsync(old)
+                fh.close()
+
+    def _catch_up(self, day_iso):
+        """Make the in-memory state for a day reflect everything on disk"""
+        state = self._days.get(day_iso)
+        if state is None:
+            state = self._replay(day_iso)
+            self._remember(day_iso, state)
+            return state
+        self._days.move_to_end(day_iso)
+
+        try:
+            size = os.path.getsize(self.log_path(day_iso))
+        except OSError:
+            size = 0
+        if size > state["offset"]:
+            self._scan(day_iso, state)
+        return state
+
+    def _replay(self, day_iso):
+        """Load the latest checkpoint for a day and replay the log tail"""
+        state = {
+            "stats": None,
+            "offset": 0,
+            "since_checkpoint": 0,
+            "handle": None,
+            "unsynced": 0,
+            "last_sync": time.monotonic(),
+        }
+
+        checkpoint = self._read_checkpoint(day_iso)
+        if checkpoint is not None:
+            state["stats"] = checkpoint["stats"]
+            state["offset"] = checkpoint["offset"]
+        else:
+            state["stats"] = self._base_stats(day_iso)
+
+        self._scan(day_iso, state)
+        return state
+
+    def _scan(self, day_iso, state):
+        """Apply every complete log line after ``state['offset']``"""
+        log_path = self.log_path(day_iso)
+        if not os.path.exists(log_path):
+            return
+        with open(log_path, "rb") as f:
+            for event, end_offset in read_jsonl_records(f, state["offset"]):
+                if isinstance(event, dict) and event.get("type") in ("pomodoro", "task"):
+                    apply_event(state["stats"], event)
+                    state["since_checkpoint"] += 1
+                state["offset"] = end_offset
+
+        if state["since_checkpoint"] >= self.checkpoint_every:
+            self._write_checkpoint(day_iso, state)
+
+    def _base_stats(self, day_iso):
+        """Stats recorded in a plain JSON file before the event log was enabled"""
+        legacy_path = self.legacy_stats_path(day_iso)
+        if os.path.exists(legacy_path):
+            try:
+                with open(legacy_path, "r") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                pass
+        return default_daily_stats(day_iso)
+
+    def _read_checkpoint(self, day_iso):
+        """Read a checkpoint, returning None if it is missing or does not match the log"""
+        checkpoint_path = self.checkpoint_path(day_iso)
+        if not os.path.exists(checkpoint_path):
+            return None
+        try:
+            with open(checkpoint_path, "r") as f:
+                checkpoint = json.load(f)
+            log_size = os.path.getsize(self.log_path(day_iso))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(checkpoint, dict) or checkpoint.get("offset", -1) > log_size:
+            # The log was truncated or replaced after the checkpoint was taken
+            return None
+        return checkpoint
+
+    def _write_checkpoint(self, day_iso, state):
+        """Atomically persist the replayed stats and the log offset they cover"""
+        # Checkpoints can always be rebuilt from the log, so skip the fsync
+        atomic_write_text(
+            self.checkpoint_path(day_iso),
+            json.dumps({"offset": state["offset"], "stats": state["stats"]}),
+            fsync=False
+        )
+        state["since_checkpoint"] = 0
+
+    def _fsync(self, state):
+        """Fsync a day's log handle"""
+        fh = state["handle"]
+        if fh is not None:
+            os.fsync(fh.fileno())
+        state["unsynced"] = 0
+        state["last_sync"] = time.monotonic()
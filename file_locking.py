@@ -0,0 +1,194 @@
+import os
+import time
+import errno
+import random
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class LockTimeout(OSError):
+    """Raised when a file lock could not be acquired before the retry deadline"""
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for contended file locks.
+
+    The policy keeps a moving average of how many attempts recent
+    acquisitions needed. Under sustained contention the first backoff starts
+    higher, which spreads competing writers out instead of having them all
+    retry in lock-step.
+    """
+
+    def __init__(self, timeout=10.0, base_delay=0.0005, max_delay=0.05, smoothing=0.2):
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.smoothing = smoothing
+        self.contention = 0.0
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait = 0.0
+        self._lock = threading.Lock()
+
+    def delays(self):
+        """Yield successive sleep times, scaled by recently observed contention"""
+        attempt = self.contention
+        while True:
+            ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+            yield random.uniform(0, ceiling)
+            attempt += 1
+
+    def record(self, failed_attempts, waited):
+        """Feed back how hard the last acquisition was"""
+        with self._lock:
+            self.acquisitions += 1
+            self.total_wait += waited
+            if failed_attempts:
+                self.contended += 1
+            self.contention += self.smoothing * (failed_attempts - self.contention)
+
+    def info(self):
+        """Counters describing lock contention so far"""
+        with self._lock:
+            return {
+                "acquisitions": self.acquisitions,
+                "contended": self.contended,
+                "total_wait_s": self.total_wait,
+                "contention": self.contention,
+            }
+
+
+default_retry_policy = RetryPolicy()
+
+
+def _try_lock(fd):
+    """Take an exclusive lock without blocking; returns False if it is held elsewhere"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except (BlockingIOError, PermissionError):
+        return False
+    except OSError as e:
+        if e.errno in (errno.EAGAIN, errno.EACCES, errno.EDEADLK):
+            return False
+        raise
+    return True
+
+
+def _unlock(fd):
+    """Release a lock taken by ``_try_lock``"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """
+    Advisory exclusive lock on ``<path>.lock``, shared by threads and processes.
+
+    Usage::
+
+        with FileLock(path):
+            ...read, modify and atomically replace path...
+
+    Threads of the same process are serialized with an in-process lock first,
+    since flock() does not exclude threads sharing a file description.
+    """
+
+    _thread_locks = {}
+    _thread_locks_guard = threading.Lock()
+
+    def __init__(self, path, policy=None):
+        self.lock_path = f"{path}.lock"
+        self.policy = policy or default_retry_policy
+        self._fd = None
+        with FileLock._thread_locks_guard:
+            self._thread_lock = FileLock._thread_locks.setdefault(
+                os.path.abspath(self.lock_path), threading.Lock()
+            )
+
+    def acquire(self):
+        """Block until the lock is held or the policy's timeout expires"""
+        start = time.monotonic()
+        if not self._thread_lock.acquire(timeout=self.policy.timeout):
+            raise LockTimeout(f"Timed out waiting for {self.lock_path}")
+
+        fd = None
+        failed = 0
+        try:
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            delays = self.policy.delays()
+            while not _try_lock(fd):
+                failed += 1
+                if time.monotonic() - start >= self.policy.timeout:
+                    raise LockTimeout(f"Timed out waiting for {self.lock_path}")
+                time.sleep(next(delays))
+        except BaseException:
+            if fd is not None:
+                os.close(fd)
+            self._thread_lock.release()
+            raise
+
+        self._fd = fd
+        self.policy.record(failed, time.monotonic() - start)
+        return self
+
+    def release(self):
+        """Release the lock"""
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            try:
+                _unlock(fd)
+            finally:
+                os.close(fd)
+                self._thread_lock.release()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def atomic_write_text(path, text, fsync=True):
+    """
+    Replace ``path`` with ``text`` so readers see either the old or new content.
+
+    The data goes to a unique temporary file in the same directory, which is
+    fsynced and renamed over the target. A crash mid-write leaves the previous
+    file intact instead of a truncated one.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        # Persist the rename itself
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
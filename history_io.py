@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Streaming import and export of stats history as CSV, JSONL or Parquet.
+
+Usage:
+    python history_io.py export history.csv [--start 2020-01-01] [--end 2024-12-31]
+    python history_io.py import history.jsonl [--strict]
+    (both take [--data-dir data] [--storage json|eventlog|sqlite] [--format csv|jsonl|parquet])
+
+History is a flat table with one row per completion (see ``FIELDS``):
+``pomodoro`` rows carry ``completed_at`` when it is known (stored days only
+keep the time of the day's last pomodoro), ``task`` rows carry the task
+fields. Export writes rows day by day, oldest first; import reads rows
+lazily and buffers only the current day, so memory does not grow with the
+number of rows however many years the file spans. Rows of a day that is
+already stored are deduplicated against it. Parquet needs ``pyarrow``.
+"""
+
+import os
+import csv
+import json
+import argparse
+from datetime import date, datetime
+from collections import Counter
+from event_log import task_event
+from src.models.task import TaskStatus
+
+FIELDS = ("date", "type", "completed_at", "description", "status", "notes", "due_date", "created_at")
+TASK_FIELDS = ("description", "status", "notes", "due_date", "created_at", "completed_at")
+FORMATS = ("csv", "jsonl", "parquet")
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+STATUSES = frozenset(status.value for status in TaskStatus)
+
+# Rows per Parquet row group, and per batch when reading one
+PARQUET_BATCH_SIZE = 10000
+
+# Invalid rows described in an import report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+
+def detect_format(path, fmt=None):
+    """``fmt`` if given, otherwise the format implied by the file extension"""
+    if fmt is None:
+        fmt = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise ValueError(f"Cannot tell the format of {path!r}; pass one of {FORMATS}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}")
+    return fmt
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet import/export needs pyarrow: pip install pyarrow") from None
+    return pyarrow, pyarrow.parquet
+
+
+def day_records(stats):
+    """History rows for one day's stats dict"""
+    day_iso = stats["date"]
+    count = stats.get("pomodoros_completed", 0)
+    for index in range(count):
+        # Only the last pomodoro's time is stored
+        completed_at = stats.get("last_completed") if index == count - 1 else None
+        yield {"date": day_iso, "type": "pomodoro", "completed_at": completed_at}
+    for task in stats.get("completed_tasks", []):
+        if not isinstance(task, dict):
+            # Old format: just the description, counted as done
+            task = {"description": str(task), "status": TaskStatus.DONE.value}
+        record = {"date": day_iso, "type": "task"}
+        record.update((name, task.get(name)) for name in TASK_FIELDS)
+        yield record
+
+
+def iter_history(data_manager, start=None, end=None):
+    """Rows of every stored day in ``[start, end]``, one day loaded at a time"""
+    for stats in data_manager.iter_daily_stats(start, end):
+        yield from day_records(stats)
+
+
+def write_records(records, path, fmt=None):
+    """Stream ``records`` to ``path``; returns how many were written"""
+    fmt = detect_format(path, fmt)
+    written = 0
+    if fmt == "parquet":
+        pyarrow, parquet = _require_pyarrow()
+        schema = pyarrow.schema([(name, pyarrow.string()) for name in FIELDS])
+        with parquet.ParquetWriter(path, schema) as writer:
+            batch = []
+            for record in records:
+                batch.append(record)
+                if len(batch) == PARQUET_BATCH_SIZE:
+                    writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+                    written += len(batch)
+                    batch = []
+            if batch:
+                writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+                written += len(batch)
+        return written
+
+    with open(path, "w", newline="" if fmt == "csv" else None, encoding="utf-8") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for record in records:
+                writer.writerow(record)
+                written += 1
+        else:
+            for record in records:
+                f.write(json.dumps({key: value for key, value in record.items() if value is not None}) + "\n")
+                written += 1
+    return written
+
+
+def read_records(path, fmt=None):
+    """Yield ``(row number, raw record)`` from a history file, lazily"""
+    fmt = detect_format(path, fmt)
+    if fmt == "parquet":
+        _, parquet = _require_pyarrow()
+        number = 0
+        for batch in parquet.ParquetFile(path).iter_batches(batch_size=PARQUET_BATCH_SIZE):
+            for record in batch.to_pylist():
+                number += 1
+                yield number, record
+        return
+
+    with open(path, newline="" if fmt == "csv" else None, encoding="utf-8") as f:
+        if fmt == "csv":
+            for number, record in enumerate(csv.DictReader(f), start=1):
+                # Missing values come back as empty strings
+                yield number, {key: value for key, value in record.items() if value}
+        else:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                yield number, record
+
+
+def _check_date(value):
+    if value is not None:
+        date.fromisoformat(value)
+
+
+def _check_datetime(value):
+    if value is not None:
+        datetime.fromisoformat(value)
+
+
+def validate_record(record):
+    """Normalized copy of a history row; raises ValueError if it is not one"""
+    if not isinstance(record, dict):
+        raise ValueError("not a record")
+    record = {name: record.get(name) or None for name in FIELDS}
+    if record["date"] is None:
+        raise ValueError("missing date")
+    date.fromisoformat(record["date"])
+    if record["type"] == "pomodoro":
+        _check_datetime(record["completed_at"])
+        return {"date": record["date"], "type": "pomodoro", "completed_at": record["completed_at"]}
+    if record["type"] != "task":
+        raise ValueError(f"unknown type {record['type']!r}")
+    if not record["description"]:
+        raise ValueError("task without description")
+    record["status"] = record["status"] or TaskStatus.DONE.value
+    if record["status"] not in STATUSES:
+        raise ValueError(f"unknown status {record['status']!r}")
+    _check_date(record["due_date"])
+    _check_datetime(record["created_at"])
+    _check_datetime(record["completed_at"])
+    return record
+
+
+def _task_key(task):
+    """What makes two completed tasks the same one (legacy tasks count as done)"""
+    if not isinstance(task, dict):
+        return (str(task), TaskStatus.DONE.value, None)
+    return (task.get("description"), task.get("status") or TaskStatus.DONE.value, task.get("completed_at"))
+
+
+def _merge_day(data_manager, day_iso, records, report):
+    """
+    Write one day's imported rows, skipping what the day already has.
+
+    Tasks are matched on description, status and completion time. Pomodoros
+    have no reliable identity (only the last one's time is kept), so a day
+    ends up with the larger of its stored and imported pomodoro counts.
+    """
+    day = date.fromisoformat(day_iso)
+    existing = data_manager.load_stats(day)
+    known_tasks = Counter(_task_key(task) for task in existing.get("completed_tasks", []))
+
+    pomodoros = [record for record in records if record["type"] == "pomodoro"]
+    new_pomodoros = max(0, len(pomodoros) - existing.get("pomodoros_completed", 0))
+    # Untimed first, so the day's last_completed ends up the latest known time
+    pomodoros.sort(key=lambda record: record["completed_at"] or "")
+    events = [{"type": "pomodoro", "completed_at": record["completed_at"]}
+              for record in pomodoros[len(pomodoros) - new_pomodoros:]]
+    report["duplicates"] += len(pomodoros) - new_pomodoros
+    report["pomodoros"] += new_pomodoros
+
+    for record in records:
+        if record["type"] != "task":
+            continue
+        task = {name: record[name] for name in TASK_FIELDS if record[name] is not None}
+        key = _task_key(task)
+        if known_tasks[key]:
+            known_tasks[key] -= 1
+            report["duplicates"] += 1
+            continue
+        events.append(task_event(task))
+        report["tasks"] += 1
+
+    if events:
+        data_manager.append_events(day, events)
+        report["days"] += 1
+
+
+def import_records(data_manager, records, strict=False):
+    """
+    Validate ``(row number, record)`` pairs and merge them day by day.
+
+    Rows of one day are expected to be contiguous (exports are); a day that
+    shows up again later is merged a second time against what was just
+    written. Invalid rows are skipped and counted, or raise ValueError with
+    ``strict``. Returns a report of days written, pomodoros and tasks added,
+    duplicates skipped and invalid rows.
+    """
+    report = {"days": 0, "pomodoros": 0, "tasks": 0, "duplicates": 0, "invalid": 0, "errors": []}
+    day_iso, day_rows = None, []
+    for number, raw in records:
+        try:
+            record = validate_record(raw)
+        except (TypeError, ValueError) as exc:
+            if strict:
+                raise ValueError(f"Row {number}: {exc}") from None
+            report["invalid"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append(f"Row {number}: {exc}")
+            continue
+        if record["date"] != day_iso:
+            if day_rows:
+                _merge_day(data_manager, day_iso, day_rows, report)
+            day_iso, day_rows = record["date"], []
+        day_rows.append(record)
+    if day_rows:
+        _merge_day(data_manager, day_iso, day_rows, report)
+    return report
+
+
+def export_history(data_manager, path, fmt=None, start=None, end=None):
+    """Write the history in ``[start, end]`` to ``path``; returns the number of rows"""
+    return write_records(iter_history(data_manager, start, end), path, fmt)
+
+
+def import_history(data_manager, path, fmt=None, strict=False):
+    """Merge a history file into ``data_manager``; returns the import report"""
+    return import_records(data_manager, read_records(path, fmt), strict=strict)
+
+
+def main(argv=None):
+    """Run an import or export from the command line."""
+    from data_manager import PomodoroDataManager
+
+    parser = argparse.ArgumentParser(description="Import or export Pomodoro stats history")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("path", help="History file (.csv, .jsonl or .parquet)")
+    parser.add_argument("--format", choices=FORMATS, help="Override the format implied by the extension")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--storage", default="json", choices=["json", "eventlog", "sqlite"])
+    parser.add_argument("--start", type=date.fromisoformat, help="First day to export (ISO date)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last day to export (ISO date)")
+    parser.add_argument("--strict", action="store_true", help="Stop at the first invalid row")
+    args = parser.parse_args(argv)
+
+    data_manager = PomodoroDataManager(args.data_dir, storage=args.storage)
+    try:
+        if args.command == "export":
+            rows = export_history(data_manager, args.path, args.format, args.start, args.end)
+            print(f"Exported {rows} row(s) to {args.path}")
+        else:
+            report = import_history(data_manager, args.path, args.format, strict=args.strict)
+            for error in report["errors"]:
+                print(error)
+            print(f"Imported {report['pomodoros']} pomodoro(s) and {report['tasks']} task(s) "
+                  f"into {report['days']} day(s); skipped {report['duplicates']} duplicate(s) "
+                  f"and {report['invalid']} invalid row(s)")
+    finally:
+        data_manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    main()
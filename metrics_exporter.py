@@ -0,0 +1,264 @@
+import os
+import time
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from instrumentation import BUCKET_BOUNDS, instrumentation
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Exported histogram buckets: every fourth instrumentation bound, i.e. the
+# powers of two from 256 us to ~67 s, so cumulative counts are exact sums of
+# whole instrumentation buckets
+EXPORT_BUCKETS = tuple(range(32, len(BUCKET_BOUNDS), 4))
+
+# span prefix -> (metric name, label for the rest of the span name, help)
+SPAN_FAMILIES = (
+    ("data_manager/", "pomodoro_data_manager_seconds", "method", "PomodoroDataManager call latency"),
+    ("rerun/", "pomodoro_rerun_seconds", "phase", "Script rerun duration by phase"),
+    ("unit/", "pomodoro_fragment_seconds", "fragment", "Fragment rerun duration"),
+    ("", "pomodoro_span_seconds", "span", "Other instrumented spans"),
+)
+
+# PomodoroDataManager methods that write; everything else is a read
+WRITE_METHODS = frozenset((
+    "save_pomodoro_completed", "save_task_completed", "append_events", "sync", "close",
+    "recover_daily_stats", "refresh_rollup_index", "import_history", "export_history",
+))
+
+
+def _escape(value):
+    """Escape a label value for the text format"""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter; ``inc`` is one uncontended lock and an add"""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class SessionTracker:
+    """
+    Counts browser sessions that reran within the last ``window`` seconds.
+
+    ``seen`` is a single dict store (atomic under the GIL, no lock); expired
+    sessions are only dropped when the gauge is read.
+    """
+
+    def __init__(self, window=300.0, clock=time.monotonic):
+        self.window = window
+        self._clock = clock
+        self._last_seen = {}
+        self._lock = threading.Lock()
+
+    def seen(self, session_id):
+        self._last_seen[session_id] = self._clock()
+
+    def active(self):
+        """Number of sessions seen within the window"""
+        cutoff = self._clock() - self.window
+        with self._lock:
+            stale = [key for key, seen in list(self._last_seen.items()) if seen < cutoff]
+            for key in stale:
+                if self._last_seen.get(key, cutoff) < cutoff:
+                    del self._last_seen[key]
+            return len(self._last_seen)
+
+
+class MetricsRegistry:
+    """
+    Counters, scrape-time gauges and the instrumentation histograms, rendered
+    in the Prometheus text format.
+
+    The hot path only ever touches a ``Counter``; gauges are callables read
+    when the endpoint is scraped, and latency histograms are the ones
+    ``instrumentation`` already keeps, converted to cumulative ``le``
+    buckets at scrape time.
+    """
+
+    def __init__(self, instrumentation=instrumentation):
+        self.instrumentation = instrumentation
+        self._counters = {}  # name -> (help, Counter)
+        self._gauges = {}    # name -> (help, callable, kind)
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text):
+        """The counter called ``name``, created on first use"""
+        with self._lock:
+            if name not in self._counters:
+                self._counters[name] = (help_text, Counter())
+            return self._counters[name][1]
+
+    def gauge(self, name, help_text, read, kind="gauge"):
+        """
+        Publish ``read()`` as ``name`` on every scrape, replacing an earlier
+        one of that name; ``kind="counter"`` for totals kept elsewhere.
+        """
+        with self._lock:
+            self._gauges[name] = (help_text, read, kind)
+
+    def render(self):
+        """Current metrics as text-format exposition"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+        lines = []
+        for name, (help_text, counter) in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter", f"{name} {counter.value}"]
+        for name, (help_text, read, kind) in gauges:
+            try:
+                value = read()
+            except Exception:
+                logger.exception("Metrics gauge %s failed", name)
+                continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {_number(value)}"]
+        lines += self._render_histograms()
+        return "\n".join(lines) + "\n"
+
+    def _render_histograms(self):
+        families = {}
+        for span_name, histogram in sorted(self.instrumentation.histograms().items()):
+            for prefix, metric, label, help_text in SPAN_FAMILIES:
+                if span_name.startswith(prefix):
+                    labels = [(label, span_name[len(prefix):])]
+                    if metric == "pomodoro_data_manager_seconds":
+                        labels.append(("op", "write" if labels[0][1] in WRITE_METHODS else "read"))
+                    families.setdefault((metric, help_text), []).append((labels, histogram))
+                    break
+
+        lines = []
+        for (metric, help_text), members in sorted(families.items()):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+            for labels, histogram in members:
+                counts, count, total, _ = histogram.snapshot()
+                cumulative = 0
+                start = 0
+                for index in EXPORT_BUCKETS:
+                    cumulative += sum(counts[start:index + 1])
+                    start = index + 1
+                    le = [("le", f"{BUCKET_BOUNDS[index]:.6g}")]
+                    lines.append(f"{metric}_bucket{_labels(labels + le)} {cumulative}")
+                lines.append(f"{metric}_bucket{_labels(labels + [('le', '+Inf')])} {count}")
+                lines.append(f"{metric}_sum{_labels(labels)} {_number(total)}")
+                lines.append(f"{metric}_count{_labels(labels)} {count}")
+        return lines
+
+
+class MetricsExporter:
+    """Serves ``registry.render()`` at ``/metrics`` from a daemon thread"""
+
+    def __init__(self, registry, host="127.0.0.1", port=9464):
+        self.registry = registry
+        self.host = host
+        self.requested_port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def port(self):
+        """Bound port (useful with port 0)"""
+        return self._server.server_address[1] if self._server else self.requested_port
+
+    def start(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.requested_port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="pomodoro-metrics", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+
+# Process-wide registry and the counters the app increments
+metrics = MetricsRegistry()
+pomodoros_completed = metrics.counter("pomodoro_pomodoros_completed_total", "Work sessions completed")
+tasks_completed = metrics.counter("pomodoro_tasks_completed_total", "Tasks marked as done")
+sessions = SessionTracker()
+
+
+def register_app_gauges(data_manager, scheduler, registry=metrics, tracker=sessions):
+    """Publish the gauges that read live app objects"""
+    registry.gauge("pomodoro_active_sessions", f"Browser sessions that reran in the last {tracker.window:g}s",
+                   tracker.active)
+    registry.gauge("pomodoro_running_timers", "Timers waiting on the scheduler", lambda: len(scheduler))
+    registry.gauge("pomodoro_stats_cache_hits_total", "Stats cache hits",
+                   lambda: data_manager.cache_info()["hits"], kind="counter")
+    registry.gauge("pomodoro_stats_cache_misses_total", "Stats cache misses",
+                   lambda: data_manager.cache_info()["misses"], kind="counter")
+    registry.gauge("pomodoro_stats_cache_hit_ratio", "Stats cache hits per lookup",
+                   lambda: data_manager.cache_info()["hit_ratio"])
+
+
+_shared_exporter = None
+_shared_exporter_lock = threading.Lock()
+
+
+def get_shared_exporter(data_manager, scheduler):
+    """
+    Process-wide exporter on ``$POMODORO_METRICS_PORT`` (bound to
+    ``$POMODORO_METRICS_HOST``, default localhost), or None when the port is
+    not set. Starting it turns ``instrumentation`` on, which the latency
+    histograms come from. A port already in use is logged and the app runs
+    without an exporter.
+    """
+    global _shared_exporter
+    port = os.environ.get("POMODORO_METRICS_PORT")
+    if not port:
+        return None
+    with _shared_exporter_lock:
+        if _shared_exporter is None:
+            register_app_gauges(data_manager, scheduler)
+            exporter = MetricsExporter(metrics, os.environ.get("POMODORO_METRICS_HOST", "127.0.0.1"), int(port))
+            try:
+                _shared_exporter = exporter.start()
+            except OSError:
+                logger.exception("Metrics exporter could not listen on port %s", port)
+                _shared_exporter = False
+            else:
+                instrumentation.enabled = True
+        return _shared_exporter or None
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+One-shot migration of the daily stats_<date>.json files into the SQLite backend.
+
+Usage:
+    python migrate_to_sqlite.py [--data-dir data] [--db data/pomodoro.sqlite3]
+
+Days that are already in the database are skipped, so it is safe to re-run.
+Afterwards start the app with PomodoroDataManager(storage="sqlite").
+"""
+
+import argparse
+from storage import migrate_json_to_sqlite
+
+def main():
+    """Run the migration from the command line."""
+    parser = argparse.ArgumentParser(description="Import stats_*.json files into SQLite")
+    parser.add_argument('--data-dir', default='data',
+                        help='Directory containing the stats_*.json files (default: data)')
+    parser.add_argument('--db', default=None,
+                        help='SQLite database path (default: <data-dir>/pomodoro.sqlite3)')
+    args = parser.parse_args()
+
+    imported = migrate_json_to_sqlite(args.data_dir, db_path=args.db)
+    print(f"Imported {imported} day(s) into SQLite.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Streamlit entry point used by ``run_pomodoro.py --profile``.
+
+Runs the app named by ``POMODORO_PROFILE_APP`` on every rerun and profiles
+the first ones (see profiling.RerunProfiler); the app itself is unchanged.
+Fragment reruns call back into the app directly and are not captured.
+"""
+
+import os
+import runpy
+from profiling import get_shared_profiler
+
+get_shared_profiler().capture(
+    runpy.run_path, os.environ.get("POMODORO_PROFILE_APP", "app.py"), run_name="__main__"
+)
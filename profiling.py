@@ -0,0 +1,166 @@
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+from file_locking import atomic_write_text
+
+
+# Held while any RerunProfiler captures a rerun
+_capture_lock = threading.Lock()
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack every ``interval`` seconds.
+
+    Stacks are counted root-first up to (not including) ``stop_frame``, in
+    the ``frame;frame;frame`` form flame graph tools read.
+    """
+
+    def __init__(self, thread_id, stop_frame=None, interval=0.005):
+        self.thread_id = thread_id
+        self.stop_frame = stop_frame
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pomodoro-profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame is not self.stop_frame:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+
+class RerunProfiler:
+    """
+    Profiles the first ``max_reruns`` calls of ``capture`` and writes the
+    results to ``output_dir``.
+
+    Each captured rerun gets a ``cProfile`` dump (``rerun-NNNN.prof``, open
+    it with ``pstats`` or snakeviz) with a text summary next to it, and a
+    ``tracemalloc`` snapshot (``rerun-NNNN.tracemalloc``) plus the top
+    allocation differences over the rerun. Stack samples from every captured
+    rerun are summed into ``stacks.folded`` for flamegraph.pl or speedscope,
+    and ``reruns.jsonl`` has one line of wall time and peak memory per rerun.
+    Later calls run unprofiled.
+
+    Only one rerun in the process is captured at a time: ``tracemalloc`` is
+    process-wide, and from Python 3.12 a second active ``cProfile`` raises.
+    A rerun of another session that starts meanwhile runs unprofiled and
+    does not count towards ``max_reruns``.
+    """
+
+    def __init__(self, output_dir="profiles", max_reruns=20, sample_interval=0.005, tracemalloc_frames=10):
+        self.output_dir = output_dir
+        self.max_reruns = max_reruns
+        self.sample_interval = sample_interval
+        self.tracemalloc_frames = tracemalloc_frames
+        self.captured = 0
+        self.stacks = Counter()
+        self._started_tracemalloc = False
+        self._lock = threading.Lock()
+
+    def capture(self, func, *args, **kwargs):
+        """Call ``func``, profiling it unless the cap is reached or another capture is running"""
+        rerun = None
+        if _capture_lock.acquire(blocking=False):
+            with self._lock:
+                if self.captured < self.max_reruns:
+                    self.captured += 1
+                    rerun = self.captured
+            if rerun is None:
+                _capture_lock.release()
+        if rerun is None:
+            return func(*args, **kwargs)
+        try:
+            return self._profile(rerun, func, args, kwargs)
+        finally:
+            _capture_lock.release()
+
+    def _profile(self, rerun, func, args, kwargs):
+        """Run one captured rerun; caller holds ``_capture_lock``"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.tracemalloc_frames)
+            self._started_tracemalloc = True
+        before = tracemalloc.take_snapshot()
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        sampler = StackSampler(threading.get_ident(), sys._getframe(), self.sample_interval).start()
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            wall = time.perf_counter() - start
+            stacks = sampler.stop()
+            after = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            self._write(rerun, profile, before, after, stacks, wall, peak)
+            if self.captured >= self.max_reruns and self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    def _write(self, rerun, profile, before, after, stacks, wall, peak):
+        """Write one rerun's files and update the aggregated ones"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"rerun-{rerun:04d}")
+
+        profile.dump_stats(f"{base}.prof")
+        with open(f"{base}.txt", "w") as f:
+            pstats.Stats(profile, stream=f).sort_stats("cumulative").print_stats(40)
+
+        after.dump(f"{base}.tracemalloc")
+        with open(f"{base}.mem.txt", "w") as f:
+            for diff in after.compare_to(before, "lineno")[:25]:
+                f.write(f"{diff}\n")
+
+        with self._lock:
+            self.stacks.update(stacks)
+            folded = "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+            atomic_write_text(os.path.join(self.output_dir, "stacks.folded"), folded, fsync=False)
+            with open(os.path.join(self.output_dir, "reruns.jsonl"), "a") as f:
+                f.write(json.dumps({
+                    "rerun": rerun,
+                    "wall_ms": wall * 1000,
+                    "peak_kib": peak / 1024,
+                    "samples": sum(stacks.values()),
+                }) + "\n")
+
+
+_shared_profiler = None
+_shared_profiler_lock = threading.Lock()
+
+
+def get_shared_profiler():
+    """
+    Process-wide profiler configured by ``run_pomodoro.py --profile``:
+    ``POMODORO_PROFILE_DIR`` and ``POMODORO_PROFILE_RERUNS``.
+    """
+    global _shared_profiler
+    with _shared_profiler_lock:
+        if _shared_profiler is None:
+            _shared_profiler = RerunProfiler(
+                output_dir=os.environ.get("POMODORO_PROFILE_DIR", "profiles"),
+                max_reruns=int(os.environ.get("POMODORO_PROFILE_RERUNS", "20")),
+            )
+        return _shared_profiler
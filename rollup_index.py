@@ -0,0 +1,219 @@
+import os
+import json
+from datetime import date, timedelta
+from file_locking import atomic_write_text
+
+INDEX_VERSION = 1
+DEFAULT_STATUSES = ("Open", "In Progress", "Done", "Blocked")
+
+
+def summarize_day(stats):
+    """Reduce a daily stats dict to the counters kept by the rollup index"""
+    by_status = {}
+    tasks = stats.get("completed_tasks", [])
+    for task in tasks:
+        if isinstance(task, dict) and "status" in task:
+            status = task["status"]
+        else:
+            # For old format tasks without status, count as "Done"
+            status = "Done"
+        by_status[status] = by_status.get(status, 0) + 1
+    return {
+        "pomodoros": stats.get("pomodoros_completed", 0),
+        "tasks": len(tasks),
+        "by_status": by_status,
+    }
+
+
+def _month_end(day):
+    """Last day of the month containing ``day``"""
+    next_month = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    return next_month - timedelta(days=1)
+
+
+def _bucket_keys(day):
+    """Week, month and year bucket keys that a day rolls up into"""
+    iso_year, iso_week, _ = day.isocalendar()
+    return (
+        f"{iso_year}-W{iso_week:02d}",
+        f"{day.year}-{day.month:02d}",
+        f"{day.year}",
+    )
+
+
+def decompose_range(start, end):
+    """
+    Split the inclusive range ``[start, end]`` into the coarsest buckets.
+
+    Yields bucket keys (years, months, ISO weeks and single days) that exactly
+    cover the range. Weeks that would straddle a month the range fully covers
+    are broken into days so the month bucket can be used instead, which keeps
+    the number of buckets to a few dozen for any range.
+    """
+    cursor = start
+    while cursor <= end:
+        if cursor.month == 1 and cursor.day == 1 and date(cursor.year, 12, 31) <= end:
+            yield f"{cursor.year}"
+            cursor = date(cursor.year + 1, 1, 1)
+        elif cursor.day == 1 and _month_end(cursor) <= end:
+            yield f"{cursor.year}-{cursor.month:02d}"
+            cursor = _month_end(cursor) + timedelta(days=1)
+        elif cursor.weekday() == 0 and cursor + timedelta(days=6) <= end and not (
+            (cursor + timedelta(days=6)).month != cursor.month
+            and _month_end(cursor + timedelta(days=6)) <= end
+        ):
+            yield _bucket_keys(cursor)[0]
+            cursor += timedelta(days=7)
+        else:
+            yield cursor.isoformat()
+            cursor += timedelta(days=1)
+
+
+class RollupIndex:
+    """
+    Daily -> weekly -> monthly -> yearly counters of pomodoros and task statuses.
+
+    Only the per-day records are persisted; the coarser buckets are derived on
+    load and then maintained incrementally by ``set_day``. Each day record keeps
+    the signature of the file it was computed from so that ``sync`` only
+    re-reads days that changed on disk.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.days = {}
+        self.buckets = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path):
+        """Load a persisted index, returning an empty one if it is missing or stale"""
+        index = cls(path)
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+            if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+                for day_iso, record in data.get("days", {}).items():
+                    index.set_day(day_iso, record, record.get("sig"))
+                index.dirty = False
+        return index
+
+    def save(self):
+        """Atomically persist the per-day records"""
+        if not self.path:
+            return
+        # The index can always be rebuilt from the daily files, so skip the fsync
+        atomic_write_text(
+            self.path,
+            json.dumps({"version": INDEX_VERSION, "days": self.days}, separators=(",", ":")),
+            fsync=False
+        )
+        self.dirty = False
+
+    def sync(self, signatures, load_day):
+        """
+        Bring the index in line with storage.
+
+        ``signatures`` maps every stored ISO day to an opaque signature (for
+        example mtime and size); ``load_day`` returns the stats dict for a day.
+        Returns the number of days that had to be re-read.
+        """
+        reread = 0
+        for day_iso in [d for d in self.days if d not in signatures]:
+            self.remove_day(day_iso)
+        for day_iso, sig in signatures.items():
+            record = self.days.get(day_iso)
+            if record is not None and record.get("sig") == sig:
+                continue
+            self.set_day(day_iso, summarize_day(load_day(date.fromisoformat(day_iso))), sig)
+            reread += 1
+        return reread
+
+    def set_day(self, day_iso, record, sig=None):
+        """Replace a day's counters and propagate the difference to its buckets"""
+        old = self.days.get(day_iso)
+        record = {
+            "pomodoros": record.get("pomodoros", 0),
+            "tasks": record.get("tasks", 0),
+            "by_status": dict(record.get("by_status", {})),
+            "sig": sig,
+        }
+        self.days[day_iso] = record
+        self._propagate(day_iso, old, 1)
+        self.dirty = True
+
+    def remove_day(self, day_iso):
+        """Drop a day that no longer exists in storage"""
+        old = self.days.pop(day_iso, None)
+        if old is not None:
+            self._propagate(day_iso, old, -1)
+            self.dirty = True
+
+    def _propagate(self, day_iso, old, sign):
+        """Apply ``new - old`` (or ``-old`` when removing) to the day's parent buckets"""
+        new = self.days.get(day_iso) if sign > 0 else None
+        for key in _bucket_keys(date.fromisoformat(day_iso)):
+            bucket = self.buckets.setdefault(
+                key, {"pomodoros": 0, "days_active": 0, "tasks": 0, "by_status": {}}
+            )
+            for record, factor in ((old, -1), (new, 1)):
+                if record is None:
+                    continue
+                bucket["pomodoros"] += factor * record["pomodoros"]
+                bucket["days_active"] += factor * (1 if record["pomodoros"] > 0 else 0)
+                bucket["tasks"] += factor * record["tasks"]
+                for status, count in record["by_status"].items():
+                    bucket["by_status"][status] = bucket["by_status"].get(status, 0) + factor * count
+
+    def _bucket(self, key):
+        """Counters for a bucket key (a day ISO string or a week/month/year key)"""
+        if len(key) == 10:
+            record = self.days.get(key)
+            if record is None:
+                return None
+            return {
+                "pomodoros": record["pomodoros"],
+                "days_active": 1 if record["pomodoros"] > 0 else 0,
+                "tasks": record["tasks"],
+                "by_status": record["by_status"],
+            }
+        return self.buckets.get(key)
+
+    def summarize(self, start, end, include_daily=False):
+        """Combine the precomputed buckets covering ``[start, end]``"""
+        summary = {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "total_pomodoros": 0,
+            "days_active": 0,
+            "daily_counts": {},
+            "task_counts": {
+                "total": 0,
+                "by_status": {status: 0 for status in DEFAULT_STATUSES}
+            }
+        }
+
+        by_status = summary["task_counts"]["by_status"]
+        for key in decompose_range(start, end):
+            bucket = self._bucket(key)
+            if bucket is None:
+                continue
+            summary["total_pomodoros"] += bucket["pomodoros"]
+            summary["days_active"] += bucket["days_active"]
+            summary["task_counts"]["total"] += bucket["tasks"]
+            for status, count in bucket["by_status"].items():
+                if count:
+                    by_status[status] = by_status.get(status, 0) + count
+
+        if include_daily:
+            day = start
+            while day <= end:
+                record = self.days.get(day.isoformat())
+                if record is not None and record["pomodoros"] > 0:
+                    summary["daily_counts"][day.isoformat()] = record["pomodoros"]
+                day += timedelta(days=1)
+
+        return summary
@@ -19,6 +19,12 @@ def main():
                         help='Run in watch mode - automatically reload when code changes')
     parser.add_argument('--debug', '-d', action='store_true',
                         help='Run with debug mode enabled to see Streamlit logs')
+    parser.add_argument('--profile', '-p', action='store_true',
+                        help='Profile script reruns (cProfile, tracemalloc and folded stacks)')
+    parser.add_argument('--profile-dir', default='profiles',
+                        help='Directory for profiling output (default: profiles)')
+    parser.add_argument('--profile-reruns', type=int, default=20,
+                        help='Number of reruns to capture before profiling stops (default: 20)')
     parser.add_argument('app_filepath', nargs='?', default='app.py',
                         help='Streamlit app file to run (default: app.py)')
     args = parser.parse_args()
@@ -67,6 +73,15 @@ def main():
     # Construct the Streamlit run command with appropriate flags
     streamlit_cmd = ["streamlit", "run", args.app_filepath]
     
+    if args.profile:
+        # profile_app.py runs the app under the profiler; settings go through
+        # the environment, which conda run and the shell pass on
+        print(f"Profiling the first {args.profile_reruns} reruns into {os.path.abspath(args.profile_dir)}")
+        os.environ["POMODORO_PROFILE_APP"] = os.path.abspath(args.app_filepath)
+        os.environ["POMODORO_PROFILE_DIR"] = os.path.abspath(args.profile_dir)
+        os.environ["POMODORO_PROFILE_RERUNS"] = str(args.profile_reruns)
+        streamlit_cmd = ["streamlit", "run", "profile_app.py"]
+    
     if args.watch:
         print("Running in watch mode. App will reload automatically when code changes.")
         streamlit_cmd.append("--server.runOnSave=true")
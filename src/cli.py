@@ -0,0 +1,291 @@
+"""
+Headless pomodoro timer: runs the work/break cycle in a terminal or as a
+background daemon, without Streamlit.
+
+Usage:
+    python -m src.cli run [--work 25] [--short-break 5] [--long-break 15]
+                          [--cycles N] [--data-dir data] [--daemon] [--notify]
+    python -m src.cli status [--data-dir data]
+    python -m src.cli stop [--data-dir data]
+
+Completed work sessions are recorded through ``PomodoroDataManager`` in the
+same ``data_dir`` the app reads, so they show up on the stats page. A running
+timer keeps its state in ``<data_dir>/cli_timer.json`` for ``status`` and
+``stop``; a daemon logs to ``<data_dir>/cli_timer.log``.
+
+Only the timer and the data layer are imported, so the timer is counting
+within a few tens of milliseconds of the command being run.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+from datetime import datetime
+
+# Allow ``python src/cli.py`` as well as ``python -m src.cli``
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.timer import PomodoroTimer, TimerMode
+from data_manager import PomodoroDataManager
+from file_locking import FileLock, LockTimeout, RetryPolicy, atomic_write_text
+
+STATE_FILE = "cli_timer.json"
+LOG_FILE = "cli_timer.log"
+
+
+def format_time(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def state_path(data_dir):
+    return os.path.join(data_dir, STATE_FILE)
+
+
+def read_state(data_dir):
+    """The state file of the running timer, or None"""
+    try:
+        with open(state_path(data_dir)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def run_lock(data_dir):
+    """
+    Lock a timer holds for as long as it runs. Whether it is held, not whether
+    the pid in the state file is alive, tells if a timer is running, so a
+    stale state file or a reused pid is never mistaken for one.
+    """
+    return FileLock(state_path(data_dir), RetryPolicy(timeout=0))
+
+
+def running_state(data_dir):
+    """State file of the running timer, or None if no timer is running"""
+    lock = run_lock(data_dir)
+    try:
+        lock.acquire()
+    except LockTimeout:
+        state = read_state(data_dir)
+        if isinstance(state, dict) and isinstance(state.get("pid"), int):
+            return state
+        return None
+    except OSError:
+        return None
+    lock.release()
+    return None
+
+
+class CliTimer:
+    """
+    Drives a ``PomodoroTimer`` from a plain loop: sleeps until the next
+    deadline (or the next display tick on a terminal), records finished work
+    sessions and keeps the state file current.
+    """
+
+    def __init__(self, timer, data_manager, data_dir, cycles=0, out=None, notifier=None):
+        self.timer = timer
+        self.data_manager = data_manager
+        self.data_dir = data_dir
+        self.cycles = cycles
+        self.out = out or sys.stdout
+        self.notifier = notifier
+        self.interactive = self.out.isatty()
+        timer.on_complete(self.on_phase_complete)
+
+    def on_phase_complete(self, timer, completed_mode, next_mode):
+        """Record a finished work session and announce the next phase"""
+        if completed_mode == TimerMode.WORK:
+            stats = self.data_manager.save_pomodoro_completed()
+            title, message = "Pomodoro Complete", "Time for a break!"
+            done = f" ({stats['pomodoros_completed']} today)" if stats else ""
+        else:
+            title, message, done = "Break Over", "Time to focus!", ""
+        if self.notifier is not None:
+            self.notifier.send_notification(title, message)
+        self._clear_line()
+        self.out.write(f"{datetime.now():%H:%M} {completed_mode.value} complete{done}, "
+                       f"{next_mode.value} {format_time(timer.duration(next_mode))}"
+                       f"{chr(7) if self.interactive else ''}\n")
+        self.out.flush()
+        self.save_state()
+
+    def save_state(self):
+        state = {"pid": os.getpid(), "timer": self.timer.to_state()}
+        atomic_write_text(state_path(self.data_dir), json.dumps(state), fsync=False)
+
+    def run(self):
+        """Start the timer and block until ``cycles`` work sessions are done (forever if 0)"""
+        self.timer.start()
+        self.save_state()
+        self.out.write(f"{datetime.now():%H:%M} {self.timer.mode.value} {format_time(self.timer.duration())}\n")
+        self.out.flush()
+        while not self.cycles or self.timer.sessions_completed < self.cycles:
+            remaining = self.timer.remaining()
+            if self.interactive:
+                self.out.write(f"\r{self.timer.mode.value}: {format_time(remaining)} ")
+                self.out.flush()
+                # Wake on whole seconds of the countdown
+                delay = remaining - int(remaining) or 1.0
+            else:
+                delay = remaining
+            time.sleep(max(delay, 0.001))
+        self._clear_line()
+
+    def _clear_line(self):
+        if self.interactive:
+            self.out.write("\r\033[K")
+
+
+def daemonize(log_path):
+    """Detach from the terminal (POSIX double fork); output goes to ``log_path``"""
+    if os.fork():
+        os._exit(0)
+    os.setsid()
+    if os.fork():
+        os._exit(0)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    with open(os.devnull) as devnull:
+        os.dup2(devnull.fileno(), 0)
+    log = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    os.dup2(log, 1)
+    os.dup2(log, 2)
+    os.close(log)
+
+
+def _terminate(signum, frame):
+    # ``stop`` sends SIGTERM; shut down the same way as Ctrl-C
+    raise KeyboardInterrupt
+
+
+def cmd_run(args):
+    os.makedirs(args.data_dir, exist_ok=True)
+    timer = PomodoroTimer(
+        work_duration=args.work * 60,
+        break_duration=args.short_break * 60,
+        long_break_duration=args.long_break * 60,
+        long_break_interval=args.long_break_interval,
+        auto_start=True,
+    )
+    # Held until the timer exits, so of two runs started together only one
+    # gets to record sessions. A daemon's forks inherit it.
+    lock = run_lock(args.data_dir)
+    try:
+        lock.acquire()
+    except LockTimeout:
+        state = read_state(args.data_dir) or {}
+        sys.stderr.write(f"A timer is already running (pid {state.get('pid', '?')}); stop it first\n")
+        return 1
+    try:
+        if args.daemon:
+            log_path = os.path.join(args.data_dir, LOG_FILE)
+            print(f"Timer running in the background, logging to {log_path}")
+            daemonize(log_path)
+        data_manager = PomodoroDataManager(args.data_dir, storage=args.storage)
+        notifier = None
+        if args.notify:
+            # Only loaded when asked for; the notification sinks are not cheap to import
+            from src.utils.notifications import get_shared_notifier
+            notifier = get_shared_notifier()
+        cli_timer = CliTimer(timer, data_manager, args.data_dir, cycles=args.cycles, notifier=notifier)
+        signal.signal(signal.SIGTERM, _terminate)
+        try:
+            cli_timer.run()
+        except KeyboardInterrupt:
+            cli_timer._clear_line()
+        finally:
+            if notifier is not None:
+                notifier.flush(timeout=2.0)
+            data_manager.close()
+    finally:
+        try:
+            os.unlink(state_path(args.data_dir))
+        except FileNotFoundError:
+            pass
+        lock.release()
+    print(f"{timer.sessions_completed} pomodoro(s) completed")
+    return 0
+
+
+def cmd_status(args):
+    state = running_state(args.data_dir)
+    if state and isinstance(state.get("timer"), dict):
+        timer = PomodoroTimer()
+        timer.load_state(state["timer"])
+        # Expired phases are advanced on this copy only; the running process
+        # records them itself
+        snapshot = timer.snapshot()
+        running = "running" if snapshot["is_running"] else "paused"
+        print(f"{snapshot['mode'].value}: {format_time(snapshot['remaining'])} left ({running}, pid {state['pid']})")
+    else:
+        print("No timer running")
+    stats = PomodoroDataManager(args.data_dir, storage=args.storage).load_daily_stats()
+    print(f"Pomodoros completed today: {stats.get('pomodoros_completed', 0) if stats else 0}")
+    return 0
+
+
+def cmd_stop(args):
+    state = running_state(args.data_dir)
+    if not state:
+        print("No timer running")
+        return 1
+    os.kill(state["pid"], signal.SIGTERM)
+    print(f"Stopped timer (pid {state['pid']})")
+    return 0
+
+
+def positive(convert):
+    """argparse ``type`` that converts with ``convert`` and rejects values <= 0"""
+    def parse(value):
+        number = convert(value)
+        if not number > 0:
+            raise argparse.ArgumentTypeError(f"must be positive, not {value}")
+        return number
+    parse.__name__ = convert.__name__
+    return parse
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Headless Pomodoro timer")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data-dir", default="data", help="Stats directory shared with the app (default: data)")
+    common.add_argument("--storage", default="json", choices=["json", "eventlog", "sqlite"],
+                        help="Stats backend; use the one the app uses (default: json)")
+    commands = parser.add_subparsers(dest="command")
+
+    run = commands.add_parser("run", parents=[common], help="Run the work/break cycle")
+    run.add_argument("--work", type=positive(float), default=25, help="Work minutes (default: 25)")
+    run.add_argument("--short-break", type=positive(float), default=5, help="Short break minutes (default: 5)")
+    run.add_argument("--long-break", type=positive(float), default=15, help="Long break minutes (default: 15)")
+    run.add_argument("--long-break-interval", type=positive(int), default=4,
+                     help="Work sessions per long break (default: 4)")
+    run.add_argument("--cycles", type=positive(int), default=0, help="Stop after N work sessions (default: run until stopped)")
+    run.add_argument("--daemon", "-d", action="store_true", help="Run in the background (POSIX only)")
+    run.add_argument("--notify", action="store_true", help="Send notifications through POMODORO_NOTIFY_* sinks")
+    run.set_defaults(func=cmd_run)
+
+    status = commands.add_parser("status", parents=[common], help="Show the running timer and today's count")
+    status.set_defaults(func=cmd_status)
+
+    stop = commands.add_parser("stop", parents=[common], help="Stop the running timer")
+    stop.set_defaults(func=cmd_stop)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 0
+    if getattr(args, "daemon", False) and not hasattr(os, "fork"):
+        parser.error("--daemon needs a POSIX system; run it in a terminal instead")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+import heapq
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class TimerScheduler:
+    """
+    Drives many ``PomodoroTimer`` instances from a single thread.
+
+    Running timers are kept in a min-heap ordered by deadline. The scheduler
+    thread sleeps until the earliest deadline (or until an earlier one is
+    scheduled) and then polls the due timers, which completes their phases
+    and runs their ``on_complete`` callbacks. Because the transition happens
+    under the timer's own lock, a callback fires exactly once per phase even
+    if a page rerun reads the timer at the same moment.
+
+    ``schedule`` and ``cancel`` are O(log n) and O(1): a timer's previous heap
+    entry is not searched for but invalidated, and skipped when it surfaces.
+    The heap is rebuilt when stale entries outnumber live ones. Entries are
+    re-validated against the timer's current deadline when they come due, so
+    a paused timer or one whose duration grew is simply left alone or pushed
+    back.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._heap = []          # (deadline, seq, timer)
+        self._entries = {}       # timer -> seq of its live heap entry
+        self._seq = 0
+        self._thread = None
+        self._stopped = False
+        self.fired = 0           # phase completions triggered by the scheduler
+
+    def __len__(self):
+        with self._cond:
+            return len(self._entries)
+
+    def __contains__(self, timer):
+        with self._cond:
+            return timer in self._entries
+
+    def schedule(self, timer):
+        """Track ``timer`` at its current deadline; untracks it when it is not running"""
+        deadline = timer.deadline
+        if deadline is None:
+            self.cancel(timer)
+            return
+        with self._cond:
+            self._push(timer, deadline)
+            self._compact()
+            if self._heap[0][1] == self._seq:
+                # New earliest deadline: wake the thread so it sleeps less
+                self._cond.notify_all()
+
+    def cancel(self, timer):
+        """Stop tracking ``timer``; its heap entry is dropped lazily"""
+        with self._cond:
+            self._entries.pop(timer, None)
+            self._compact()
+
+    def next_deadline(self):
+        """Earliest live deadline, or None when nothing is scheduled"""
+        with self._cond:
+            self._discard_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now=None):
+        """Poll every timer due at or before ``now``; returns how many were due"""
+        now = self._clock() if now is None else now
+        due = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, seq, timer = heapq.heappop(self._heap)
+                if self._entries.get(timer) == seq:
+                    del self._entries[timer]
+                    due.append(timer)
+
+        for timer in due:
+            try:
+                # The timer polls with its own clock, so a deadline that moved
+                # later is left alone here and pushed back below
+                self.fired += len(timer.poll())
+            except Exception:
+                logger.exception("Timer completion handler failed")
+            # Auto-started next phase, or a deadline that moved later
+            if timer.deadline is not None:
+                with self._cond:
+                    if timer not in self._entries:
+                        self._push(timer, timer.deadline)
+        return len(due)
+
+    def start(self):
+        """Start the scheduler thread (idempotent)"""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="pomodoro-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the scheduler thread; scheduled timers are kept"""
+        with self._cond:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        """Scheduler thread: sleep until the next deadline, then fire what is due"""
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                self._discard_stale()
+                if self._heap:
+                    timeout = max(0.0, self._heap[0][0] - self._clock())
+                else:
+                    timeout = None
+                if timeout is None or timeout > 0:
+                    self._cond.wait(timeout)
+                    continue
+            self.run_due()
+
+    def _push(self, timer, deadline):
+        """Add a live heap entry; must hold the condition"""
+        self._seq += 1
+        self._entries[timer] = self._seq
+        heapq.heappush(self._heap, (deadline, self._seq, timer))
+
+    def _discard_stale(self):
+        """Pop invalidated entries off the top of the heap; must hold the condition"""
+        while self._heap and self._entries.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+
+    def _compact(self):
+        """Rebuild the heap once stale entries dominate; must hold the condition"""
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._entries):
+            self._heap = [entry for entry in self._heap if self._entries.get(entry[2]) == entry[1]]
+            heapq.heapify(self._heap)
+
+
+_shared_scheduler = None
+_shared_scheduler_lock = threading.Lock()
+
+
+def get_shared_scheduler():
+    """Process-wide scheduler shared by every session, started on first use"""
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = TimerScheduler()
+            _shared_scheduler.start()
+        return _shared_scheduler
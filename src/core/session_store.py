@@ -0,0 +1,237 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+SESSION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class SessionStore(ABC):
+    """
+    Versioned key-value store for per-user session state.
+
+    Every entry has a version that starts at 1 and grows by one on each
+    write; a missing entry has version 0. ``version`` is the cheap check a
+    rerun makes, and ``get`` is only needed when it changed. Writes are
+    compare-and-swap: ``compare_and_swap`` succeeds only if the entry is still
+    at the version the caller last saw, so two workers holding the same
+    session cannot overwrite each other's changes unnoticed.
+
+    States are JSON-ready dicts and are stored serialized, so callers never
+    share mutable state with the store.
+    """
+
+    @abstractmethod
+    def version(self, session_id):
+        """Current version of a session, 0 if it does not exist"""
+
+    @abstractmethod
+    def get(self, session_id):
+        """``(version, state)`` of a session; ``(0, None)`` if it does not exist"""
+
+    @abstractmethod
+    def compare_and_swap(self, session_id, expected_version, state):
+        """Store ``state`` if the session is at ``expected_version``; returns the new version or None"""
+
+    @abstractmethod
+    def delete(self, session_id):
+        """Forget a session"""
+
+    @abstractmethod
+    def purge(self, max_age):
+        """Forget sessions not written for ``max_age`` seconds; returns how many"""
+
+    def close(self):
+        """Release any handles"""
+
+
+class MemorySessionStore(SessionStore):
+    """Sessions in a dict; shared by the threads of one process only"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # session_id -> (version, state JSON, updated_at)
+
+    def version(self, session_id):
+        entry = self._entries.get(session_id)
+        return entry[0] if entry else 0
+
+    def get(self, session_id):
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return 0, None
+        return entry[0], json.loads(entry[1])
+
+    def compare_and_swap(self, session_id, expected_version, state):
+        data = json.dumps(state)
+        with self._lock:
+            if self.version(session_id) != expected_version:
+                return None
+            self._entries[session_id] = (expected_version + 1, data, time.time())
+            return expected_version + 1
+
+    def delete(self, session_id):
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def purge(self, max_age):
+        cutoff = time.time() - max_age
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[2] < cutoff]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions in a SQLite database in WAL mode, shared by every process on
+    the host and kept across restarts.
+
+    ``version`` reads one integer through the primary key and
+    ``compare_and_swap`` is a single conditional UPDATE (or INSERT for a new
+    session), so no explicit locking or read-modify-write transaction is
+    needed. Each thread gets its own connection.
+    """
+
+    def __init__(self, path, busy_timeout=5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SESSION_SCHEMA)
+
+    def _connect(self):
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def version(self, session_id):
+        row = self._connect().execute("SELECT version FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return row[0] if row else 0
+
+    def get(self, session_id):
+        row = self._connect().execute(
+            "SELECT version, state FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return 0, None
+        return row[0], json.loads(row[1])
+
+    def compare_and_swap(self, session_id, expected_version, state):
+        conn = self._connect()
+        data = json.dumps(state)
+        with conn:
+            if expected_version == 0:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO sessions (id, version, state, updated_at) VALUES (?, 1, ?, ?)",
+                    (session_id, data, time.time())
+                )
+            else:
+                cursor = conn.execute(
+                    "UPDATE sessions SET version = version + 1, state = ?, updated_at = ? "
+                    "WHERE id = ? AND version = ?",
+                    (data, time.time(), session_id, expected_version)
+                )
+        return expected_version + 1 if cursor.rowcount == 1 else None
+
+    def delete(self, session_id):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def purge(self, max_age):
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - max_age,))
+        return cursor.rowcount
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class TimerSync:
+    """
+    Keeps one session's ``PomodoroTimer`` in step with its store entry.
+
+    ``pull`` loads the stored state if another worker (or a previous run of
+    this one) wrote a newer version; ``push`` saves the local state with
+    compare-and-swap and, if someone else got there first, takes their state
+    instead. Safe to call from the scheduler thread and reruns at once.
+    """
+
+    def __init__(self, store, session_id, timer):
+        self.store = store
+        self.session_id = session_id
+        self.timer = timer
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def pull(self):
+        """Load a newer stored state; returns whether the timer changed"""
+        with self._lock:
+            if self.store.version(self.session_id) == self.version:
+                return False
+            return self._load()
+
+    def push(self):
+        """Save the timer; returns False if a newer stored state won instead"""
+        with self._lock:
+            version = self.store.compare_and_swap(self.session_id, self.version, self.timer.to_state())
+            if version is None:
+                self._load()
+                return False
+            self.version = version
+            return True
+
+    def _load(self):
+        """Replace the timer state with the stored one; must hold the lock"""
+        version, state = self.store.get(self.session_id)
+        if state is not None:
+            self.timer.load_state(state)
+        self.version = version
+        return state is not None
+
+
+def create_session_store(path=None):
+    """SQLite store at ``path``, or an in-memory store when ``path`` is empty"""
+    if path:
+        return SQLiteSessionStore(path)
+    return MemorySessionStore()
+
+
+_shared_session_store = None
+_shared_session_store_lock = threading.Lock()
+
+
+def get_shared_session_store(max_age=7 * 24 * 3600):
+    """
+    Process-wide session store: SQLite at ``$POMODORO_SESSION_STORE`` when set
+    (share the path between workers), in memory otherwise. Sessions idle for
+    more than ``max_age`` seconds are dropped when it is opened.
+    """
+    global _shared_session_store
+    with _shared_session_store_lock:
+        if _shared_session_store is None:
+            _shared_session_store = create_session_store(os.environ.get("POMODORO_SESSION_STORE"))
+            _shared_session_store.purge(max_age)
+        return _shared_session_store
@@ -1,20 +1,275 @@
+import time
+import threading
+from enum import Enum
+
+
+class TimerMode(str, Enum):
+    """Phases of the pomodoro cycle"""
+    WORK = "Work"
+    SHORT_BREAK = "Short Break"
+    LONG_BREAK = "Long Break"
+
+
+def check_durations(*durations):
+    """Raise ValueError unless every phase length is a positive number of seconds"""
+    for seconds in durations:
+        if not seconds > 0:
+            raise ValueError(f"Durations must be positive, got {seconds!r}")
+
+
 class PomodoroTimer:
-    def __init__(self):
-        self.work_duration = 25 * 60  # 25 minutes in seconds
-        self.break_duration = 5 * 60  # 5 minutes in seconds
-        self.long_break_duration = 15 * 60  # 15 minutes in seconds
-        self.current_time = 0
-        self.is_running = False
+    """
+    Pomodoro countdown built on ``time.monotonic()`` deadlines.
+
+    The timer never needs a tick: it stores when the current phase was
+    (re)started and how much of it had already elapsed, so ``remaining()`` is
+    O(1) and immune to wall-clock jumps. Reading the timer (``remaining()``,
+    ``elapsed()``, ``progress()``, ``snapshot()`` or ``poll()``) advances it
+    past any deadline that has expired: the phase is completed, completion
+    callbacks fire exactly once, and the next phase (short break, long break
+    every ``long_break_interval`` sessions, or work) is set up. The next phase
+    starts counting immediately if ``auto_start`` is set, otherwise it waits
+    for ``start()``.
+
+    Durations are in seconds, must be positive and may be changed at any
+    time; a running phase simply moves its deadline.
+    """
+
+    def __init__(self, work_duration=25 * 60, break_duration=5 * 60, long_break_duration=15 * 60,
+                 long_break_interval=4, auto_start=False, clock=time.monotonic):
+        check_durations(work_duration, break_duration, long_break_duration)
+        self.work_duration = work_duration  # 25 minutes in seconds
+        self.break_duration = break_duration  # 5 minutes in seconds
+        self.long_break_duration = long_break_duration  # 15 minutes in seconds
+        self.long_break_interval = long_break_interval
+        self.auto_start = auto_start
         self.sessions_completed = 0
+        self.mode = TimerMode.WORK
+        self._clock = clock
+        self._running = False
+        self._started_at = None     # clock value when the phase last (re)started
+        self._elapsed_before = 0.0  # seconds of this phase elapsed before _started_at
+        self._callbacks = []
+        self._lock = threading.RLock()
+
+    @property
+    def is_running(self):
+        """Whether the current phase is counting down"""
+        return self._running
+
+    def duration(self, mode=None):
+        """Length in seconds of ``mode`` (default: the current phase)"""
+        mode = mode or self.mode
+        if mode == TimerMode.WORK:
+            return self.work_duration
+        if mode == TimerMode.SHORT_BREAK:
+            return self.break_duration
+        return self.long_break_duration
+
+    @property
+    def deadline(self):
+        """Clock value at which the running phase ends, or None when paused"""
+        with self._lock:
+            if not self._running:
+                return None
+            return self._started_at + self.duration() - self._elapsed_before
+
+    @property
+    def current_time(self):
+        """Whole seconds elapsed in the current phase"""
+        return int(self._elapsed(self._clock()))
+
+    @current_time.setter
+    def current_time(self, seconds):
+        with self._lock:
+            self._elapsed_before = float(seconds)
+            if self._running:
+                self._started_at = self._clock()
+
+    def on_complete(self, callback):
+        """
+        Register ``callback(timer, completed_mode, next_mode)``.
+
+        It is called once for every phase that finishes (or is skipped),
+        outside the timer's lock, from whichever thread observed the expiry.
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+        return callback
+
+    def remove_callback(self, callback):
+        """Unregister a completion callback"""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
 
     def start(self):
-        self.is_running = True
+        """Start or resume the current phase"""
+        self.poll()
+        with self._lock:
+            if not self._running:
+                self._running = True
+                self._started_at = self._clock()
 
     def pause(self):
-        self.is_running = False
+        """Pause the current phase, keeping the time already elapsed"""
+        self.poll()
+        with self._lock:
+            if self._running:
+                self._elapsed_before = self._elapsed(self._clock())
+                self._running = False
+                self._started_at = None
+
+    def toggle(self):
+        """Start when paused, pause when running"""
+        if self.is_running:
+            self.pause()
+        else:
+            self.start()
 
     def reset(self):
-        self.current_time = 0
-        self.is_running = False
-        if self.current_time >= self.work_duration:
-            self.sessions_completed += 1 
\ No newline at end of file
+        """Stop and rewind the current phase to its full duration"""
+        self.poll()
+        with self._lock:
+            self._running = False
+            self._started_at = None
+            self._elapsed_before = 0.0
+
+    def skip(self):
+        """Complete the current phase now, as if its deadline had passed"""
+        with self._lock:
+            completion = self._complete_phase(self._clock(), keep_running=False)
+        self._notify([completion])
+
+    def poll(self, now=None):
+        """
+        Advance past every expired deadline; returns ``(completed, next)`` pairs.
+
+        All the read methods call this, so callers never have to.
+        """
+        now = self._clock() if now is None else now
+        completions = []
+        with self._lock:
+            while self._running and now >= self._started_at + self.duration() - self._elapsed_before:
+                completions.append(self._complete_phase(now, keep_running=self.auto_start))
+                if self.duration() <= 0:
+                    # Assigned directly, a zero-length phase would expire
+                    # again forever; complete at most one per poll
+                    break
+        self._notify(completions)
+        return completions
+
+    def remaining(self):
+        """Seconds left in the current phase"""
+        now = self._clock()
+        self.poll(now)
+        return max(0.0, self.duration() - self._elapsed(now))
+
+    def elapsed(self):
+        """Seconds elapsed in the current phase"""
+        now = self._clock()
+        self.poll(now)
+        return self._elapsed(now)
+
+    def progress(self):
+        """Fraction of the current phase that has elapsed, from 0.0 to 1.0"""
+        duration = self.duration()
+        return min(1.0, self.elapsed() / duration) if duration > 0 else 0.0
+
+    def snapshot(self):
+        """Consistent view of the timer state for rendering"""
+        now = self._clock()
+        self.poll(now)
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "is_running": self._running,
+                "remaining": max(0.0, self.duration() - self._elapsed(now)),
+                "duration": self.duration(),
+                "sessions_completed": self.sessions_completed,
+            }
+
+    def to_state(self, wall_clock=time.time):
+        """
+        JSON-ready state for storing the timer outside this process.
+
+        A running phase is saved as the wall-clock time (``wall_clock()``) it
+        (re)started at, since monotonic clock values mean nothing to another
+        process or after a restart. Expired deadlines are not advanced here;
+        whoever loads the state completes them on its next read.
+        """
+        with self._lock:
+            state = {
+                "mode": self.mode.value,
+                "sessions_completed": self.sessions_completed,
+                "work_duration": self.work_duration,
+                "break_duration": self.break_duration,
+                "long_break_duration": self.long_break_duration,
+                "long_break_interval": self.long_break_interval,
+                "auto_start": self.auto_start,
+                "running": self._running,
+                "elapsed_before": self._elapsed_before,
+            }
+            if self._running:
+                state["started_at_wall"] = wall_clock() - (self._clock() - self._started_at)
+            return state
+
+    def load_state(self, state, wall_clock=time.time):
+        """Replace the timer state with a ``to_state`` dict; callbacks are kept"""
+        check_durations(state["work_duration"], state["break_duration"], state["long_break_duration"])
+        with self._lock:
+            self.mode = TimerMode(state["mode"])
+            self.sessions_completed = state["sessions_completed"]
+            self.work_duration = state["work_duration"]
+            self.break_duration = state["break_duration"]
+            self.long_break_duration = state["long_break_duration"]
+            self.long_break_interval = state["long_break_interval"]
+            self.auto_start = state["auto_start"]
+            self._running = state["running"]
+            self._elapsed_before = state["elapsed_before"]
+            if self._running:
+                self._started_at = self._clock() - (wall_clock() - state["started_at_wall"])
+            else:
+                self._started_at = None
+
+    def next_mode(self):
+        """Phase that follows the current one"""
+        if self.mode != TimerMode.WORK:
+            return TimerMode.WORK
+        if (self.sessions_completed + 1) % self.long_break_interval == 0:
+            return TimerMode.LONG_BREAK
+        return TimerMode.SHORT_BREAK
+
+    def _elapsed(self, now):
+        """Seconds elapsed in the current phase at clock value ``now`` (no advancing)"""
+        with self._lock:
+            if self._running:
+                return self._elapsed_before + (now - self._started_at)
+            return self._elapsed_before
+
+    def _complete_phase(self, now, keep_running):
+        """Move to the next phase; must hold the lock. Returns ``(completed, next)``"""
+        completed = self.mode
+        next_mode = self.next_mode()
+        if self._running:
+            # Chain from the exact deadline so auto-started phases do not drift
+            phase_end = min(now, self._started_at + self.duration() - self._elapsed_before)
+        else:
+            phase_end = now
+        if completed == TimerMode.WORK:
+            self.sessions_completed += 1
+        self.mode = next_mode
+        self._elapsed_before = 0.0
+        self._running = keep_running
+        self._started_at = phase_end if keep_running else None
+        return completed, next_mode
+
+    def _notify(self, completions):
+        """Run callbacks for completed phases, outside the lock"""
+        if not completions:
+            return
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for completed, next_mode in completions:
+            for callback in callbacks:
+                callback(self, completed, next_mode)
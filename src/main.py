@@ -1,45 +1,60 @@
 import streamlit as st
 from datetime import datetime, date
+import math
 import time
 import sys
+import functools
 from pathlib import Path
-import plotly.graph_objects as go
 
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from src.core.timer import PomodoroTimer
-from src.utils.notifications import NotificationManager
-from src.models.task import Task
+from src.core.timer import PomodoroTimer, TimerMode
+from src.utils.notifications import get_shared_notifier
+from src.models.task import Task, TaskStatus
 
 def format_time(seconds):
     minutes = seconds // 60
     remaining_seconds = seconds % 60
     return f"{minutes:02d}:{remaining_seconds:02d}"
 
+def on_phase_complete(timer, completed_mode, next_mode):
+    if completed_mode == TimerMode.WORK:
+        st.session_state.notification.send_notification(
+            'Pomodoro Complete',
+            'Time for a break!'
+        )
+        st.session_state.celebrate = True
+
 def init_session_state():
+    if 'notification' not in st.session_state:
+        st.session_state.notification = get_shared_notifier()
     if 'timer' not in st.session_state:
         st.session_state.timer = PomodoroTimer()
-    if 'notification' not in st.session_state:
-        st.session_state.notification = NotificationManager()
-    if 'last_update' not in st.session_state:
-        st.session_state.last_update = time.time()
-    if 'needs_rerun' not in st.session_state:
-        st.session_state.needs_rerun = False
+        st.session_state.timer.on_complete(on_phase_complete)
+    if 'celebrate' not in st.session_state:
+        st.session_state.celebrate = False
     if 'tasks' not in st.session_state:
         st.session_state.tasks = []
 
 def add_task(name, description, due_date):
-    task = Task(name=name, description=description, due_date=due_date)
+    task = Task(name, due_date=due_date, notes=description, created_at=datetime.now())
     st.session_state.tasks.append(task)
 
 def delete_task(index):
     st.session_state.tasks.pop(index)
 
 def toggle_task(index):
-    st.session_state.tasks[index].completed = not st.session_state.tasks[index].completed
+    task = st.session_state.tasks[index]
+    task.status = TaskStatus.OPEN if task.completed else TaskStatus.DONE
 
+# The cycle never changes, so the figure is built once per process; callers
+# must treat it as read-only
+@functools.lru_cache(maxsize=1)
 def create_pomodoro_cycle_diagram():
+    # plotly is only needed once the diagram is drawn; keep it off startup
+    import plotly.graph_objects as go
+
     # Create a circular diagram showing the Pomodoro cycle
     labels = ['Work', 'Short Break', 'Work', 'Short Break', 
               'Work', 'Short Break', 'Work', 'Long Break']
@@ -108,8 +123,13 @@ def main():
             st.write(f"📅 {current_time.strftime('%A, %B %d, %Y')}")
             st.write(f"⏰ {current_time.strftime('%I:%M:%S %p')}")
 
-        remaining_time = st.session_state.timer.work_duration - st.session_state.timer.current_time
+        # Reading the timer advances it; completions fire on_phase_complete
+        timer_state = st.session_state.timer.snapshot()
+        remaining_time = int(math.ceil(timer_state["remaining"]))
         time_display = format_time(remaining_time)
+        if st.session_state.celebrate:
+            st.session_state.celebrate = False
+            st.balloons()
         
         st.markdown(f"<h1 style='text-align: center; font-size: 60px;'>{time_display}</h1>", 
                     unsafe_allow_html=True)
@@ -122,15 +142,12 @@ def main():
                     st.session_state.timer.pause()
                 else:
                     st.session_state.timer.start()
-                    st.session_state.needs_rerun = True
 
         with button_col2:
             if st.button("Reset", use_container_width=True):
                 st.session_state.timer.reset()
-                st.session_state.needs_rerun = False
 
-        progress = 1 - (remaining_time / st.session_state.timer.work_duration)
-        st.progress(progress)
+        st.progress(st.session_state.timer.progress())
 
     with col2:
         # Tasks section
@@ -160,7 +177,7 @@ def main():
                     col1, col2 = st.columns([6, 1])
                     with col1:
                         checkbox = st.checkbox(
-                            task.name,
+                            task.description,
                             value=task.completed,
                             key=f"task_{idx}",
                             on_change=toggle_task,
@@ -172,7 +189,7 @@ def main():
                             st.rerun()
                     
                     with st.expander("Details", expanded=False):
-                        st.write(f"**Description:** {task.description}")
+                        st.write(f"**Description:** {task.notes}")
                         st.write(f"**Due Date:** {task.due_date.strftime('%Y-%m-%d')}")
                         days_left = (task.due_date - date.today()).days
                         if days_left == 0:
@@ -199,24 +216,6 @@ def main():
         # Add the cycle diagram
         st.plotly_chart(create_pomodoro_cycle_diagram(), use_container_width=True)
 
-    # Timer logic
-    if st.session_state.timer.is_running:
-        current_time = time.time()
-        elapsed = current_time - st.session_state.last_update
-        
-        if elapsed >= 1:
-            st.session_state.timer.current_time += int(elapsed)
-            st.session_state.last_update = current_time
-
-            if st.session_state.timer.current_time >= st.session_state.timer.work_duration:
-                st.session_state.timer.reset()
-                st.session_state.notification.send_notification(
-                    'Pomodoro Complete', 
-                    'Time for a break!'
-                )
-                st.balloons()
-                st.session_state.needs_rerun = False
-
     # Session statistics
     with st.sidebar:
         st.header("Session Info")
@@ -233,9 +232,9 @@ def main():
         )
         st.session_state.timer.work_duration = work_duration * 60
 
-    # Control rerun behavior
-    if st.session_state.timer.is_running and st.session_state.needs_rerun:
-        time.sleep(0.1)
+    # Redraw when the displayed second changes; the timer itself never needs a tick
+    if st.session_state.timer.is_running:
+        time.sleep(st.session_state.timer.remaining() % 1 or 1)
         st.rerun()
 
 if __name__ == "__main__":
@@ -1,9 +1,94 @@
-from dataclasses import dataclass
-from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from datetime import date, datetime
+
+
+class TaskStatus(str, Enum):
+    """Task statuses; members are singletons shared by every task"""
+    OPEN = "Open"
+    IN_PROGRESS = "In Progress"
+    DONE = "Done"
+    BLOCKED = "Blocked"
+
+
+# Tasks cluster on a few hundred due dates, so equal dates share one object
+_parse_date = lru_cache(maxsize=4096)(date.fromisoformat)
+
+
+def to_date(value):
+    """date for a date, an ISO string or None"""
+    if value is None or isinstance(value, date):
+        return value
+    return _parse_date(value)
+
+
+def to_datetime(value):
+    """datetime for a datetime, an ISO string or None"""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
 
-@dataclass
 class Task:
-    name: str
-    description: str
-    due_date: datetime
-    completed: bool = False 
\ No newline at end of file
+    """
+    A task shared by both UIs and the stats layer.
+
+    Slotted (no per-instance ``__dict__``) with dates parsed once on the way
+    in, so rendering never re-parses them. ``to_dict``/``from_dict`` convert
+    to and from the JSON form stored in the daily stats files. UI state such
+    as "being edited" lives in the session, not on the task.
+    """
+
+    __slots__ = ("id", "description", "notes", "status", "due_date", "created_at", "completed_at")
+
+    def __init__(self, description, due_date=None, status=TaskStatus.OPEN, notes="",
+                 created_at=None, completed_at=None, id=None):
+        self.id = id
+        self.description = description
+        self.notes = notes
+        self.status = TaskStatus(status)
+        self.due_date = to_date(due_date)
+        self.created_at = to_datetime(created_at)
+        self.completed_at = to_datetime(completed_at)
+
+    @property
+    def completed(self):
+        return self.status == TaskStatus.DONE
+
+    def __repr__(self):
+        return f"Task(id={self.id!r}, description={self.description!r}, status={self.status.value!r}, due_date={self.due_date!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Task):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def to_dict(self):
+        """JSON-ready dict; unset fields are left out"""
+        data = {"description": self.description, "status": self.status.value}
+        if self.id is not None:
+            data["id"] = self.id
+        if self.notes:
+            data["notes"] = self.notes
+        if self.due_date is not None:
+            data["due_date"] = self.due_date.isoformat()
+        if self.created_at is not None:
+            data["created_at"] = self.created_at.isoformat()
+        if self.completed_at is not None:
+            data["completed_at"] = self.completed_at.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Task from a ``to_dict`` dict or a legacy stats record"""
+        return cls(
+            data.get("description", ""),
+            due_date=data.get("due_date"),
+            status=data.get("status", TaskStatus.OPEN),
+            notes=data.get("notes", ""),
+            created_at=data.get("created_at"),
+            completed_at=data.get("completed_at"),
+            id=data.get("id"),
+        )
@@ -0,0 +1,161 @@
+import heapq
+from itertools import islice
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from src.models.task import TaskStatus, to_date
+
+DEFAULT_STATUSES = tuple(TaskStatus)
+
+# Sorts after any task id, so (end, _MAX_ID) bounds a whole day
+_MAX_ID = float("inf")
+
+
+def page_bounds(total, page, page_size):
+    """
+    Clamp a 1-based ``page`` to ``total`` items and return
+    ``(page, page_count, offset)``; an empty list still has one page.
+    """
+    page_count = max(1, -(-total // page_size))
+    page = min(max(page, 1), page_count)
+    return page, page_count, (page - 1) * page_size
+
+
+def _key(task):
+    """Index key of a task; tasks without a due date sort last"""
+    return (task.due_date or date.max, task.id)
+
+
+class TaskStore:
+    """
+    Pending tasks keyed by a stable id, indexed by status and due date.
+
+    Each status keeps a list of ``(due_date, id)`` keys sorted with ``bisect``,
+    and one more list holds every task in due order. A query bisects the
+    requested statuses' lists (or the global one when every status is
+    requested) to its date range and merges the slices, which are already in
+    due order; counts come straight from the bisect positions.
+
+    Tasks are ``Task`` instances; ``add`` sets their ``id``. Change indexed
+    fields through ``update`` so the indexes follow.
+    """
+
+    def __init__(self, statuses=DEFAULT_STATUSES):
+        self._tasks = {}
+        self._by_status = {status: [] for status in statuses}
+        self._by_due = []
+        self._next_id = 1
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __iter__(self):
+        """Tasks in insertion order"""
+        return iter(list(self._tasks.values()))
+
+    def __contains__(self, task_id):
+        return task_id in self._tasks
+
+    def get(self, task_id):
+        """Task with ``task_id``, or None"""
+        return self._tasks.get(task_id)
+
+    @property
+    def next_id(self):
+        """Id the next new task will get"""
+        return self._next_id
+
+    def reserve_ids(self, next_id):
+        """Never hand out ids below ``next_id`` (e.g. ids of deleted tasks)"""
+        self._next_id = max(self._next_id, next_id)
+
+    def add(self, task):
+        """Store ``task`` and return its id, assigning a new one if it has none"""
+        if task.id is None:
+            task.id = self._next_id
+        elif task.id in self._tasks:
+            raise KeyError(f"duplicate task id {task.id}")
+        self._next_id = max(self._next_id, task.id + 1)
+        self._tasks[task.id] = task
+        self._index(task)
+        return task.id
+
+    def remove(self, task_id):
+        """Remove and return the task with ``task_id``"""
+        task = self._tasks.pop(task_id)
+        self._unindex(task)
+        return task
+
+    def update(self, task_id, **fields):
+        """Change fields of a task, re-indexing it when status or due date change"""
+        task = self._tasks[task_id]
+        reindex = "status" in fields or "due_date" in fields
+        if reindex:
+            self._unindex(task)
+        if "status" in fields:
+            fields["status"] = TaskStatus(fields["status"])
+        if "due_date" in fields:
+            fields["due_date"] = to_date(fields["due_date"])
+        for name, value in fields.items():
+            setattr(task, name, value)
+        if reindex:
+            self._index(task)
+        return task
+
+    def query(self, statuses=None, start=None, end=None, offset=0, limit=None):
+        """
+        Tasks with one of ``statuses`` due between ``start`` and ``end``.
+
+        Bounds are inclusive dates (or ISO strings) and either may be None.
+        Statuses may be ``TaskStatus`` members or their string values.
+        Results come in due-date order, ties in insertion order. ``offset``
+        and ``limit`` select a window of the results; only the keys that can
+        fall inside it are read, so a page costs the same however many tasks
+        match.
+        """
+        ranges = list(self._ranges(statuses, start, end))
+        if limit is not None:
+            # No index contributes more than offset + limit keys to the window
+            ranges = [(keys, lo, min(hi, lo + offset + limit)) for keys, lo, hi in ranges]
+        if len(ranges) == 1:
+            keys, lo, hi = ranges[0]
+            merged = keys[lo + offset:hi]
+        else:
+            stop = None if limit is None else offset + limit
+            merged = islice(heapq.merge(*[keys[lo:hi] for keys, lo, hi in ranges]), offset, stop)
+        for _, task_id in merged:
+            yield self._tasks[task_id]
+
+    def count(self, statuses=None, start=None, end=None):
+        """Number of tasks ``query`` would return, without building them"""
+        return sum(hi - lo for _, lo, hi in self._ranges(statuses, start, end))
+
+    def status_counts(self):
+        """Number of tasks per status"""
+        return {status: len(keys) for status, keys in self._by_status.items()}
+
+    def _ranges(self, statuses, start, end):
+        """(keys, lo, hi) slice bounds of each status index for a date range"""
+        if statuses is None or all(status in statuses for status, keys in self._by_status.items() if keys):
+            indexes = [self._by_due]
+        else:
+            indexes = [self._by_status.get(status) for status in statuses]
+        start, end = to_date(start), to_date(end)
+        for keys in indexes:
+            if not keys:
+                continue
+            lo = 0 if start is None else bisect_left(keys, (start, 0))
+            hi = len(keys) if end is None else bisect_right(keys, (end, _MAX_ID))
+            if hi > lo:
+                yield keys, lo, hi
+
+    def _index(self, task):
+        """Add a task to its status and due-date indexes"""
+        key = _key(task)
+        insort(self._by_status.setdefault(task.status, []), key)
+        insort(self._by_due, key)
+
+    def _unindex(self, task):
+        """Remove a task from its status and due-date indexes"""
+        key = _key(task)
+        for keys in (self._by_status[task.status], self._by_due):
+            del keys[bisect_left(keys, key)]
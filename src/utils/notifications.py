@@ -1,8 +1,261 @@
-class NotificationManager:
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+
+class Notification(namedtuple("Notification", "title message count created_at")):
+    """A notification as handed to sinks; ``count`` > 1 when a burst was coalesced"""
+
+    __slots__ = ()
+
+    @property
+    def summary(self):
+        """Title with the number of coalesced notifications, if any"""
+        if self.count > 1:
+            return f"{self.title} (+{self.count - 1} more)"
+        return self.title
+
+
+class NotificationSink(ABC):
+    """
+    Somewhere notifications are delivered to.
+
+    ``send`` runs on a worker thread; sinks that can block must give up after
+    ``timeout`` seconds. Errors are logged and counted by the manager, never
+    raised to the caller of ``send_notification``.
+    """
+
+    name = "sink"
+
+    def __init__(self, timeout=2.0):
+        self.timeout = timeout
+
+    @abstractmethod
+    def send(self, notification):
+        """Deliver one ``Notification``"""
+
+
+class DesktopSink(NotificationSink):
+    """Desktop popups through ``notify-send`` (libnotify)"""
+
+    name = "desktop"
+
+    def __init__(self, command="notify-send", timeout=2.0):
+        super().__init__(timeout)
+        self.command = command
+
+    @classmethod
+    def available(cls, command="notify-send"):
+        return shutil.which(command) is not None
+
+    def send(self, notification):
+        import subprocess
+
+        subprocess.run(
+            [self.command, notification.summary, notification.message],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=self.timeout,
+            check=True
+        )
+
+
+class WebhookSink(NotificationSink):
+    """POSTs each notification as JSON to a (local) URL"""
+
+    name = "webhook"
+
+    def __init__(self, url, timeout=2.0):
+        super().__init__(timeout)
+        self.url = url
+
+    def send(self, notification):
+        # Imported on first delivery: urllib.request pulls in http.client and
+        # email, which would otherwise load with every importer of ``src``
+        import urllib.request
+
+        body = json.dumps(notification._asdict()).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class LogFileSink(NotificationSink):
+    """Appends each notification to a JSONL file (a local write, so no timeout)"""
+
+    name = "log"
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def send(self, notification):
+        record = dict(notification._asdict(), sent_at=time.time())
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+class _SinkState:
+    """Delivery state of one sink: at most one send in flight and one waiting"""
+
+    __slots__ = ("busy", "pending")
+
     def __init__(self):
+        self.busy = False
+        self.pending = None
+
+
+class NotificationManager:
+    """
+    Delivers notifications to pluggable sinks without blocking the caller.
+
+    ``send_notification`` only records the notification and returns; sinks
+    are called on a bounded thread pool. Each sink has at most one send in
+    flight and one notification waiting behind it. Anything sent while a
+    notification is already waiting is merged into it (latest message, summed
+    ``count``), so a burst of completions becomes one notification and a slow
+    or hung sink holds at most one worker and a constant amount of memory.
+    Identical notifications within ``dedup_window`` seconds are dropped.
+
+    With no sinks, ``send_notification`` does nothing.
+    """
+
+    def __init__(self, sinks=None, max_workers=None, dedup_window=2.0, clock=time.monotonic):
         self.enabled = True
+        self.sinks = list(sinks or ())
+        self.max_workers = max_workers or max(1, len(self.sinks))
+        self.dedup_window = dedup_window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._states = {id(sink): _SinkState() for sink in self.sinks}
+        self._last_seen = {}     # (title, message) -> time last accepted
+        self._executor = None
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.deduplicated = 0
 
     def send_notification(self, title, message):
-        if self.enabled:
-            # Implement notification logic here
-            pass 
\ No newline at end of file
+        """Queue a notification for every sink; returns whether it was accepted"""
+        if not self.enabled or not self.sinks:
+            return False
+        now = self._clock()
+        with self._lock:
+            key = (title, message)
+            last = self._last_seen.get(key)
+            if last is not None and now - last < self.dedup_window:
+                self.deduplicated += 1
+                return False
+            self._last_seen[key] = now
+            if len(self._last_seen) > 256:
+                self._last_seen = {k: t for k, t in self._last_seen.items() if now - t < self.dedup_window}
+
+            notification = Notification(title, message, 1, time.time())
+            for sink in self.sinks:
+                state = self._states[id(sink)]
+                if state.pending is not None:
+                    state.pending = state.pending._replace(
+                        title=title, message=message, count=state.pending.count + 1
+                    )
+                    self.coalesced += 1
+                elif state.busy:
+                    state.pending = notification
+                else:
+                    state.busy = True
+                    self._submit(sink, notification)
+        return True
+
+    def flush(self, timeout=None):
+        """Wait until every sink is idle; returns False on timeout"""
+        with self._idle:
+            return self._idle.wait_for(
+                lambda: not any(state.busy for state in self._states.values()), timeout
+            )
+
+    def close(self, wait=True):
+        """Stop accepting notifications and shut the worker pool down"""
+        self.enabled = False
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def stats(self):
+        """Delivery counters"""
+        with self._lock:
+            return {
+                "sent": self.sent,
+                "failed": self.failed,
+                "coalesced": self.coalesced,
+                "deduplicated": self.deduplicated,
+                "pending": sum(state.pending is not None for state in self._states.values()),
+            }
+
+    def _submit(self, sink, notification):
+        """Hand a send to the pool; caller holds the lock"""
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="pomodoro-notify")
+        self._executor.submit(self._deliver, sink, notification)
+
+    def _deliver(self, sink, notification):
+        """Worker: send, then pick up whatever was coalesced meanwhile"""
+        while notification is not None:
+            try:
+                sink.send(notification)
+            except Exception:
+                logger.exception("Notification sink %s failed", sink.name)
+                ok = False
+            else:
+                ok = True
+            with self._lock:
+                if ok:
+                    self.sent += 1
+                else:
+                    self.failed += 1
+                state = self._states[id(sink)]
+                notification, state.pending = state.pending, None
+                if notification is None:
+                    state.busy = False
+                    self._idle.notify_all()
+
+
+def sinks_from_env(environ=None):
+    """
+    Sinks configured through the environment:
+
+    * ``POMODORO_NOTIFY_DESKTOP=1``: ``notify-send`` popups, if installed;
+    * ``POMODORO_NOTIFY_WEBHOOK=<url>``: JSON POSTs to ``url``;
+    * ``POMODORO_NOTIFY_LOG=<path>``: JSON lines appended to ``path``.
+    """
+    environ = os.environ if environ is None else environ
+    sinks = []
+    if environ.get("POMODORO_NOTIFY_DESKTOP", "0") == "1" and DesktopSink.available():
+        sinks.append(DesktopSink())
+    if environ.get("POMODORO_NOTIFY_WEBHOOK"):
+        sinks.append(WebhookSink(environ["POMODORO_NOTIFY_WEBHOOK"]))
+    if environ.get("POMODORO_NOTIFY_LOG"):
+        sinks.append(LogFileSink(environ["POMODORO_NOTIFY_LOG"]))
+    return sinks
+
+
+_shared_notifier = None
+_shared_notifier_lock = threading.Lock()
+
+
+def get_shared_notifier():
+    """Process-wide notification manager with the sinks from the environment"""
+    global _shared_notifier
+    with _shared_notifier_lock:
+        if _shared_notifier is None:
+            _shared_notifier = NotificationManager(sinks_from_env())
+        return _shared_notifier
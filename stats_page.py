@@ -1,10 +1,122 @@
+import functools
 import streamlit as st
 import pandas as pd
 import altair as alt
 from datetime import datetime, date, timedelta
-from data_manager import PomodoroDataManager
+from data_manager import get_shared_data_manager
+from utils import rerun
 
-def show_stats_page():
+STATUS_EMOJIS = {
+    "Open": "🔵", 
+    "In Progress": "🟠", 
+    "Done": "🟢", 
+    "Blocked": "🔴"
+}
+
+def _task_line(number, task):
+    """Markdown line for one entry of the day's completed tasks"""
+    if not isinstance(task, dict):
+        # Handle legacy format tasks that are just strings
+        return f"**{number}.** {task} - *completed today*"
+    description = task.get("description", task.get("text", "Unknown Task"))
+    completed_time = datetime.fromisoformat(task["completed_at"]).strftime("%H:%M:%S")
+    emoji = STATUS_EMOJIS.get(task.get("status", "Done"), "⚪️")
+    return f"**{number}.** {description} {emoji} - *completed at {completed_time}*"
+
+def compute_stats(daily_stats, weekly_summary, today):
+    """
+    Everything the stats page shows, derived from a day's stats and the
+    weekly summary ending ``today``. Pure: no Streamlit, no I/O.
+    """
+    last_completed = daily_stats.get("last_completed")
+    completed_tasks = daily_stats.get("completed_tasks", [])
+
+    # Last 7 days, oldest first, with days without pomodoros filled in
+    days = pd.date_range(end=pd.Timestamp(today), periods=7, freq="D")
+    counts = pd.Series(weekly_summary["daily_counts"], dtype="int64")
+    counts.index = pd.to_datetime(counts.index)
+    week = counts.reindex(days, fill_value=0)
+    weekly = pd.DataFrame({"Day": days.strftime("%a"), "Pomodoros": week.to_numpy()})
+
+    by_status = pd.Series(weekly_summary["task_counts"]["by_status"], dtype="int64")
+    status = by_status[by_status > 0].rename_axis("Status").reset_index(name="Count")
+
+    best_day = None
+    if week.any():
+        # Ties go to the most recent day, as they always have
+        best = week[::-1].idxmax()
+        best_day = (best.strftime("%A"), int(week[best]))
+
+    total = weekly_summary["total_pomodoros"]
+    return {
+        "today": {
+            "pomodoros": daily_stats["pomodoros_completed"],
+            "tasks": len(completed_tasks),
+            "last_completed": datetime.fromisoformat(last_completed).strftime("%H:%M:%S") if last_completed else "None",
+        },
+        "weekly": weekly,
+        "total_pomodoros": total,
+        "days_active": weekly_summary["days_active"],
+        "daily_average": total / max(1, weekly_summary["days_active"]),
+        "best_day": best_day,
+        "status": status,
+        "status_counts": by_status.to_dict(),
+        "total_tasks": weekly_summary["task_counts"]["total"],
+        "recent_tasks": "\n\n".join(_task_line(i, task) for i, task in enumerate(completed_tasks, 1)),
+    }
+
+def build_charts(stats):
+    """Altair charts for the output of ``compute_stats``"""
+    weekly_chart = alt.Chart(stats["weekly"]).mark_bar().encode(
+        x=alt.X("Day", sort=None),  # Don't sort to keep chronological order
+        y="Pomodoros",
+        color=alt.condition(
+            alt.datum.Pomodoros > 0,
+            alt.value("#FF6347"),  # Tomato color for days with pomodoros
+            alt.value("#DDDDDD")   # Gray for days without pomodoros
+        ),
+        tooltip=["Day", "Pomodoros"]
+    ).properties(
+        title="Pomodoros Completed This Week"
+    )
+
+    status_chart = alt.Chart(stats["status"]).mark_arc().encode(
+        theta=alt.Theta(field="Count", type="quantitative"),
+        color=alt.Color(
+            field="Status", 
+            type="nominal",
+            scale=alt.Scale(
+                domain=["Open", "In Progress", "Done", "Blocked"],
+                range=["#2196F3", "#FF9800", "#4CAF50", "#F44336"]
+            )
+        ),
+        tooltip=["Status", "Count"]
+    ).properties(
+        title="Task Status Distribution",
+        width=300,
+        height=300
+    )
+    return {"weekly": weekly_chart, "status": status_chart}
+
+@functools.lru_cache(maxsize=8)
+def _page_data(data_manager, today, version):
+    """Stats and charts for one data version; ``version`` is only the cache key"""
+    # The token sees other processes' writes right away, the rollup only on
+    # its next periodic sync; catch it up so both halves match the token
+    data_manager.refresh_rollup_index()
+    stats = compute_stats(data_manager.load_daily_stats(), data_manager.get_weekly_summary(), today)
+    return stats, build_charts(stats)
+
+def load_page_data(data_manager, today=None):
+    """
+    ``(stats, charts)`` for the stats page, recomputed only when the data
+    manager's ``data_version`` for the past week changes.
+    """
+    today = today or date.today()
+    version = data_manager.data_version(today - timedelta(days=6), today)
+    return _page_data(data_manager, today, version)
+
+def show_stats_page(data_manager=None):
     """Show the statistics page"""
     
     st.markdown('<div class="main-title">Pomodoro Statistics</div>', unsafe_allow_html=True)
@@ -13,13 +125,12 @@ def show_stats_page():
     current_date = date.today().strftime("%A, %B %d, %Y")
     st.markdown(f'<div class="date-display">📅 {current_date}</div>', unsafe_allow_html=True)
     
-    # Initialize data manager
-    data_manager = PomodoroDataManager()
+    # Reuse the caller's (or the process-wide) data manager and its stats cache
+    if data_manager is None:
+        data_manager = get_shared_data_manager()
     
-    # Load daily stats
-    daily_stats = data_manager.load_daily_stats()
-    weekly_summary = data_manager.get_weekly_summary()
-    task_stats = data_manager.get_tasks_stats()
+    # Nothing is loaded or recomputed while no stats have been written
+    stats, charts = load_page_data(data_manager)
     
     # Daily stats section
     st.markdown("## Today's Progress")
@@ -28,58 +139,19 @@ def show_stats_page():
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Pomodoros Completed", daily_stats["pomodoros_completed"])
+        st.metric("Pomodoros Completed", stats["today"]["pomodoros"])
     
     with col2:
-        completed_tasks = daily_stats.get("completed_tasks", [])
-        st.metric("Tasks Completed", len(completed_tasks))
+        st.metric("Tasks Completed", stats["today"]["tasks"])
     
     with col3:
-        last_completed = daily_stats.get("last_completed")
-        if last_completed:
-            last_time = datetime.fromisoformat(last_completed).strftime("%H:%M:%S")
-            st.metric("Last Pomodoro", last_time)
-        else:
-            st.metric("Last Pomodoro", "None")
+        st.metric("Last Pomodoro", stats["today"]["last_completed"])
     
     # Weekly stats section
     st.markdown("## Weekly Overview")
     
-    if weekly_summary["total_pomodoros"] > 0:
-        # Create a DataFrame for the chart
-        dates = []
-        counts = []
-        
-        # Get the last 7 days
-        today = date.today()
-        for i in range(6, -1, -1):  # 6 days ago to today
-            day = today - timedelta(days=i)
-            day_iso = day.isoformat()
-            count = weekly_summary["daily_counts"].get(day_iso, 0)
-            dates.append(day.strftime("%a"))  # Abbreviated day name
-            counts.append(count)
-        
-        # Create DataFrame
-        data = pd.DataFrame({
-            "Day": dates,
-            "Pomodoros": counts
-        })
-        
-        # Create chart
-        chart = alt.Chart(data).mark_bar().encode(
-            x=alt.X("Day", sort=None),  # Don't sort to keep chronological order
-            y="Pomodoros",
-            color=alt.condition(
-                alt.datum.Pomodoros > 0,
-                alt.value("#FF6347"),  # Tomato color for days with pomodoros
-                alt.value("#DDDDDD")   # Gray for days without pomodoros
-            ),
-            tooltip=["Day", "Pomodoros"]
-        ).properties(
-            title="Pomodoros Completed This Week"
-        )
-        
-        st.altair_chart(chart, use_container_width=True)
+    if stats["total_pomodoros"] > 0:
+        st.altair_chart(charts["weekly"], use_container_width=True)
         
         # Summary statistics
         st.markdown("### Weekly Summary")
@@ -87,107 +159,53 @@ def show_stats_page():
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Total Pomodoros", weekly_summary["total_pomodoros"])
+            st.metric("Total Pomodoros", stats["total_pomodoros"])
         
         with col2:
-            st.metric("Days Active", weekly_summary["days_active"])
+            st.metric("Days Active", stats["days_active"])
         
         with col3:
-            daily_avg = weekly_summary["total_pomodoros"] / max(1, weekly_summary["days_active"])
-            st.metric("Daily Average", f"{daily_avg:.1f}")
+            st.metric("Daily Average", f"{stats['daily_average']:.1f}")
         
         # Most productive day
-        if weekly_summary["daily_counts"]:
-            most_productive_day = max(weekly_summary["daily_counts"].items(), key=lambda x: x[1])
-            day_name = datetime.fromisoformat(most_productive_day[0]).strftime("%A")
-            st.success(f"🏆 Your most productive day was **{day_name}** with **{most_productive_day[1]}** pomodoros!")
+        if stats["best_day"]:
+            day_name, count = stats["best_day"]
+            st.success(f"🏆 Your most productive day was **{day_name}** with **{count}** pomodoros!")
     else:
         st.info("No pomodoros completed this week yet. Complete your first one to start tracking!")
     
     # Task statistics section
     st.markdown("## Task Statistics")
     
-    # Create a task status distribution chart if we have task data
-    if weekly_summary["task_counts"]["total"] > 0:
-        # Create data for the chart
-        status_data = []
-        for status, count in weekly_summary["task_counts"]["by_status"].items():
-            if count > 0:
-                status_data.append({"Status": status, "Count": count})
-        
-        # If we have status data, create a chart
-        if status_data:
-            status_df = pd.DataFrame(status_data)
-            
-            # Create pie chart for task status distribution
-            status_chart = alt.Chart(status_df).mark_arc().encode(
-                theta=alt.Theta(field="Count", type="quantitative"),
-                color=alt.Color(
-                    field="Status", 
-                    type="nominal",
-                    scale=alt.Scale(
-                        domain=["Open", "In Progress", "Done", "Blocked"],
-                        range=["#2196F3", "#FF9800", "#4CAF50", "#F44336"]
-                    )
-                ),
-                tooltip=["Status", "Count"]
-            ).properties(
-                title="Task Status Distribution",
-                width=300,
-                height=300
-            )
-            
-            st.altair_chart(status_chart, use_container_width=True)
+    if stats["total_tasks"] > 0:
+        # If we have status data, show the distribution chart
+        if not stats["status"].empty:
+            st.altair_chart(charts["status"], use_container_width=True)
             
             # Show task status count metrics
             st.markdown("### Task Status Breakdown")
             status_cols = st.columns(4)
             
-            status_colors = {
-                "Open": "🔵", 
-                "In Progress": "🟠", 
-                "Done": "🟢", 
-                "Blocked": "🔴"
-            }
-            
-            for i, (status, count) in enumerate(weekly_summary["task_counts"]["by_status"].items()):
+            for i, (status, count) in enumerate(stats["status_counts"].items()):
                 with status_cols[i % 4]:
-                    emoji = status_colors.get(status, "⚪️")
+                    emoji = STATUS_EMOJIS.get(status, "⚪️")
                     st.metric(f"{emoji} {status}", count)
         
         # Add a total tasks metric 
-        st.metric("Total Tasks", weekly_summary["task_counts"]["total"])
+        st.metric("Total Tasks", stats["total_tasks"])
     else:
         st.info("No tasks completed this week yet. Complete some tasks to see statistics!")
     
     # Task completion section
     st.markdown("## Recent Task Completions")
     
-    completed_tasks = daily_stats.get("completed_tasks", [])
-    if completed_tasks:
-        for i, task in enumerate(completed_tasks):
-            if isinstance(task, dict):
-                description = task.get("description", task.get("text", "Unknown Task"))
-                completed_time = datetime.fromisoformat(task["completed_at"]).strftime("%H:%M:%S")
-                status = task.get("status", "Done")
-                
-                # Get status emoji
-                status_colors = {
-                    "Open": "🔵", 
-                    "In Progress": "🟠", 
-                    "Done": "🟢", 
-                    "Blocked": "🔴"
-                }
-                emoji = status_colors.get(status, "⚪️")
-                
-                st.markdown(f"**{i+1}.** {description} {emoji} - *completed at {completed_time}*")
-            else:
-                # Handle legacy format tasks that are just strings
-                st.markdown(f"**{i+1}.** {task} - *completed today*")
+    if stats["recent_tasks"]:
+        # One element for the whole list instead of one per task
+        st.markdown(stats["recent_tasks"])
     else:
         st.info("No tasks completed today yet. Complete a task to see it here!")
     
     # Navigation back to main app
     if st.button("⬅️ Back to Timer"):
         st.session_state.show_stats = False
-        st.experimental_rerun() 
\ No newline at end of file
+        rerun()
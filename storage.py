@@ -0,0 +1,489 @@
+import os
+import json
+import glob
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+from event_log import EventLogStore, apply_event, copy_stats, default_daily_stats
+from file_locking import FileLock, atomic_write_text
+from rollup_index import DEFAULT_STATUSES, RollupIndex, summarize_day
+
+
+class StatsStorage(ABC):
+    """
+    Interface between PomodoroDataManager and where daily stats live.
+
+    Stats are read per day as the same dict shape the app has always used
+    (``date``, ``pomodoros_completed``, ``last_completed`` and optionally
+    ``completed_tasks``) and written as completion events (see event_log).
+    """
+
+    name = None
+
+    @abstractmethod
+    def load_day(self, day):
+        """Return the stats dict for a ``date``"""
+
+    @abstractmethod
+    def append_events(self, day, events):
+        """Persist completion events for a ``date`` and return the day's updated stats"""
+
+    def append_event(self, day, event):
+        """Persist a single completion event"""
+        return self.append_events(day, [event])
+
+    @abstractmethod
+    def summarize(self, start, end, include_daily=False):
+        """Pomodoro and task totals for the inclusive range ``[start, end]``"""
+
+    @abstractmethod
+    def stored_days(self):
+        """ISO days that have stored stats, in no particular order"""
+
+    def data_version(self, start, end):
+        """
+        Token that changes whenever stats for a day in ``[start, end]`` change,
+        including writes by other processes. Callers cache derived data on it.
+        Backends that cannot tell cheaply return a new token every time.
+        """
+        return object()
+
+    def refresh(self):
+        """Pick up changes made by other processes (no-op where reads are always fresh)"""
+
+    def sync(self):
+        """Force buffered writes to durable storage"""
+
+    def recover_day(self, day):
+        """Rebuild a day after a crash; by default just reload it"""
+        return self.load_day(day)
+
+    def close(self):
+        """Release handles and persist any in-memory state"""
+
+
+class FileStatsStorage(StatsStorage):
+    """
+    Shared logic for the file-per-day backends.
+
+    Range queries are answered from a RollupIndex persisted next to the data.
+    The index is updated on every write made through this storage and
+    re-synced against file signatures every ``rollup_refresh_interval`` seconds
+    so that files written by other processes are picked up.
+    """
+
+    day_file_patterns = ()
+
+    def __init__(self, data_dir, rollup_refresh_interval=5.0):
+        self.data_dir = data_dir
+        self.rollup_refresh_interval = rollup_refresh_interval
+        self.rollup = None
+        self._rollup_synced_at = 0.0
+        self._lock = threading.RLock()
+
+    def day_files(self, day_iso):
+        """Files that hold the stats of a day"""
+        return [os.path.join(self.data_dir, f"{prefix}{day_iso}{suffix}")
+                for prefix, suffix in self.day_file_patterns]
+
+    def day_signature(self, day):
+        """Cheap change marker for a day's files (mtime and size, no parsing)"""
+        parts = []
+        for path in self.day_files(day.isoformat()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            parts.append(f"{os.path.basename(path)}:{st.st_mtime_ns}:{st.st_size}")
+        return "|".join(parts) or None
+
+    def stored_days(self):
+        days = set()
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                for prefix, suffix in self.day_file_patterns:
+                    day_iso = entry.name[len(prefix):-len(suffix)]
+                    if entry.name.startswith(prefix) and entry.name.endswith(suffix) and len(day_iso) == 10:
+                        days.add(day_iso)
+        return days
+
+    def day_signatures(self):
+        """Signatures of every day that has stored stats"""
+        signatures = {}
+        for day_iso in self.stored_days():
+            try:
+                signatures[day_iso] = self.day_signature(date.fromisoformat(day_iso))
+            except ValueError:
+                continue
+        return signatures
+
+    def data_version(self, start, end):
+        # One stat() per file of each day; nothing is parsed
+        return tuple(self.day_signature(start + timedelta(days=offset))
+                     for offset in range((end - start).days + 1))
+
+    def append_events(self, day, events):
+        with self._lock:
+            stats, signature = self._write_events(day, events)
+            if self.rollup is not None:
+                self.rollup.set_day(day.isoformat(), summarize_day(stats), signature)
+        return stats
+
+    @abstractmethod
+    def _write_events(self, day, events):
+        """
+        Backend specific write; returns the day's updated stats and its
+        ``day_signature``. The signature must not be newer than the stats
+        (take it under the write lock, or before reading the stats back):
+        otherwise a write by another process in between would be recorded as
+        already summarized and never re-read.
+        """
+
+    def get_rollup_index(self):
+        """Return the rollup index, loading it and re-reading only changed days"""
+        with self._lock:
+            if self.rollup is None:
+                self.rollup = RollupIndex.load(os.path.join(self.data_dir, "rollup_index.json"))
+                self.refresh()
+            elif time.monotonic() - self._rollup_synced_at >= self.rollup_refresh_interval:
+                # Pick up days written by other processes every so often
+                self.refresh()
+            return self.rollup
+
+    def refresh(self):
+        with self._lock:
+            if self.rollup is None:
+                return self.get_rollup_index()
+            self.rollup.sync(self.day_signatures(), self.load_day)
+            self._rollup_synced_at = time.monotonic()
+            if self.rollup.dirty:
+                self.rollup.save()
+            return self.rollup
+
+    def summarize(self, start, end, include_daily=False):
+        rollup = self.get_rollup_index()
+        with self._lock:
+            return rollup.summarize(start, end, include_daily=include_daily)
+
+    def close(self):
+        with self._lock:
+            if self.rollup is not None and self.rollup.dirty:
+                self.rollup.save()
+
+
+class JsonFileStorage(FileStatsStorage):
+    """
+    One ``stats_<date>.json`` file per day, rewritten on every completion.
+
+    Each write holds an advisory lock on the day's file for the whole
+    read-modify-write and replaces the file atomically, so concurrent writers
+    in other sessions or processes never lose an increment and readers never
+    see a half-written file.
+    """
+
+    name = "json"
+    day_file_patterns = (("stats_", ".json"),)
+
+    def __init__(self, data_dir, cache=None, rollup_refresh_interval=5.0, fsync=True, retry_policy=None):
+        super().__init__(data_dir, rollup_refresh_interval=rollup_refresh_interval)
+        self.cache = cache
+        self.fsync = fsync
+        self.retry_policy = retry_policy
+
+    def stats_path(self, day):
+        """Get the filepath for storing stats for a day"""
+        return os.path.join(self.data_dir, f"stats_{day.isoformat()}.json")
+
+    def load_day(self, day):
+        filepath = self.stats_path(day)
+        try:
+            if self.cache is not None:
+                stats = self.cache.get(filepath, self._read_stats_file)
+            elif os.path.exists(filepath):
+                stats = self._read_stats_file(filepath)
+            else:
+                stats = None
+        except (json.JSONDecodeError, FileNotFoundError):
+            # If file is corrupted or not found, return default stats
+            stats = None
+        if stats is not None:
+            return stats
+        return default_daily_stats(day.isoformat())
+
+    @staticmethod
+    def _read_stats_file(filepath):
+        """Parse a daily stats JSON file"""
+        with open(filepath, 'r') as f:
+            return json.load(f)
+
+    def _write_events(self, day, events):
+        filepath = self.stats_path(day)
+        with FileLock(filepath, self.retry_policy):
+            # Re-read from disk under the lock, bypassing the cache: another
+            # writer may have replaced the file within the same mtime tick
+            try:
+                stats = self._read_stats_file(filepath)
+            except (json.JSONDecodeError, FileNotFoundError):
+                stats = default_daily_stats(day.isoformat())
+            for event in events:
+                apply_event(stats, event)
+            atomic_write_text(filepath, json.dumps(stats), fsync=self.fsync)
+            # Still under the lock, so both signatures describe exactly these stats
+            signature = self.day_signature(day)
+            if self.cache is not None:
+                self.cache.put(filepath, stats, self.cache.signature(filepath))
+        if self.cache is not None:
+            stats = copy_stats(stats)
+        return stats, signature
+
+
+class EventLogStorage(FileStatsStorage):
+    """Append-only ``events_<date>.jsonl`` logs (see EventLogStore)"""
+
+    name = "eventlog"
+    day_file_patterns = (("stats_", ".json"), ("events_", ".jsonl"))
+
+    def __init__(self, data_dir, fsync_batch_size=32, fsync_interval=1.0, rollup_refresh_interval=5.0):
+        super().__init__(data_dir, rollup_refresh_interval=rollup_refresh_interval)
+        self.event_log = EventLogStore(
+            data_dir,
+            fsync_batch_size=fsync_batch_size,
+            fsync_interval=fsync_interval
+        )
+
+    def load_day(self, day):
+        with self._lock:
+            return self.event_log.load(day.isoformat())
+
+    def _write_events(self, day, events):
+        for event in events:
+            self.event_log.append(day.isoformat(), event)
+        # Signature first: lines appended meanwhile by other processes make it
+        # older than the stats, so the rollup re-reads the day instead of missing them
+        signature = self.day_signature(day)
+        return self.event_log.load(day.isoformat()), signature
+
+    def sync(self):
+        with self._lock:
+            self.event_log.sync()
+
+    def recover_day(self, day):
+        with self._lock:
+            return self.event_log.recover(day.isoformat())
+
+    def close(self):
+        with self._lock:
+            self.event_log.close()
+        super().close()
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pomodoros (
+    id INTEGER PRIMARY KEY,
+    day TEXT NOT NULL,
+    completed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pomodoros_day ON pomodoros (day);
+CREATE TABLE IF NOT EXISTS completed_tasks (
+    id INTEGER PRIMARY KEY,
+    day TEXT NOT NULL,
+    status TEXT NOT NULL,
+    completed_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_completed_tasks_day_status ON completed_tasks (day, status);
+"""
+
+
+class SQLiteStorage(StatsStorage):
+    """
+    Stats in a single SQLite database in WAL mode.
+
+    Pomodoros and completed tasks are rows indexed by day (and status), so
+    range and status aggregates are single indexed queries and several
+    processes can write concurrently. Each thread gets its own connection.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, data_dir, db_path=None, busy_timeout=5.0):
+        self.data_dir = data_dir
+        self.db_path = db_path or os.path.join(data_dir, "pomodoro.sqlite3")
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SQLITE_SCHEMA)
+
+    def _connect(self):
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load_day(self, day):
+        conn = self._connect()
+        day_iso = day.isoformat()
+        stats = default_daily_stats(day_iso)
+        count, last_completed = conn.execute(
+            "SELECT COUNT(*), MAX(completed_at) FROM pomodoros WHERE day = ?", (day_iso,)
+        ).fetchone()
+        stats["pomodoros_completed"] = count
+        stats["last_completed"] = last_completed
+        tasks = [json.loads(data) for (data,) in conn.execute(
+            "SELECT data FROM completed_tasks WHERE day = ? ORDER BY id", (day_iso,)
+        )]
+        if tasks:
+            stats["completed_tasks"] = tasks
+        return stats
+
+    def append_events(self, day, events):
+        conn = self._connect()
+        with conn:
+            self._insert_events(conn, day.isoformat(), events)
+        return self.load_day(day)
+
+    @staticmethod
+    def _insert_events(conn, day_iso, events):
+        """Insert completion events inside the caller's transaction"""
+        for event in events:
+            if event["type"] == "pomodoro":
+                conn.execute(
+                    "INSERT INTO pomodoros (day, completed_at) VALUES (?, ?)",
+                    (day_iso, event.get("completed_at"))
+                )
+            elif event["type"] == "task":
+                task = event["task"]
+                if isinstance(task, dict):
+                    # For old format tasks without status, count as "Done"
+                    status = task.get("status", "Done")
+                    completed_at = task.get("completed_at")
+                else:
+                    status, completed_at = "Done", None
+                conn.execute(
+                    "INSERT INTO completed_tasks (day, status, completed_at, data) VALUES (?, ?, ?, ?)",
+                    (day_iso, status, completed_at, json.dumps(task))
+                )
+
+    def data_version(self, start, end):
+        # Rows are only ever inserted, so row count and highest id per table
+        # change with every write; both come from the day indexes
+        conn = self._connect()
+        bounds = (start.isoformat(), end.isoformat())
+        return tuple(
+            conn.execute(f"SELECT COUNT(*), MAX(id) FROM {table} WHERE day BETWEEN ? AND ?", bounds).fetchone()
+            for table in ("pomodoros", "completed_tasks")
+        )
+
+    def summarize(self, start, end, include_daily=False):
+        conn = self._connect()
+        bounds = (start.isoformat(), end.isoformat())
+        summary = {
+            "start": bounds[0],
+            "end": bounds[1],
+            "total_pomodoros": 0,
+            "days_active": 0,
+            "daily_counts": {},
+            "task_counts": {
+                "total": 0,
+                "by_status": {status: 0 for status in DEFAULT_STATUSES}
+            }
+        }
+
+        for day_iso, count in conn.execute(
+            "SELECT day, COUNT(*) FROM pomodoros WHERE day BETWEEN ? AND ? GROUP BY day", bounds
+        ):
+            summary["total_pomodoros"] += count
+            summary["days_active"] += 1
+            if include_daily:
+                summary["daily_counts"][day_iso] = count
+
+        for status, count in conn.execute(
+            "SELECT status, COUNT(*) FROM completed_tasks WHERE day BETWEEN ? AND ? GROUP BY status", bounds
+        ):
+            summary["task_counts"]["total"] += count
+            summary["task_counts"]["by_status"][status] = count
+
+        return summary
+
+    def stored_days(self):
+        conn = self._connect()
+        rows = conn.execute("SELECT day FROM pomodoros UNION SELECT day FROM completed_tasks")
+        return {day_iso for (day_iso,) in rows}
+
+    def has_day(self, day_iso):
+        """Whether any pomodoro or task is stored for an ISO day"""
+        conn = self._connect()
+        return conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM pomodoros WHERE day = ?) "
+            "OR EXISTS (SELECT 1 FROM completed_tasks WHERE day = ?)",
+            (day_iso, day_iso)
+        ).fetchone()[0] == 1
+
+    def import_day(self, stats):
+        """Insert a whole legacy stats dict as rows in one transaction"""
+        day_iso = stats["date"]
+        count = stats.get("pomodoros_completed", 0)
+        events = [
+            # Old files only kept the time of the last pomodoro
+            {"type": "pomodoro", "completed_at": stats.get("last_completed") if i == count - 1 else None}
+            for i in range(count)
+        ]
+        events.extend({"type": "task", "task": task} for task in stats.get("completed_tasks", []))
+        conn = self._connect()
+        with conn:
+            self._insert_events(conn, day_iso, events)
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+STORAGE_BACKENDS = {
+    JsonFileStorage.name: JsonFileStorage,
+    EventLogStorage.name: EventLogStorage,
+    SQLiteStorage.name: SQLiteStorage,
+}
+
+
+def create_storage(name, data_dir, **options):
+    """Instantiate a storage backend by name"""
+    if name not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage mode {name!r}, expected one of {tuple(STORAGE_BACKENDS)}")
+    return STORAGE_BACKENDS[name](data_dir, **options)
+
+
+def migrate_json_to_sqlite(data_dir="data", db_path=None):
+    """
+    Import every ``stats_<date>.json`` file in ``data_dir`` into SQLite.
+
+    Days that already have rows in the database are skipped, so the migration
+    can be re-run safely. Returns the number of days imported.
+    """
+    target = SQLiteStorage(data_dir, db_path=db_path)
+    imported = 0
+    try:
+        for filepath in sorted(glob.glob(os.path.join(data_dir, "stats_*.json"))):
+            day_iso = os.path.basename(filepath)[len("stats_"):-len(".json")]
+            try:
+                date.fromisoformat(day_iso)
+                with open(filepath, "r") as f:
+                    stats = json.load(f)
+            except (ValueError, OSError):
+                # Not a daily stats file, or corrupted beyond repair
+                continue
+            if target.has_day(day_iso):
+                continue
+            stats["date"] = day_iso
+            target.import_day(stats)
+            imported += 1
+    finally:
+        target.close()
+    return imported
@@ -0,0 +1,215 @@
+import os
+import json
+import threading
+from file_locking import FileLock, atomic_write_text
+from event_log import read_jsonl_records
+from src.models.task import Task
+from src.models.task_store import TaskStore
+
+
+def _encode(record):
+    """One compact JSONL line"""
+    return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class TaskBacklog:
+    """
+    Pending tasks persisted as an append-only change log in ``data_dir``.
+
+    Every add, edit or completion appends one ``upsert`` or ``remove`` record
+    to ``tasks.jsonl``, so a change costs one short write however long the
+    backlog is. The log is replayed into a ``TaskStore`` the first time the
+    backlog is read and only the new tail is applied afterwards, which also
+    picks up changes made by other processes. Once dead records outnumber live
+    tasks ``compact_ratio`` to one, the log is atomically rewritten with just
+    the live tasks.
+
+    Reads (``query``, ``count``, ``get``...) have the ``TaskStore`` signatures;
+    change tasks through ``add``, ``update`` and ``remove`` so they are logged.
+    """
+
+    def __init__(self, data_dir="data", fsync=True, compact_min_records=1024, compact_ratio=4,
+                 retry_policy=None):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, "tasks.jsonl")
+        self.fsync = fsync
+        self.compact_min_records = compact_min_records
+        self.compact_ratio = compact_ratio
+        self.retry_policy = retry_policy
+        os.makedirs(data_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        self._store = None
+        self._offset = 0
+        self._inode = None
+        self._records = 0
+
+    @property
+    def loaded(self):
+        """Whether the log has been read yet"""
+        return self._store is not None
+
+    def __len__(self):
+        return len(self._current())
+
+    def __iter__(self):
+        return iter(self._current())
+
+    def __contains__(self, task_id):
+        return task_id in self._current()
+
+    def get(self, task_id):
+        """Task with ``task_id``, or None"""
+        return self._current().get(task_id)
+
+    def query(self, statuses=None, start=None, end=None, offset=0, limit=None):
+        """See ``TaskStore.query``"""
+        return list(self._current().query(statuses, start, end, offset, limit))
+
+    def count(self, statuses=None, start=None, end=None):
+        """See ``TaskStore.count``"""
+        return self._current().count(statuses, start, end)
+
+    def status_counts(self):
+        """Number of tasks per status"""
+        return self._current().status_counts()
+
+    def add(self, task):
+        """Log and store a new task; returns its id"""
+        with self._lock, FileLock(self.path, self.retry_policy):
+            store = self._catch_up()
+            if task.id in store:
+                raise KeyError(f"duplicate task id {task.id}")
+            record = task.to_dict()
+            record.setdefault("id", store.next_id)
+            # Logged first, so a failed write leaves the store untouched
+            self._append({"op": "upsert", "task": record})
+            task.id = record["id"]
+            task_id = store.add(task)
+        return task_id
+
+    def update(self, task_id, **fields):
+        """Log a task's new state, then change its fields"""
+        with self._lock, FileLock(self.path, self.retry_policy):
+            store = self._catch_up()
+            task = store.get(task_id)
+            if task is None:
+                raise KeyError(task_id)
+            # Also validates the new values before anything is written
+            changed = Task.from_dict(dict(task.to_dict(), **fields))
+            self._append({"op": "upsert", "task": changed.to_dict()})
+            task = store.update(task_id, **fields)
+        return task
+
+    def remove(self, task_id):
+        """Log a task's removal (e.g. once it is completed), then remove it"""
+        with self._lock, FileLock(self.path, self.retry_policy):
+            store = self._catch_up()
+            if task_id not in store:
+                raise KeyError(task_id)
+            self._append({"op": "remove", "id": task_id})
+            task = store.remove(task_id)
+            if (self._records >= self.compact_min_records
+                    and self._records > self.compact_ratio * max(len(self._store), 1)):
+                self._compact()
+        return task
+
+    def compact(self):
+        """Rewrite the log so it holds one record per live task"""
+        with self._lock, FileLock(self.path, self.retry_policy):
+            self._catch_up()
+            self._compact()
+
+    def _current(self):
+        """The store, brought up to date with the log"""
+        with self._lock:
+            return self._catch_up()
+
+    def _catch_up(self):
+        """Load the log on first use, then apply whatever was appended since"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            stat = None
+        if stat is None:
+            if self._store is None or self._inode is not None:
+                self._reset()
+            return self._store
+        if self._store is None or stat.st_ino != self._inode or stat.st_size < self._offset:
+            # First load, or the log was compacted/replaced under us
+            self._reset()
+            self._inode = stat.st_ino
+        if stat.st_size > self._offset:
+            with open(self.path, "rb") as f:
+                for record, end_offset in read_jsonl_records(f, self._offset):
+                    if isinstance(record, dict):
+                        self._apply(record)
+                    self._offset = end_offset
+        return self._store
+
+    def _reset(self):
+        """Forget everything read so far"""
+        self._store = TaskStore()
+        self._offset = 0
+        self._inode = None
+        self._records = 0
+
+    def _apply(self, record):
+        """Replay one log record into the store"""
+        op = record.get("op")
+        if op == "upsert":
+            task = Task.from_dict(record["task"])
+            if task.id in self._store:
+                self._store.remove(task.id)
+            self._store.add(task)
+        elif op == "remove":
+            if record.get("id") in self._store:
+                self._store.remove(record["id"])
+        elif op == "meta":
+            self._store.reserve_ids(record.get("next_id", 1))
+        self._records += 1
+
+    def _append(self, record):
+        """Append one record after the last complete line; caller holds the locks"""
+        if os.path.exists(self.path) and os.path.getsize(self.path) > self._offset:
+            # Drop a torn tail so our line does not get glued onto it
+            with open(self.path, "r+b") as f:
+                f.truncate(self._offset)
+        with open(self.path, "ab") as f:
+            f.write(_encode(record))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            self._offset = f.tell()
+        self._inode = os.stat(self.path).st_ino
+        self._records += 1
+
+    def _compact(self):
+        """Atomically replace the log with the live tasks; caller holds the locks"""
+        # The meta record keeps ids of removed tasks from being handed out again
+        lines = [_encode({"op": "meta", "next_id": self._store.next_id})]
+        lines.extend(_encode({"op": "upsert", "task": task.to_dict()}) for task in self._store)
+        data = b"".join(lines)
+        atomic_write_text(self.path, data.decode("utf-8"), fsync=self.fsync)
+        stat = os.stat(self.path)
+        self._inode = stat.st_ino
+        self._offset = stat.st_size
+        self._records = len(lines)
+
+
+_shared_backlogs = {}
+_shared_backlogs_lock = threading.Lock()
+
+
+def get_shared_backlog(data_dir="data", **options):
+    """
+    Return the process-wide task backlog for ``data_dir``.
+
+    Sessions share one backlog object so the log is replayed once per process
+    rather than once per browser session.
+    """
+    key = (os.path.abspath(data_dir), tuple(sorted(options.items())))
+    with _shared_backlogs_lock:
+        backlog = _shared_backlogs.get(key)
+        if backlog is None:
+            backlog = _shared_backlogs[key] = TaskBacklog(data_dir, **options)
+        return backlog
@@ -0,0 +1,37 @@
+import os
+import threading
+import pytest
+from benchmarks.bench_concurrency import run_writers
+from file_locking import FileLock, LockTimeout, RetryPolicy, atomic_write_text
+
+@pytest.mark.parametrize("storage", ["json", "eventlog", "sqlite"])
+def test_parallel_writers_lose_nothing(tmp_path, storage):
+    result = run_writers(str(tmp_path), storage=storage, writers=4, writes=30)
+    print(f"{storage}: {result['writes_per_s']:.0f} writes/s, p99 {result['p99_ms']:.2f} ms")
+    assert result["lost"] == 0
+    assert result["pomodoros"] == result["expected_pomodoros"]
+    assert result["tasks"] == result["expected_tasks"]
+
+def test_lock_times_out_when_held(tmp_path):
+    path = str(tmp_path / "stats.json")
+    policy = RetryPolicy(timeout=0.05)
+    timed_out = []
+    with FileLock(path):
+        thread = threading.Thread(target=lambda: timed_out.append(_try_acquire(path, policy)))
+        thread.start()
+        thread.join()
+    assert timed_out == [True]
+
+def _try_acquire(path, policy):
+    try:
+        FileLock(path, policy).acquire()
+    except LockTimeout:
+        return True
+    return False
+
+def test_atomic_write_leaves_no_temp_files(tmp_path):
+    path = str(tmp_path / "stats.json")
+    atomic_write_text(path, '{"a": 1}')
+    atomic_write_text(path, '{"a": 2}')
+    assert open(path).read() == '{"a": 2}'
+    assert os.listdir(tmp_path) == ["stats.json"]
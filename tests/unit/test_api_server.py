@@ -0,0 +1,110 @@
+import asyncio
+from api_server import APIServer, PomodoroAPI
+from benchmarks.bench_api import Client
+from data_manager import PomodoroDataManager
+from task_backlog import TaskBacklog
+from src.core.scheduler import TimerScheduler
+from src.core.session_store import MemorySessionStore
+
+def run_with_server(tmp_path, scenario):
+    """Run ``scenario(client, api)`` against a server on a free port"""
+    data_dir = str(tmp_path / "data")
+    api = PomodoroAPI(PomodoroDataManager(data_dir), TaskBacklog(data_dir, fsync=False),
+                      MemorySessionStore(), TimerScheduler())
+
+    async def main():
+        server = await APIServer(api, port=0, max_workers=2).start()
+        client = await Client("127.0.0.1", server.port).connect()
+        try:
+            return await scenario(client, api)
+        finally:
+            client.close()
+            await server.close()
+
+    return asyncio.run(main())
+
+def test_task_crud_and_completion(tmp_path):
+    async def scenario(client, api):
+        status, task = await client.request("POST", "/tasks", {"description": "Write docs", "due_date": "2030-01-02"})
+        assert status == 201 and task["id"] == 1 and task["status"] == "Open"
+        await client.request("POST", "/tasks", {"description": "Review", "status": "Blocked"})
+
+        status, page = await client.request("GET", "/tasks?status=Open&limit=10")
+        assert page["total"] == 1 and [t["description"] for t in page["tasks"]] == ["Write docs"]
+
+        status, task = await client.request("PATCH", "/tasks/1", {"status": "In Progress"})
+        assert status == 200 and task["status"] == "In Progress"
+        status, error = await client.request("PATCH", "/tasks/1", {"status": "Bogus"})
+        assert status == 400 and "Bogus" in error["error"]
+        status, _ = await client.request("POST", "/tasks", {"notes": "no description"})
+        assert status == 400
+
+        status, task = await client.request("POST", "/tasks/1/complete")
+        assert status == 200 and task["status"] == "Done" and "completed_at" in task
+        status, _ = await client.request("GET", "/tasks/1")
+        assert status == 404
+        status, stats = await client.request("GET", "/stats/tasks")
+        assert stats["total_completed"] == 1 and stats["by_status"]["Done"] == 1
+
+        status, removed = await client.request("DELETE", "/tasks/2")
+        assert status == 200 and removed["description"] == "Review"
+        assert len(api.tasks) == 0
+
+    run_with_server(tmp_path, scenario)
+
+def test_timer_control_records_pomodoros(tmp_path):
+    async def scenario(client, api):
+        status, timer = await client.request("POST", "/timers/s1/start")
+        assert status == 200 and timer["is_running"] and timer["mode"] == "Work"
+        status, timer = await client.request("POST", "/timers/s1/skip")
+        assert timer["mode"] == "Short Break" and timer["sessions_completed"] == 1
+
+        status, daily = await client.request("GET", "/stats/daily")
+        assert daily["pomodoros_completed"] == 1
+        status, weekly = await client.request("GET", "/stats/weekly")
+        assert weekly["total_pomodoros"] == 1
+
+        # The timer state is in the session store for other workers to pick up
+        version, state = api.session_store.get("s1")
+        assert state["mode"] == "Short Break" and version == timer["version"]
+
+    run_with_server(tmp_path, scenario)
+
+def test_errors(tmp_path):
+    async def scenario(client, api):
+        assert (await client.request("GET", "/health")) == (200, {"status": "ok"})
+        assert (await client.request("GET", "/nowhere"))[0] == 404
+        assert (await client.request("PUT", "/tasks"))[0] == 405
+        assert (await client.request("POST", "/timers/s1/explode"))[0] == 404
+
+        # Invalid JSON body, on the same keep-alive connection
+        client.writer.write(b"POST /tasks HTTP/1.1\r\nContent-Length: 3\r\n\r\n{x}")
+        head = await client.reader.readuntil(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 400")
+        length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+        await client.reader.readexactly(length)
+        assert (await client.request("GET", "/health"))[0] == 200
+
+    run_with_server(tmp_path, scenario)
+
+def test_timers_are_created_by_writes_only_and_bounded(tmp_path):
+    async def scenario(client, api):
+        api.max_timers = 2
+        assert (await client.request("GET", "/timers/unknown"))[0] == 404
+        assert len(api._timers) == 0
+        for session in ("a", "b", "c"):
+            assert (await client.request("POST", f"/timers/{session}/start"))[0] == 200
+        assert list(api._timers) == ["b", "c"]
+        # Dropped here, but still in the store
+        status, timer = await client.request("GET", "/timers/a")
+        assert status == 200 and timer["is_running"]
+
+    run_with_server(tmp_path, scenario)
+
+def test_negative_content_length(tmp_path):
+    async def scenario(client, api):
+        client.writer.write(b"POST /tasks HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+        head = await client.reader.readuntil(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 400") and b"Connection: close" in head
+
+    run_with_server(tmp_path, scenario)
@@ -0,0 +1,104 @@
+import json
+from benchmarks import bench_api, bench_data_layer, bench_history_io, bench_instrumentation, bench_scheduler, bench_startup, bench_task_backlog, bench_task_model, bench_task_store
+from benchmarks.compare import compare_reports
+from benchmarks.harness import percentile, summarize_latencies
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
+
+def test_summarize_latencies():
+    summary = summarize_latencies([0.001, 0.002, 0.003, 0.004])
+    assert summary["iterations"] == 4
+    assert round(summary["throughput_per_s"]) == 400
+    assert summary["p50_ms"] == 2.0
+
+def test_data_layer_benchmark_smoke(tmp_path):
+    output = tmp_path / "report.json"
+    bench_data_layer.main([
+        "--scenarios", "1_day", "--storage", "json", "sqlite",
+        "--iterations", "3", "--output", str(output),
+    ])
+    report = json.loads(output.read_text())
+    assert report["suite"] == "data_layer"
+    assert "1_day/sqlite/get_weekly_summary" in report["results"]
+    assert report["results"]["1_day/json/save_pomodoro_completed"]["iterations"] == 3
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"a": {"p50_ms": 1.0}, "b": {"p50_ms": 1.0}}}
+    candidate = {"results": {"a": {"p50_ms": 1.5}, "b": {"p50_ms": 1.0}}}
+    rows, regressions = compare_reports(baseline, candidate)
+    assert len(rows) == 2
+    assert [row[0] for row in regressions] == ["a"]
+
+def test_scheduler_benchmark_smoke(tmp_path):
+    output = tmp_path / "report.json"
+    bench_scheduler.main(["--timers", "200", "--spread", "0.2", "--output", str(output)])
+    fire_lag = json.loads(output.read_text())["results"]["scheduler/200_timers/fire_lag"]
+    assert fire_lag["fired"] == 200
+    assert fire_lag["duplicates"] == 0 and fire_lag["missing"] == 0
+
+def test_task_store_benchmark_smoke(tmp_path):
+    output = tmp_path / "report.json"
+    bench_task_store.main(["--tasks", "200", "--iterations", "5", "--output", str(output)])
+    results = json.loads(output.read_text())["results"]
+    assert results["200_tasks/task_store/this_week"]["iterations"] == 5
+    assert "200_tasks/list_scan/complete" in results
+    assert "200_tasks/task_store_page/all" in results
+
+def test_task_model_benchmark_smoke(tmp_path):
+    output = tmp_path / "report.json"
+    bench_task_model.main(["--tasks", "500", "--iterations", "2", "--output", str(output)])
+    results = json.loads(output.read_text())["results"]
+    assert results["500_tasks/memory/task"]["bytes_per_task"] < results["500_tasks/memory/dict"]["bytes_per_task"]
+
+def test_task_backlog_benchmark_smoke(tmp_path):
+    output = tmp_path / "report.json"
+    bench_task_backlog.main(["--tasks", "50", "--iterations", "5", "--no-fsync", "--output", str(output)])
+    results = json.loads(output.read_text())["results"]
+    assert results["50_tasks/append/complete"]["iterations"] == 5
+    assert "50_tasks/rewrite/edit" in results
+
+def test_parse_importtime_keeps_top_level_imports():
+    log = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |   _json",
+        "import time:       300 |        420 | json",
+        "import time:        80 |         80 | colorsys",
+    ])
+    assert bench_startup.parse_importtime(log) == {"json": 420e-6, "colorsys": 80e-6}
+    assert bench_startup.imported_modules(log) == {"_json", "json", "colorsys"}
+
+def test_startup_cold_start_smoke(tmp_path):
+    script = tmp_path / "entry.py"
+    script.write_text("import json\n")
+    entries = bench_startup.measure_cold_start(str(script), 1, str(tmp_path))
+    assert entries["cold_start"]["iterations"] == 1
+    assert "json" in entries["import_time"]["slowest_ms"]
+    assert entries["import_time"]["heavy_packages"] == []
+
+def test_instrumentation_benchmark_smoke(tmp_path):
+    output = tmp_path / "report.json"
+    bench_instrumentation.main(["--calls", "100", "--iterations", "2", "--output", str(output)])
+    results = json.loads(output.read_text())["results"]
+    assert results["instrumentation/span/disabled"]["ns_per_call"] > 0
+    assert "instrumentation/timed/enabled" in results
+    assert results["metrics/counter_inc"]["ns_per_call"] > 0
+    assert "metrics/render" in results
+
+def test_api_benchmark_smoke(tmp_path):
+    output = tmp_path / "report.json"
+    bench_api.main(["--endpoint", "health", "stats_daily", "--connections", "4", "--requests", "40",
+                    "--cpu", "-1", "--output", str(output)])
+    results = json.loads(output.read_text())["results"]
+    assert results["api/health/c4"]["iterations"] == 40
+    assert results["api/stats_daily/c4"]["errors"] == 0
+
+def test_history_io_benchmark_smoke(tmp_path):
+    output = tmp_path / "report.json"
+    bench_history_io.main(["--scenarios", "1_day", "--format", "csv", "--output", str(output)])
+    results = json.loads(output.read_text())["results"]
+    assert results["1_day/json/csv/export"]["rows"] == results["1_day/json/csv/import"]["rows"]
+    assert results["1_day/json/csv/import"]["peak_kib"] > 0
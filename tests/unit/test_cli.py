@@ -0,0 +1,69 @@
+import os
+import sys
+import subprocess
+import pytest
+from benchmarks.bench_startup import imported_modules
+from src import cli
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def test_run_records_completed_pomodoros(tmp_path, capsys):
+    data_dir = str(tmp_path / "data")
+    minutes = 0.02 / 60
+    assert cli.main(["run", "--data-dir", data_dir, "--work", str(minutes), "--short-break", str(minutes),
+                     "--long-break", str(minutes), "--cycles", "2"]) == 0
+
+    out = capsys.readouterr().out
+    assert "Work complete (1 today), Short Break" in out
+    assert "Work complete (2 today)" in out
+    assert "2 pomodoro(s) completed" in out
+    # The state file is only there while the timer runs
+    assert cli.read_state(data_dir) is None
+
+    assert cli.main(["status", "--data-dir", data_dir]) == 0
+    out = capsys.readouterr().out
+    assert "No timer running" in out
+    assert "Pomodoros completed today: 2" in out
+
+def test_stop_without_timer(tmp_path, capsys):
+    assert cli.main(["stop", "--data-dir", str(tmp_path)]) == 1
+    assert "No timer running" in capsys.readouterr().out
+
+def test_startup_skips_streamlit_and_notifications(tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.join(REPO_ROOT, "src", "cli.py"), "status",
+         "--data-dir", str(tmp_path)],
+        cwd=str(tmp_path), stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True,
+    )
+    modules = imported_modules(result.stderr)
+    assert "Pomodoros completed today: 0" in result.stdout
+    assert not modules & {"streamlit", "pandas", "plotly", "urllib.request", "concurrent.futures"}
+
+def test_run_rejects_non_positive_durations(tmp_path, capsys):
+    for option in ("--work", "--short-break", "--long-break", "--long-break-interval", "--cycles"):
+        with pytest.raises(SystemExit) as exc:
+            cli.main(["run", "--data-dir", str(tmp_path), option, "-1"])
+        assert exc.value.code == 2
+    assert "must be positive" in capsys.readouterr().err
+
+def test_run_refuses_while_another_timer_runs(tmp_path, capsys):
+    data_dir = str(tmp_path)
+    with open(cli.state_path(data_dir), "w") as f:
+        f.write('{"pid": %d, "timer": null}' % os.getpid())
+    with cli.run_lock(data_dir):
+        assert cli.main(["run", "--data-dir", data_dir, "--cycles", "1"]) == 1
+    assert "already running (pid %d)" % os.getpid() in capsys.readouterr().err
+
+def test_stale_or_broken_state_is_not_running(tmp_path, capsys):
+    data_dir = str(tmp_path)
+    # A live pid alone (ours, or a reused one) does not make a timer
+    for content in ('{"pid": %d, "timer": null}' % os.getpid(), '{"timer": null}'):
+        with open(cli.state_path(data_dir), "w") as f:
+            f.write(content)
+        assert cli.main(["stop", "--data-dir", data_dir]) == 1
+        assert cli.main(["status", "--data-dir", data_dir]) == 0
+        assert capsys.readouterr().out.count("No timer running") == 2
+    with open(cli.state_path(data_dir), "w") as f:
+        f.write('{"timer": null}')
+    with cli.run_lock(data_dir):
+        assert cli.main(["stop", "--data-dir", data_dir]) == 1
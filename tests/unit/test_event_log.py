@@ -0,0 +1,89 @@
+import json
+import pytest
+from datetime import date
+from data_manager import PomodoroDataManager
+from event_log import EventLogStore, pomodoro_event, task_event
+
+DAY = "2025-03-25"
+
+@pytest.fixture
+def store(tmp_path):
+    return EventLogStore(str(tmp_path), fsync_batch_size=4, checkpoint_every=3)
+
+def test_append_and_load(store):
+    store.append(DAY, pomodoro_event("2025-03-25T10:00:00"))
+    stats = store.append(DAY, task_event({"description": "Write tests", "completed_at": "2025-03-25T10:05:00"}))
+    assert stats["pomodoros_completed"] == 1
+    assert stats["last_completed"] == "2025-03-25T10:00:00"
+    assert stats["completed_tasks"][0]["description"] == "Write tests"
+    assert store.load(DAY) == stats
+
+def test_replay_from_disk(store, tmp_path):
+    for _ in range(5):
+        store.append(DAY, pomodoro_event())
+    store.close()
+
+    # A checkpoint was taken, so a fresh store only replays the tail
+    fresh = EventLogStore(str(tmp_path))
+    assert (tmp_path / f"events_{DAY}.checkpoint.json").exists()
+    assert fresh.load(DAY)["pomodoros_completed"] == 5
+
+def test_torn_last_line_is_skipped(store, tmp_path):
+    store.append(DAY, pomodoro_event())
+    store.append(DAY, pomodoro_event())
+    store.close()
+    with open(tmp_path / f"events_{DAY}.jsonl", "ab") as f:
+        f.write(b'{"type":"pomodoro","compl')
+
+    fresh = EventLogStore(str(tmp_path))
+    assert fresh.recover(DAY)["pomodoros_completed"] == 2
+
+    # The next append starts on a clean line
+    assert fresh.append(DAY, pomodoro_event())["pomodoros_completed"] == 3
+    fresh.close()
+    assert EventLogStore(str(tmp_path)).load(DAY)["pomodoros_completed"] == 3
+
+def test_sees_appends_from_other_writers(tmp_path):
+    first = EventLogStore(str(tmp_path))
+    second = EventLogStore(str(tmp_path))
+    first.append(DAY, pomodoro_event())
+    second.append(DAY, pomodoro_event())
+    assert first.load(DAY)["pomodoros_completed"] == 2
+
+def test_legacy_stats_file_is_the_base(tmp_path):
+    with open(tmp_path / f"stats_{DAY}.json", "w") as f:
+        json.dump({"date": DAY, "pomodoros_completed": 2, "last_completed": None}, f)
+    store = EventLogStore(str(tmp_path))
+    assert store.append(DAY, pomodoro_event())["pomodoros_completed"] == 3
+
+@pytest.mark.parametrize("storage", ["json", "eventlog"])
+def test_data_manager_storage_modes(tmp_path, storage):
+    manager = PomodoroDataManager(data_dir=str(tmp_path), storage=storage)
+    manager.save_pomodoro_completed()
+    manager.save_task_completed("Review PR", {"description": "Review PR", "status": "Done"})
+    manager.close()
+
+    assert manager.load_daily_stats()["pomodoros_completed"] == 1
+    assert manager.get_tasks_stats()["by_status"]["Done"] == 1
+    summary = manager.get_weekly_summary()
+    assert summary["total_pomodoros"] == 1
+    assert summary["daily_counts"] == {date.today().isoformat(): 1}
+
+def test_data_manager_rejects_unknown_storage(tmp_path):
+    with pytest.raises(ValueError):
+        PomodoroDataManager(data_dir=str(tmp_path), storage="xml")
+
+def test_replayed_days_are_bounded(tmp_path):
+    store = EventLogStore(str(tmp_path), max_cached_days=4)
+    days = [f"2025-01-{day:02d}" for day in range(1, 31)]
+    for day_iso in days:
+        store.append(day_iso, pomodoro_event())
+    assert len(store._days) == 4
+
+    # Evicted days are read back from disk, and their logs appended to again
+    store.append(days[0], pomodoro_event())
+    assert store.load(days[0])["pomodoros_completed"] == 2
+    assert all(store.load(day_iso)["pomodoros_completed"] == 1 for day_iso in days[1:])
+    assert len(store._days) == 4
+    store.close()
+    assert EventLogStore(str(tmp_path)).load(days[0])["pomodoros_completed"] == 2
@@ -0,0 +1,73 @@
+import json
+import pytest
+from datetime import date
+from data_manager import PomodoroDataManager, StatsCache
+from history_io import export_history, import_history, read_records
+from benchmarks.synthetic import iter_history
+
+def make_manager(data_dir, storage="json"):
+    return PomodoroDataManager(str(data_dir), storage=storage, cache=StatsCache())
+
+def seed(manager, days=5):
+    for stats in iter_history(days, 2, end=date(2024, 3, 10)):
+        day = date.fromisoformat(stats["date"])
+        events = [{"type": "pomodoro", "completed_at": stats["last_completed"]}] * stats["pomodoros_completed"]
+        events += [{"type": "task", "task": task} for task in stats["completed_tasks"]]
+        manager.append_events(day, events)
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+@pytest.mark.parametrize("storage", ["json", "sqlite"])
+def test_round_trip_and_reimport_is_deduplicated(tmp_path, fmt, storage):
+    source = make_manager(tmp_path / "source", storage)
+    seed(source)
+    path = str(tmp_path / f"history.{fmt}")
+    rows = export_history(source, path)
+
+    target = make_manager(tmp_path / "target", storage)
+    report = import_history(target, path)
+    assert report["days"] == 5 and report["invalid"] == 0
+    assert report["pomodoros"] + report["tasks"] == rows
+    for day in range(6, 11):
+        day = date(2024, 3, day)
+        expected, imported = source.load_stats(day), target.load_stats(day)
+        assert imported["pomodoros_completed"] == expected["pomodoros_completed"]
+        assert imported["completed_tasks"] == expected["completed_tasks"]
+
+    again = import_history(target, path)
+    assert again["days"] == 0 and again["duplicates"] == rows
+
+def test_export_date_range(tmp_path):
+    manager = make_manager(tmp_path / "data")
+    seed(manager)
+    path = str(tmp_path / "history.jsonl")
+    export_history(manager, path, start=date(2024, 3, 8), end=date(2024, 3, 9))
+    days = {record["date"] for _, record in read_records(path)}
+    assert days == {"2024-03-08", "2024-03-09"}
+
+def test_import_validates_records(tmp_path):
+    path = tmp_path / "history.jsonl"
+    records = [
+        {"date": "2024-01-01", "type": "pomodoro", "completed_at": "2024-01-01T10:00:00"},
+        {"date": "2024-01-01", "type": "task", "description": "Write", "status": "Done"},
+        {"date": "not a date", "type": "pomodoro"},
+        {"date": "2024-01-01", "type": "task", "status": "Done"},
+        {"date": "2024-01-01", "type": "task", "description": "x", "status": "Nope"},
+        {"date": "2024-01-01", "type": "meeting"},
+    ]
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n{broken\n")
+    manager = make_manager(tmp_path / "data")
+
+    with pytest.raises(ValueError, match="Row 3"):
+        import_history(manager, str(path), strict=True)
+    report = import_history(make_manager(tmp_path / "other"), str(path))
+    assert report["invalid"] == 5 and len(report["errors"]) == 5
+    assert (report["pomodoros"], report["tasks"]) == (1, 1)
+
+def test_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    source = make_manager(tmp_path / "source")
+    seed(source)
+    path = str(tmp_path / "history.parquet")
+    rows = export_history(source, path)
+    report = import_history(make_manager(tmp_path / "target"), path)
+    assert report["pomodoros"] + report["tasks"] == rows
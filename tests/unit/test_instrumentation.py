@@ -0,0 +1,69 @@
+import json
+import time
+import pytest
+from data_manager import PomodoroDataManager
+from instrumentation import Histogram, Instrumentation, instrumentation
+
+def test_histogram_quantiles_are_close():
+    histogram = Histogram("x")
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["max_ms"] == pytest.approx(100)
+    assert summary["p50_ms"] == pytest.approx(50, rel=0.2)
+    assert summary["p99_ms"] == pytest.approx(99, rel=0.2)
+    assert summary["p99_ms"] <= summary["max_ms"]
+
+def test_disabled_records_nothing():
+    inst = Instrumentation(enabled=False)
+
+    @inst.timed("work")
+    def work():
+        return 42
+
+    with inst.span("block"):
+        pass
+    assert work() == 42
+    inst.record("manual", 0.1)
+    assert inst.summary() == {}
+
+def test_spans_and_json_export():
+    inst = Instrumentation(enabled=True)
+    with inst.span("rerun/css"):
+        pass
+    inst.record("rerun/script", 0.02)
+    exported = json.loads(inst.to_json())
+    assert set(exported["spans"]) == {"rerun/css", "rerun/script"}
+    assert exported["spans"]["rerun/script"]["count"] == 1
+    inst.reset()
+    assert inst.summary() == {}
+
+def test_data_manager_methods_are_timed(tmp_path):
+    manager = PomodoroDataManager(data_dir=str(tmp_path))
+    instrumentation.reset()
+    instrumentation.enabled = True
+    try:
+        manager.save_pomodoro_completed()
+        manager.load_daily_stats()
+    finally:
+        instrumentation.enabled = False
+    summary = instrumentation.summary()
+    instrumentation.reset()
+    assert summary["data_manager/save_pomodoro_completed"]["count"] == 1
+    assert summary["data_manager/load_daily_stats"]["count"] == 1
+
+def test_generators_are_timed_while_iterated():
+    inst = Instrumentation(enabled=True)
+
+    @inst.timed("gen")
+    def produce():
+        for i in range(3):
+            time.sleep(0.01)
+            yield i
+
+    items = produce()
+    assert inst.summary() == {}
+    assert list(items) == [0, 1, 2]
+    summary = inst.summary()["gen"]
+    assert summary["count"] == 1 and summary["max_ms"] >= 25
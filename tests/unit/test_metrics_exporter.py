@@ -0,0 +1,70 @@
+import urllib.request
+import urllib.error
+import pytest
+from instrumentation import Instrumentation
+from metrics_exporter import MetricsExporter, MetricsRegistry, SessionTracker
+
+def _samples(text):
+    """``{name{labels}: value}`` for every sample line"""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+def test_render_counters_gauges_and_histograms():
+    inst = Instrumentation(enabled=True)
+    registry = MetricsRegistry(inst)
+    registry.counter("pomodoro_pomodoros_completed_total", "Work sessions").inc(3)
+    registry.gauge("pomodoro_running_timers", "Timers", lambda: 2)
+    for seconds in (0.0001, 0.003, 0.003, 2.0):
+        inst.record("data_manager/save_pomodoro_completed", seconds)
+    inst.record("rerun/script", 0.05)
+    inst.record("data_manager/import_history", 1.5)
+
+    text = registry.render()
+    assert "# TYPE pomodoro_data_manager_seconds histogram" in text
+    samples = _samples(text)
+    assert samples["pomodoro_pomodoros_completed_total"] == 3
+    assert samples["pomodoro_running_timers"] == 2
+
+    labels = 'method="save_pomodoro_completed",op="write"'
+    assert samples[f'pomodoro_data_manager_seconds_bucket{{{labels},le="0.000256"}}'] == 1
+    assert samples[f'pomodoro_data_manager_seconds_bucket{{{labels},le="0.004096"}}'] == 3
+    assert samples[f'pomodoro_data_manager_seconds_bucket{{{labels},le="+Inf"}}'] == 4
+    assert samples[f'pomodoro_data_manager_seconds_count{{{labels}}}'] == 4
+    assert samples[f'pomodoro_data_manager_seconds_sum{{{labels}}}'] == pytest.approx(2.0061)
+    assert samples['pomodoro_rerun_seconds_count{phase="script"}'] == 1
+    # Bulk imports are writes and stay out of the read latencies
+    assert samples['pomodoro_data_manager_seconds_count{method="import_history",op="write"}'] == 1
+
+def test_failing_gauge_is_skipped():
+    registry = MetricsRegistry(Instrumentation())
+    registry.gauge("broken", "Raises", lambda: 1 / 0)
+    registry.gauge("fine", "Works", lambda: 1.5)
+    assert _samples(registry.render()) == {"fine": 1.5}
+
+def test_session_tracker_window():
+    now = [0.0]
+    tracker = SessionTracker(window=10, clock=lambda: now[0])
+    tracker.seen("a")
+    now[0] = 5
+    tracker.seen("b")
+    assert tracker.active() == 2
+    now[0] = 12
+    assert tracker.active() == 1
+
+def test_exporter_serves_metrics():
+    registry = MetricsRegistry(Instrumentation())
+    registry.counter("pomodoro_tasks_completed_total", "Tasks").inc()
+    exporter = MetricsExporter(registry, port=0).start()
+    try:
+        url = f"http://127.0.0.1:{exporter.port}"
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert _samples(response.read().decode())["pomodoro_tasks_completed_total"] == 1
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{url}/other", timeout=5)
+    finally:
+        exporter.stop()
@@ -1,5 +1,26 @@
+import json
+import time
 import pytest
-from src.utils.notifications import NotificationManager
+import threading
+from src.utils.notifications import (
+    LogFileSink, NotificationManager, NotificationSink, WebhookSink, sinks_from_env
+)
+
+class RecordingSink(NotificationSink):
+    name = "recording"
+
+    def __init__(self, gate=None, fail=False):
+        super().__init__()
+        self.gate = gate
+        self.fail = fail
+        self.received = []
+
+    def send(self, notification):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail:
+            raise RuntimeError("sink down")
+        self.received.append(notification)
 
 def test_notification_initialization():
     notifier = NotificationManager()
@@ -15,4 +36,58 @@ def test_send_notification():
     # This is a basic test - you might want to mock the actual notification
     # system and test that it's called correctly
     notifier.send_notification("Test", "Test Message")
-    assert True  # If no exception is raised, test passes 
\ No newline at end of file
+    assert True  # If no exception is raised, test passes 
+
+def test_slow_sink_does_not_block_and_bursts_coalesce():
+    gate = threading.Event()
+    slow, fast = RecordingSink(gate), RecordingSink()
+    notifier = NotificationManager([slow, fast], dedup_window=0)
+
+    start = time.monotonic()
+    for i in range(5):
+        assert notifier.send_notification("Pomodoro Complete", f"#{i}")
+    assert time.monotonic() - start < 0.5
+
+    assert notifier.flush(timeout=0.1) is False
+    gate.set()
+    assert notifier.flush(timeout=5)
+    # The first send was in flight; the other four became one notification
+    assert [(n.message, n.count) for n in slow.received] == [("#0", 1), ("#4", 4)]
+    assert slow.received[1].summary == "Pomodoro Complete (+3 more)"
+    assert len(fast.received) >= 2
+    notifier.close()
+
+def test_duplicates_within_window_are_dropped():
+    now = [100.0]
+    sink = RecordingSink()
+    notifier = NotificationManager([sink], dedup_window=2.0, clock=lambda: now[0])
+    assert notifier.send_notification("Done", "Take a break")
+    assert not notifier.send_notification("Done", "Take a break")
+    now[0] += 3
+    assert notifier.send_notification("Done", "Take a break")
+    notifier.flush(timeout=5)
+    assert len(sink.received) == 2
+    assert notifier.stats()["deduplicated"] == 1
+    notifier.close()
+
+def test_failing_sink_is_counted():
+    notifier = NotificationManager([RecordingSink(fail=True)])
+    notifier.send_notification("Done", "Take a break")
+    assert notifier.flush(timeout=5)
+    assert notifier.stats()["failed"] == 1
+    notifier.close()
+
+def test_log_file_sink(tmp_path):
+    path = tmp_path / "notifications.jsonl"
+    notifier = NotificationManager([LogFileSink(str(path))])
+    notifier.send_notification("Break Over", "Time to focus!")
+    notifier.flush(timeout=5)
+    record = json.loads(path.read_text())
+    assert record["title"] == "Break Over" and record["count"] == 1
+    notifier.close()
+
+def test_sinks_from_env(tmp_path):
+    sinks = sinks_from_env({"POMODORO_NOTIFY_WEBHOOK": "http://127.0.0.1:9/hook",
+                            "POMODORO_NOTIFY_LOG": str(tmp_path / "n.jsonl")})
+    assert [type(sink) for sink in sinks] == [WebhookSink, LogFileSink]
+    assert sinks_from_env({}) == []
@@ -0,0 +1,54 @@
+import json
+import time
+import threading
+from profiling import RerunProfiler
+
+def busy_rerun(seconds=0.05):
+    deadline = time.perf_counter() + seconds
+    data = []
+    while time.perf_counter() < deadline:
+        data.append(str(len(data)))
+    return len(data)
+
+def test_captures_up_to_the_cap(tmp_path):
+    profiler = RerunProfiler(str(tmp_path), max_reruns=2, sample_interval=0.001)
+    for _ in range(3):
+        assert profiler.capture(busy_rerun) > 0
+
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert "rerun-0001.prof" in names and "rerun-0002.tracemalloc" in names
+    assert "rerun-0003.prof" not in names
+    assert "busy_rerun" in (tmp_path / "rerun-0001.txt").read_text()
+
+    reruns = [json.loads(line) for line in (tmp_path / "reruns.jsonl").read_text().splitlines()]
+    assert [r["rerun"] for r in reruns] == [1, 2]
+    assert reruns[0]["wall_ms"] >= 50
+
+def test_folded_stacks_are_aggregated(tmp_path):
+    profiler = RerunProfiler(str(tmp_path), max_reruns=2, sample_interval=0.001)
+    profiler.capture(busy_rerun)
+    profiler.capture(busy_rerun)
+    lines = (tmp_path / "stacks.folded").read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("busy_rerun (test_profiling.py" in line for line in lines)
+
+def test_overlapping_reruns_are_not_profiled_twice(tmp_path):
+    profiler = RerunProfiler(str(tmp_path), max_reruns=5, sample_interval=0.001)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_rerun():
+        started.set()
+        release.wait(5)
+        return "slow"
+
+    thread = threading.Thread(target=profiler.capture, args=(slow_rerun,))
+    thread.start()
+    started.wait(5)
+    # A second session's rerun while the first is captured runs unprofiled
+    assert profiler.capture(busy_rerun, 0.01) > 0
+    release.set()
+    thread.join()
+    assert profiler.captured == 1
+    assert [json.loads(line)["rerun"] for line in (tmp_path / "reruns.jsonl").read_text().splitlines()] == [1]
@@ -0,0 +1,88 @@
+import json
+import random
+import pytest
+from datetime import date, timedelta
+from data_manager import PomodoroDataManager
+from rollup_index import RollupIndex, decompose_range
+
+def _days_in(key):
+    """Expand a bucket key back into the days it covers"""
+    if len(key) == 10:
+        return [date.fromisoformat(key)]
+    if "-W" in key:
+        year, week = key.split("-W")
+        monday = date.fromisocalendar(int(year), int(week), 1)
+        return [monday + timedelta(days=i) for i in range(7)]
+    if "-" in key:
+        year, month = map(int, key.split("-"))
+        day, days = date(year, month, 1), []
+        while day.month == month:
+            days.append(day)
+            day += timedelta(days=1)
+        return days
+    day, days = date(int(key), 1, 1), []
+    while day.year == int(key):
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+@pytest.mark.parametrize("start,end", [
+    (date(2023, 2, 14), date(2025, 11, 3)),
+    (date(2024, 12, 28), date(2025, 1, 9)),
+    (date(2025, 3, 1), date(2025, 3, 31)),
+    (date(2025, 3, 25), date(2025, 3, 25)),
+])
+def test_decompose_range_covers_range_exactly(start, end):
+    keys = list(decompose_range(start, end))
+    covered = [day for key in keys for day in _days_in(key)]
+    assert covered == [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    assert len(keys) <= 60
+
+def test_summary_matches_brute_force():
+    rng = random.Random(7)
+    index = RollupIndex()
+    records = {}
+    day = date(2022, 1, 1)
+    while day <= date(2024, 12, 31):
+        record = {"pomodoros": rng.randint(0, 3), "tasks": 1, "by_status": {"Done": 1}}
+        records[day] = record
+        index.set_day(day.isoformat(), record)
+        day += timedelta(days=1)
+
+    start, end = date(2022, 5, 17), date(2024, 8, 2)
+    summary = index.summarize(start, end)
+    in_range = [r for d, r in records.items() if start <= d <= end]
+    assert summary["total_pomodoros"] == sum(r["pomodoros"] for r in in_range)
+    assert summary["days_active"] == sum(1 for r in in_range if r["pomodoros"])
+    assert summary["task_counts"]["by_status"]["Done"] == len(in_range)
+
+def test_set_day_replaces_previous_counts():
+    index = RollupIndex()
+    index.set_day("2025-03-25", {"pomodoros": 2, "tasks": 0, "by_status": {}})
+    index.set_day("2025-03-25", {"pomodoros": 3, "tasks": 0, "by_status": {}})
+    summary = index.summarize(date(2025, 1, 1), date(2025, 12, 31))
+    assert summary["total_pomodoros"] == 3
+    assert summary["days_active"] == 1
+
+def test_manager_summary_tracks_writes_and_external_files(tmp_path):
+    manager = PomodoroDataManager(data_dir=str(tmp_path))
+    today = date.today()
+    manager.save_pomodoro_completed()
+    assert manager.get_summary(today, today)["total_pomodoros"] == 1
+
+    # Written after the index was built, e.g. by another process
+    old_day = today - timedelta(days=400)
+    with open(tmp_path / f"stats_{old_day.isoformat()}.json", "w") as f:
+        json.dump({"date": old_day.isoformat(), "pomodoros_completed": 4, "last_completed": None}, f)
+    manager.refresh_rollup_index()
+
+    summary = manager.get_summary(today - timedelta(days=730), today)
+    assert summary["total_pomodoros"] == 5
+    assert summary["days_active"] == 2
+    manager.save_pomodoro_completed()
+    manager.close()
+
+    # A fresh manager reuses the persisted index
+    fresh = PomodoroDataManager(data_dir=str(tmp_path))
+    assert fresh.get_summary(today - timedelta(days=730), today)["total_pomodoros"] == 6
+    assert fresh.get_weekly_summary()["daily_counts"] == {today.isoformat(): 2}
@@ -0,0 +1,94 @@
+import threading
+from src.core.scheduler import TimerScheduler
+from src.core.timer import PomodoroTimer, TimerMode
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_timer(clock, work_duration, completions, **kwargs):
+    timer = PomodoroTimer(work_duration=work_duration, break_duration=5, clock=clock, **kwargs)
+    timer.on_complete(lambda t, done, nxt: completions.append((t, done)))
+    return timer
+
+def test_fires_due_timers_in_deadline_order():
+    clock = FakeClock()
+    scheduler = TimerScheduler(clock=clock)
+    completions = []
+    timers = [make_timer(clock, duration, completions) for duration in (30, 10, 20)]
+    for timer in timers:
+        timer.start()
+        scheduler.schedule(timer)
+    assert scheduler.next_deadline() == 10
+    clock.now = 25
+    assert scheduler.run_due() == 2
+    assert [t for t, _ in completions] == [timers[1], timers[2]]
+    assert len(scheduler) == 1
+    clock.now = 100
+    scheduler.run_due()
+    assert len(completions) == 3
+    assert scheduler.run_due() == 0
+
+def test_cancel_and_reschedule_fire_once():
+    clock = FakeClock()
+    scheduler = TimerScheduler(clock=clock)
+    completions = []
+    timer = make_timer(clock, 10, completions)
+    timer.start()
+    scheduler.schedule(timer)
+    scheduler.cancel(timer)
+    assert timer not in scheduler
+    scheduler.schedule(timer)
+    scheduler.schedule(timer)
+    clock.now = 10
+    assert scheduler.run_due() == 1
+    assert completions == [(timer, TimerMode.WORK)]
+
+def test_paused_or_extended_timers_are_revalidated():
+    clock = FakeClock()
+    scheduler = TimerScheduler(clock=clock)
+    completions = []
+    paused = make_timer(clock, 10, completions)
+    extended = make_timer(clock, 10, completions)
+    for timer in (paused, extended):
+        timer.start()
+        scheduler.schedule(timer)
+    paused.pause()
+    extended.work_duration = 50
+    clock.now = 20
+    scheduler.run_due()
+    assert completions == []
+    assert extended in scheduler and paused not in scheduler
+    assert scheduler.next_deadline() == 50
+
+def test_auto_started_phase_is_rescheduled():
+    clock = FakeClock()
+    scheduler = TimerScheduler(clock=clock)
+    completions = []
+    timer = make_timer(clock, 10, completions, auto_start=True)
+    timer.start()
+    scheduler.schedule(timer)
+    clock.now = 10
+    scheduler.run_due()
+    assert scheduler.next_deadline() == 15
+    clock.now = 15
+    scheduler.run_due()
+    assert [done for _, done in completions] == [TimerMode.WORK, TimerMode.SHORT_BREAK]
+
+def test_scheduler_thread_fires_at_deadline():
+    scheduler = TimerScheduler()
+    fired = threading.Event()
+    timer = PomodoroTimer(work_duration=0.05)
+    timer.on_complete(lambda t, done, nxt: fired.set())
+    scheduler.start()
+    timer.start()
+    scheduler.schedule(timer)
+    assert fired.wait(5)
+    scheduler.stop()
+    assert scheduler.fired == 1
+    assert timer.mode == TimerMode.SHORT_BREAK
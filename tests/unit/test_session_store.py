@@ -0,0 +1,93 @@
+import pytest
+from src.core.session_store import MemorySessionStore, SessionStore, SQLiteSessionStore, TimerSync
+from src.core.timer import PomodoroTimer, TimerMode
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    store = MemorySessionStore() if request.param == "memory" else SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"))
+    yield store
+    store.close()
+
+def test_compare_and_swap(store):
+    assert store.get("s1") == (0, None)
+    assert store.compare_and_swap("s1", 0, {"n": 1}) == 1
+    # A second creator loses
+    assert store.compare_and_swap("s1", 0, {"n": 2}) is None
+    assert store.compare_and_swap("s1", 1, {"n": 3}) == 2
+    assert store.compare_and_swap("s1", 1, {"n": 4}) is None
+    assert store.version("s1") == 2
+    assert store.get("s1") == (2, {"n": 3})
+    store.delete("s1")
+    assert store.version("s1") == 0
+
+def test_purge_drops_idle_sessions(store):
+    store.compare_and_swap("s1", 0, {})
+    assert store.purge(3600) == 0
+    assert store.purge(-1) == 1
+    assert store.version("s1") == 0
+
+def test_sqlite_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    first, second = SQLiteSessionStore(path), SQLiteSessionStore(path)
+    first.compare_and_swap("s1", 0, {"mode": "Work"})
+    assert second.get("s1") == (1, {"mode": "Work"})
+    first.close()
+    second.close()
+
+def test_timer_state_moves_between_clocks():
+    # Two workers whose monotonic clocks have nothing in common
+    wall = FakeClock(1_000_000.0)
+    here = PomodoroTimer(work_duration=100, clock=FakeClock(50.0))
+    here.start()
+    here._clock.now += 30
+    wall.now += 30
+    state = here.to_state(wall_clock=wall)
+
+    wall.now += 5  # the user reaches the other worker 5 s later
+    there = PomodoroTimer(clock=FakeClock(9_000.0))
+    there.load_state(state, wall_clock=wall)
+    assert there.is_running
+    assert there.work_duration == 100
+    assert there.remaining() == pytest.approx(65)
+
+    there._clock.now += 65
+    assert there.snapshot()["mode"] == TimerMode.SHORT_BREAK
+    assert there.sessions_completed == 1
+
+def test_only_one_worker_records_a_completion(store):
+    completions = []
+    syncs = []
+    for _ in range(2):
+        timer = PomodoroTimer(work_duration=10, clock=FakeClock())
+        sync = TimerSync(store, "s1", timer)
+        timer.on_complete(lambda t, done, nxt, sync=sync: sync.push() and completions.append(done))
+        syncs.append(sync)
+
+    first, second = syncs
+    first.timer.start()
+    assert first.push()
+    assert second.pull()
+    assert second.timer.is_running
+
+    for sync in syncs:
+        sync.timer._clock.now = 10
+        sync.timer.poll()
+    assert completions == [TimerMode.WORK]
+    # The loser adopted the winner's state
+    assert second.version == first.version
+    assert second.timer.mode == TimerMode.SHORT_BREAK
+
+def test_incomplete_store_fails_on_construction():
+    class VersionOnly(SessionStore):
+        def version(self, session_id):
+            return 0
+
+    with pytest.raises(TypeError):
+        VersionOnly()
@@ -0,0 +1,60 @@
+import json
+import pytest
+from data_manager import PomodoroDataManager, StatsCache, get_shared_data_manager
+
+@pytest.fixture
+def cache():
+    return StatsCache(maxsize=2)
+
+def _write(path, count):
+    with open(path, "w") as f:
+        json.dump({"date": "2025-03-25", "pomodoros_completed": count, "last_completed": None}, f)
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def test_hit_after_first_read(cache, tmp_path):
+    path = str(tmp_path / "stats_2025-03-25.json")
+    _write(path, 1)
+    assert cache.get(path, _load)["pomodoros_completed"] == 1
+    assert cache.get(path, _load)["pomodoros_completed"] == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_changed_file_is_reread(cache, tmp_path):
+    path = str(tmp_path / "stats_2025-03-25.json")
+    _write(path, 1)
+    cache.get(path, _load)
+    _write(path, 12)
+    assert cache.get(path, _load)["pomodoros_completed"] == 12
+    assert cache.misses == 2
+
+def test_missing_file_returns_none(cache, tmp_path):
+    assert cache.get(str(tmp_path / "missing.json"), _load) is None
+
+def test_lru_eviction(cache, tmp_path):
+    paths = [str(tmp_path / f"stats_{i}.json") for i in range(3)]
+    for path in paths:
+        _write(path, 1)
+        cache.get(path, _load)
+    assert cache.info()["size"] == 2
+    cache.get(paths[0], _load)
+    assert cache.misses == 4
+
+def test_returned_stats_do_not_alias_cache(cache, tmp_path):
+    path = str(tmp_path / "stats_2025-03-25.json")
+    _write(path, 1)
+    cache.get(path, _load)["pomodoros_completed"] = 99
+    assert cache.get(path, _load)["pomodoros_completed"] == 1
+
+def test_manager_reads_its_own_writes_from_cache(tmp_path):
+    manager = PomodoroDataManager(data_dir=str(tmp_path), cache=StatsCache())
+    manager.save_pomodoro_completed()
+    manager.save_task_completed("Plan sprint")
+    hits_before = manager.cache_info()["hits"]
+    assert manager.load_daily_stats()["pomodoros_completed"] == 1
+    assert manager.get_tasks_stats()["total_completed"] == 1
+    assert manager.cache_info()["hits"] == hits_before + 2
+
+def test_shared_manager_is_reused(tmp_path):
+    assert get_shared_data_manager(str(tmp_path)) is get_shared_data_manager(str(tmp_path))
@@ -0,0 +1,61 @@
+import pytest
+from datetime import date
+
+pytest.importorskip("pandas")
+pytest.importorskip("altair")
+pytest.importorskip("streamlit")
+
+from data_manager import PomodoroDataManager, StatsCache
+from stats_page import compute_stats, load_page_data
+
+TODAY = date(2025, 3, 25)
+
+def weekly_summary(daily_counts, by_status):
+    return {
+        "total_pomodoros": sum(daily_counts.values()),
+        "days_active": sum(1 for count in daily_counts.values() if count),
+        "daily_counts": daily_counts,
+        "task_counts": {"total": sum(by_status.values()), "by_status": by_status},
+    }
+
+def test_compute_stats_fills_the_week():
+    daily = {
+        "date": "2025-03-25",
+        "pomodoros_completed": 2,
+        "last_completed": "2025-03-25T10:15:00",
+        "completed_tasks": [{"description": "Ship it", "status": "Blocked", "completed_at": "2025-03-25T11:00:00"}, "Legacy"],
+    }
+    summary = weekly_summary({"2025-03-20": 3, "2025-03-25": 2}, {"Open": 0, "In Progress": 0, "Done": 1, "Blocked": 1})
+    stats = compute_stats(daily, summary, TODAY)
+
+    assert stats["weekly"]["Day"].tolist() == ["Wed", "Thu", "Fri", "Sat", "Sun", "Mon", "Tue"]
+    assert stats["weekly"]["Pomodoros"].tolist() == [0, 0, 3, 0, 0, 0, 2]
+    assert stats["best_day"] == ("Thursday", 3)
+    assert stats["daily_average"] == 2.5
+    assert stats["status"].to_dict("records") == [{"Status": "Done", "Count": 1}, {"Status": "Blocked", "Count": 1}]
+    assert stats["today"] == {"pomodoros": 2, "tasks": 2, "last_completed": "10:15:00"}
+    assert stats["recent_tasks"].splitlines()[0] == "**1.** Ship it 🔴 - *completed at 11:00:00*"
+
+def test_best_day_tie_goes_to_the_most_recent_day():
+    summary = weekly_summary({"2025-03-20": 3, "2025-03-24": 3}, {"Open": 0, "In Progress": 0, "Done": 0, "Blocked": 0})
+    stats = compute_stats({"date": "2025-03-25", "pomodoros_completed": 0}, summary, TODAY)
+    assert stats["best_day"] == ("Monday", 3)
+
+def test_page_data_is_reused_until_a_write(tmp_path):
+    manager = PomodoroDataManager(data_dir=str(tmp_path))
+    first = load_page_data(manager)
+    assert load_page_data(manager) is first
+    manager.save_pomodoro_completed()
+    second = load_page_data(manager)
+    assert second is not first
+    assert second[0]["today"]["pomodoros"] == 1
+
+def test_page_data_sees_other_process_writes(tmp_path):
+    manager = PomodoroDataManager(data_dir=str(tmp_path))
+    load_page_data(manager)
+    other = PomodoroDataManager(data_dir=str(tmp_path), cache=StatsCache())
+    other.save_pomodoro_completed()
+    other.close()
+    stats, _ = load_page_data(manager)
+    assert stats["today"]["pomodoros"] == 1
+    assert stats["weekly"]["Pomodoros"].sum() == 1
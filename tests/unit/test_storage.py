@@ -0,0 +1,134 @@
+import json
+import pytest
+from datetime import date, timedelta
+from data_manager import PomodoroDataManager
+from event_log import pomodoro_event, task_event
+from file_locking import FileLock, RetryPolicy
+from storage import SQLiteStorage, create_storage, migrate_json_to_sqlite
+
+DAY = date(2025, 3, 25)
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    storage = SQLiteStorage(str(tmp_path))
+    yield storage
+    storage.close()
+
+def test_sqlite_uses_wal(sqlite_storage):
+    mode = sqlite_storage._connect().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+def test_sqlite_round_trip(sqlite_storage):
+    sqlite_storage.append_event(DAY, pomodoro_event("2025-03-25T09:00:00"))
+    sqlite_storage.append_event(DAY, pomodoro_event("2025-03-25T10:00:00"))
+    stats = sqlite_storage.append_event(DAY, task_event({"description": "Ship it", "status": "Blocked"}))
+    assert stats == {
+        "date": "2025-03-25",
+        "pomodoros_completed": 2,
+        "last_completed": "2025-03-25T10:00:00",
+        "completed_tasks": [{"description": "Ship it", "status": "Blocked"}],
+    }
+
+def test_sqlite_summary(sqlite_storage):
+    for offset in range(40):
+        day = DAY - timedelta(days=offset)
+        sqlite_storage.append_events(day, [pomodoro_event(), task_event("legacy task")])
+    summary = sqlite_storage.summarize(DAY - timedelta(days=6), DAY, include_daily=True)
+    assert summary["total_pomodoros"] == 7
+    assert summary["days_active"] == 7
+    assert summary["task_counts"]["by_status"]["Done"] == 7
+    assert len(summary["daily_counts"]) == 7
+
+@pytest.mark.parametrize("storage", ["json", "eventlog", "sqlite"])
+def test_backends_agree(tmp_path, storage):
+    manager = PomodoroDataManager(data_dir=str(tmp_path), storage=storage)
+    manager.save_pomodoro_completed()
+    manager.save_pomodoro_completed()
+    manager.save_task_completed("Review", {"description": "Review", "status": "In Progress"})
+    manager.save_task_completed("Old style")
+
+    assert manager.load_daily_stats()["pomodoros_completed"] == 2
+    assert manager.get_tasks_stats()["by_status"] == {"Open": 0, "In Progress": 1, "Done": 1, "Blocked": 0}
+    weekly = manager.get_weekly_summary()
+    assert weekly["total_pomodoros"] == 2
+    assert weekly["task_counts"]["total"] == 2
+    manager.close()
+
+def test_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        create_storage("xml", str(tmp_path))
+
+def test_migrate_json_to_sqlite(tmp_path):
+    for offset, count in enumerate([3, 0, 1]):
+        day_iso = (DAY - timedelta(days=offset)).isoformat()
+        with open(tmp_path / f"stats_{day_iso}.json", "w") as f:
+            json.dump({
+                "date": day_iso,
+                "pomodoros_completed": count,
+                "last_completed": f"{day_iso}T12:00:00" if count else None,
+                "completed_tasks": [{"description": "Task", "completed_at": f"{day_iso}T12:30:00"}],
+            }, f)
+    (tmp_path / "stats_not-a-day.json").write_text("{}")
+
+    assert migrate_json_to_sqlite(str(tmp_path)) == 3
+    # Re-running does not duplicate anything
+    assert migrate_json_to_sqlite(str(tmp_path)) == 0
+
+    storage = SQLiteStorage(str(tmp_path))
+    assert storage.load_day(DAY)["pomodoros_completed"] == 3
+    assert storage.load_day(DAY)["last_completed"] == "2025-03-25T12:00:00"
+    summary = storage.summarize(DAY - timedelta(days=2), DAY)
+    assert summary["total_pomodoros"] == 4
+    assert summary["days_active"] == 2
+    assert summary["task_counts"]["total"] == 3
+    storage.close()
+
+@pytest.mark.parametrize("storage", ["json", "eventlog", "sqlite"])
+def test_data_version_tracks_writes(tmp_path, storage):
+    manager = PomodoroDataManager(data_dir=str(tmp_path), storage=storage)
+    today = manager._today()
+    week_start = today - timedelta(days=6)
+    version = manager.data_version(week_start, today)
+    assert manager.data_version(week_start, today) == version
+
+    manager.save_pomodoro_completed()
+    assert manager.data_version(week_start, today) != version
+
+    # Another process writing is picked up too
+    version = manager.data_version(week_start, today)
+    other = PomodoroDataManager(data_dir=str(tmp_path), storage=storage)
+    other.save_task_completed("Elsewhere")
+    other.close()
+    assert manager.data_version(week_start, today) != version
+    manager.close()
+
+@pytest.mark.parametrize("storage", ["json", "eventlog"])
+def test_rollup_catches_write_racing_own_write(tmp_path, storage):
+    first = create_storage(storage, str(tmp_path))
+    second = create_storage(storage, str(tmp_path))
+    first.get_rollup_index()
+    write_events = first._write_events
+
+    def write_then_race(day, events):
+        # Another process writes right after ours, before the rollup is updated
+        result = write_events(day, events)
+        second.append_event(day, pomodoro_event())
+        return result
+
+    first._write_events = write_then_race
+    first.append_event(DAY, pomodoro_event())
+    first.refresh()
+    assert first.summarize(DAY, DAY)["total_pomodoros"] == 2
+    first.close()
+    second.close()
+
+def test_file_lock_released_when_lock_file_cannot_open(tmp_path):
+    path = str(tmp_path / "missing" / "stats.json")
+    policy = RetryPolicy(timeout=0.2)
+    for _ in range(2):
+        # Each attempt fails on the missing directory, not on a leaked thread lock
+        with pytest.raises(FileNotFoundError):
+            FileLock(path, policy).acquire()
+    (tmp_path / "missing").mkdir()
+    with FileLock(path, policy):
+        pass
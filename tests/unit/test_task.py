@@ -0,0 +1,41 @@
+import pytest
+from datetime import date, datetime
+from src.models.task import Task, TaskStatus
+
+def test_round_trip():
+    task = Task("Write docs", due_date="2025-03-25", status="In Progress", notes="README",
+                created_at="2025-03-20T09:30:00", id=7)
+    assert task.due_date == date(2025, 3, 25)
+    assert task.created_at == datetime(2025, 3, 20, 9, 30)
+    assert task.status is TaskStatus.IN_PROGRESS
+    assert Task.from_dict(task.to_dict()) == task
+
+def test_to_dict_leaves_out_unset_fields():
+    assert Task("Inbox zero").to_dict() == {"description": "Inbox zero", "status": "Open"}
+
+def test_legacy_record():
+    task = Task.from_dict({"description": "Old task", "completed_at": "2025-03-01T10:00:00"})
+    assert task.status is TaskStatus.OPEN
+    assert task.completed_at == datetime(2025, 3, 1, 10)
+
+def test_slots_and_shared_dates():
+    first = Task("A", due_date="2025-03-25")
+    second = Task("B", due_date="2025-03-25")
+    assert first.due_date is second.due_date
+    assert not hasattr(first, "__dict__")
+    with pytest.raises(AttributeError):
+        first.editing = True
+
+def test_unknown_status_rejected():
+    with pytest.raises(ValueError):
+        Task("Bad", status="Someday")
+
+def test_manager_saves_task(tmp_path):
+    from data_manager import PomodoroDataManager, StatsCache
+    manager = PomodoroDataManager(data_dir=str(tmp_path), cache=StatsCache())
+    task = Task("Ship it", due_date="2025-03-25", status="Done", id=3)
+    stats = manager.save_task_completed(task)
+    record = stats["completed_tasks"][0]
+    assert record["description"] == "Ship it" and record["status"] == "Done"
+    assert "id" not in record and "completed_at" in record
+    assert manager.get_tasks_stats()["by_status"]["Done"] == 1
@@ -0,0 +1,96 @@
+import os
+from datetime import date
+from src.models.task import Task, TaskStatus
+import task_backlog
+from task_backlog import TaskBacklog
+
+def descriptions(tasks):
+    return [task.description for task in tasks]
+
+def test_changes_survive_a_new_instance(tmp_path):
+    backlog = TaskBacklog(str(tmp_path), fsync=False)
+    first = backlog.add(Task("Write report", due_date="2025-03-12"))
+    second = backlog.add(Task("Fix bug", due_date="2025-03-10"))
+    backlog.update(first, status="In Progress", notes="half done")
+    backlog.remove(second)
+
+    reloaded = TaskBacklog(str(tmp_path), fsync=False)
+    assert not reloaded.loaded
+    assert descriptions(reloaded) == ["Write report"]
+    task = reloaded.get(first)
+    assert task.status == TaskStatus.IN_PROGRESS
+    assert task.notes == "half done"
+    assert task.due_date == date(2025, 3, 12)
+
+def test_each_change_appends_one_record(tmp_path):
+    backlog = TaskBacklog(str(tmp_path), fsync=False)
+    for i in range(5):
+        backlog.add(Task(f"Task {i}"))
+    before = os.path.getsize(backlog.path)
+    backlog.update(3, status="Blocked")
+    with open(backlog.path, "rb") as f:
+        f.seek(before)
+        assert f.read().count(b"\n") == 1
+
+def test_torn_tail_is_ignored_and_overwritten(tmp_path):
+    backlog = TaskBacklog(str(tmp_path), fsync=False)
+    backlog.add(Task("Kept"))
+    with open(backlog.path, "ab") as f:
+        f.write(b'{"op":"upsert","task":{"descr')
+
+    reloaded = TaskBacklog(str(tmp_path), fsync=False)
+    assert descriptions(reloaded) == ["Kept"]
+    reloaded.add(Task("After crash"))
+    assert descriptions(TaskBacklog(str(tmp_path), fsync=False)) == ["Kept", "After crash"]
+
+def test_picks_up_other_instances_changes(tmp_path):
+    ours = TaskBacklog(str(tmp_path), fsync=False)
+    theirs = TaskBacklog(str(tmp_path), fsync=False)
+    ours.add(Task("Ours"))
+    theirs.add(Task("Theirs"))
+    assert descriptions(ours) == ["Ours", "Theirs"]
+    assert [task.id for task in ours] == [1, 2]
+
+def test_compaction_keeps_live_tasks_and_ids(tmp_path):
+    backlog = TaskBacklog(str(tmp_path), fsync=False, compact_min_records=10, compact_ratio=2)
+    other = TaskBacklog(str(tmp_path), fsync=False)
+    for i in range(12):
+        backlog.add(Task(f"Task {i}"))
+    assert len(other) == 12
+    for task_id in range(1, 12):
+        backlog.remove(task_id)
+
+    with open(backlog.path, "rb") as f:
+        # Compacted to a meta record plus the live task(s)
+        assert f.read().count(b"\n") < 10
+    assert descriptions(other) == ["Task 11"]
+    # Ids of removed tasks are not reused after a restart
+    assert TaskBacklog(str(tmp_path), fsync=False).add(Task("New")) == 13
+
+def test_query_and_counts_delegate_to_the_store(tmp_path):
+    backlog = TaskBacklog(str(tmp_path), fsync=False)
+    backlog.add(Task("Later", due_date="2025-03-20"))
+    backlog.add(Task("Sooner", due_date="2025-03-10", status="Blocked"))
+    assert descriptions(backlog.query()) == ["Sooner", "Later"]
+    assert backlog.count(["Open"]) == 1
+    assert backlog.status_counts()[TaskStatus.BLOCKED] == 1
+
+def test_failed_write_leaves_tasks_unchanged(tmp_path, monkeypatch):
+    backlog = TaskBacklog(str(tmp_path), fsync=False)
+    task_id = backlog.add(Task("Kept"))
+
+    def fail(record):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(task_backlog, "_encode", fail)
+    for change in (lambda: backlog.add(Task("Lost")),
+                   lambda: backlog.update(task_id, status="Blocked"),
+                   lambda: backlog.remove(task_id)):
+        try:
+            change()
+        except OSError:
+            pass
+        else:
+            raise AssertionError("write should have failed")
+    assert descriptions(backlog) == ["Kept"]
+    assert backlog.get(task_id).status == TaskStatus.OPEN
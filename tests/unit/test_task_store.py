@@ -0,0 +1,75 @@
+import pytest
+from datetime import date
+from src.models.task import Task, TaskStatus
+from src.models.task_store import TaskStore, page_bounds
+
+def make_store():
+    store = TaskStore()
+    for description, status, due in [
+        ("Write report", "Open", "2025-03-12"),
+        ("Review PR", "In Progress", "2025-03-10"),
+        ("Fix bug", "Open", "2025-03-10"),
+        ("Deploy", "Blocked", "2025-03-20"),
+    ]:
+        store.add(Task(description, due_date=due, status=status))
+    return store
+
+def descriptions(tasks):
+    return [task.description for task in tasks]
+
+def test_ids_are_stable():
+    store = make_store()
+    store.remove(1)
+    task_id = store.add(Task("New", due_date=date(2025, 3, 1)))
+    assert task_id == 5
+    assert store.get(2).description == "Review PR"
+    assert store.get(task_id).id == task_id
+
+def test_query_merges_statuses_in_due_order():
+    store = make_store()
+    assert descriptions(store.query()) == ["Review PR", "Fix bug", "Write report", "Deploy"]
+    assert descriptions(store.query(["Open"])) == ["Fix bug", "Write report"]
+    assert descriptions(store.query([TaskStatus.OPEN])) == ["Fix bug", "Write report"]
+
+def test_query_date_range_is_inclusive():
+    store = make_store()
+    assert descriptions(store.query(start="2025-03-10", end="2025-03-10")) == ["Review PR", "Fix bug"]
+    assert descriptions(store.query(end=date(2025, 3, 11))) == ["Review PR", "Fix bug"]
+    assert store.count(["Open", "Blocked"], start=date(2025, 3, 11)) == 2
+
+def test_update_reindexes():
+    store = make_store()
+    store.update(3, status="Done", due_date="2025-04-01")
+    assert store.get(3).status is TaskStatus.DONE
+    assert descriptions(store.query(["Open"])) == ["Write report"]
+    assert descriptions(store.query(["Done"])) == ["Fix bug"]
+    assert store.status_counts() == {"Open": 1, "In Progress": 1, "Done": 1, "Blocked": 1}
+
+def test_remove_unknown_raises():
+    store = make_store()
+    store.remove(4)
+    assert 4 not in store and len(store) == 3
+    with pytest.raises(KeyError):
+        store.remove(4)
+
+def test_tasks_without_due_date_sort_last():
+    store = make_store()
+    store.add(Task("Someday"))
+    assert descriptions(store.query())[-1] == "Someday"
+    assert store.count(end=date(2025, 12, 31)) == 4
+
+def test_query_window_matches_full_results():
+    store = make_store()
+    for i in range(20):
+        store.add(Task(f"Task {i}", due_date=date(2025, 3, 1 + i % 28), status=["Open", "Blocked"][i % 2]))
+    for statuses in (None, ["Open"], ["Open", "Blocked"]):
+        full = list(store.query(statuses))
+        for offset in (0, 3, 10, 30):
+            assert list(store.query(statuses, offset=offset, limit=5)) == full[offset:offset + 5]
+        assert list(store.query(statuses, offset=4)) == full[4:]
+
+def test_page_bounds_clamps():
+    assert page_bounds(0, 1, 20) == (1, 1, 0)
+    assert page_bounds(45, 2, 20) == (2, 3, 20)
+    assert page_bounds(45, 9, 20) == (3, 3, 40)
+    assert page_bounds(45, 0, 20) == (1, 3, 0)
@@ -1,5 +1,5 @@
 import pytest
-from src.core.timer import PomodoroTimer
+from src.core.timer import PomodoroTimer, TimerMode
 
 def test_timer_initialization():
     timer = PomodoroTimer()
@@ -26,4 +26,96 @@ def test_timer_reset():
     timer.current_time = 300  # Set some time
     timer.reset()
     assert timer.current_time == 0
-    assert not timer.is_running 
\ No newline at end of file
+    assert not timer.is_running 
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+def make_timer(**kwargs):
+    clock = FakeClock()
+    return PomodoroTimer(work_duration=60, break_duration=10, long_break_duration=30, clock=clock, **kwargs), clock
+
+def test_remaining_counts_down_from_deadline():
+    timer, clock = make_timer()
+    timer.start()
+    assert timer.deadline == clock.now + 60
+    clock.advance(15.5)
+    assert timer.remaining() == 44.5
+    assert timer.current_time == 15
+
+def test_pause_and_resume_keep_elapsed_time():
+    timer, clock = make_timer()
+    timer.start()
+    clock.advance(20)
+    timer.pause()
+    assert timer.deadline is None
+    clock.advance(500)
+    assert timer.remaining() == 40
+    timer.start()
+    clock.advance(10)
+    assert timer.remaining() == 30
+
+def test_expired_phase_transitions_and_fires_callback_once():
+    timer, clock = make_timer()
+    completions = []
+    timer.on_complete(lambda t, done, nxt: completions.append((done, nxt)))
+    timer.start()
+    clock.advance(61)
+    assert timer.remaining() == 10
+    assert timer.remaining() == 10
+    assert completions == [(TimerMode.WORK, TimerMode.SHORT_BREAK)]
+    assert timer.mode == TimerMode.SHORT_BREAK
+    assert timer.sessions_completed == 1
+    assert not timer.is_running
+
+def test_auto_start_chains_phases_without_drift():
+    timer, clock = make_timer(auto_start=True, long_break_interval=2)
+    completions = []
+    timer.on_complete(lambda t, done, nxt: completions.append(done))
+    timer.start()
+    # work (60) + short break (10) + work (60) + 5s into the long break
+    clock.advance(135)
+    assert timer.remaining() == 25
+    assert timer.mode == TimerMode.LONG_BREAK
+    assert completions == [TimerMode.WORK, TimerMode.SHORT_BREAK, TimerMode.WORK]
+    assert timer.sessions_completed == 2
+
+def test_skip_completes_current_phase():
+    timer, clock = make_timer(long_break_interval=1)
+    completions = []
+    timer.on_complete(lambda t, done, nxt: completions.append(nxt))
+    timer.skip()
+    assert completions == [TimerMode.LONG_BREAK]
+    assert timer.remaining() == 30
+    timer.skip()
+    assert timer.mode == TimerMode.WORK
+
+def test_duration_change_moves_deadline():
+    timer, clock = make_timer()
+    timer.start()
+    clock.advance(30)
+    timer.work_duration = 120
+    assert timer.remaining() == 90
+    assert timer.progress() == 0.25
+
+def test_durations_must_be_positive():
+    with pytest.raises(ValueError):
+        PomodoroTimer(work_duration=0)
+    with pytest.raises(ValueError):
+        PomodoroTimer(break_duration=-5)
+
+def test_zero_length_phase_does_not_hang_poll():
+    timer, clock = make_timer(auto_start=True)
+    timer.start()
+    timer.work_duration = timer.break_duration = 0
+    assert len(timer.poll()) == 1
+    assert len(timer.poll()) == 1
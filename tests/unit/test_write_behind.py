@@ -0,0 +1,100 @@
+import time
+import threading
+import pytest
+from datetime import date
+from data_manager import PomodoroDataManager, StatsCache
+from event_log import pomodoro_event, task_event
+from storage import JsonFileStorage
+from write_behind import WriteBehindQueue
+
+DAY = date(2025, 3, 25)
+
+class RecordingStorage(JsonFileStorage):
+    """JSON storage that records each batch it is asked to write"""
+
+    def __init__(self, data_dir, fail_times=0):
+        super().__init__(data_dir)
+        self.batches = []
+        self.fail_times = fail_times
+
+    def append_events(self, day, events):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise OSError("disk full")
+        self.batches.append((day, list(events)))
+        return super().append_events(day, events)
+
+@pytest.fixture
+def storage(tmp_path):
+    return RecordingStorage(str(tmp_path))
+
+def test_reads_see_buffered_writes(storage):
+    queue = WriteBehindQueue(storage, flush_threshold=100, flush_interval=60)
+    queue.enqueue(DAY, pomodoro_event())
+    queue.enqueue(DAY, task_event({"description": "Write docs"}))
+    assert storage.batches == []
+    stats = queue.load_day(DAY)
+    assert stats["pomodoros_completed"] == 1
+    assert stats["completed_tasks"] == [{"description": "Write docs"}]
+    queue.close()
+
+def test_events_are_coalesced_per_day(storage):
+    queue = WriteBehindQueue(storage, flush_threshold=100, flush_interval=60)
+    for _ in range(5):
+        queue.enqueue(DAY, pomodoro_event())
+    assert queue.flush() == 5
+    assert len(storage.batches) == 1
+    assert storage.load_day(DAY)["pomodoros_completed"] == 5
+    queue.close()
+
+def test_size_threshold_triggers_flush(storage):
+    queue = WriteBehindQueue(storage, flush_threshold=3, flush_interval=60)
+    flushed = threading.Event()
+    original = storage.append_events
+    storage.append_events = lambda day, events: (original(day, events), flushed.set())[0]
+    for _ in range(3):
+        queue.enqueue(DAY, pomodoro_event())
+    assert flushed.wait(5)
+    queue.close()
+    assert storage.load_day(DAY)["pomodoros_completed"] == 3
+
+def test_close_flushes_everything(storage):
+    queue = WriteBehindQueue(storage, flush_threshold=100, flush_interval=60)
+    queue.enqueue(DAY, pomodoro_event())
+    queue.close()
+    assert storage.load_day(DAY)["pomodoros_completed"] == 1
+    with pytest.raises(RuntimeError):
+        queue.enqueue(DAY, pomodoro_event())
+
+def test_failed_flush_keeps_events(tmp_path):
+    storage = RecordingStorage(str(tmp_path), fail_times=1)
+    queue = WriteBehindQueue(storage, flush_threshold=100, flush_interval=60)
+    queue.enqueue(DAY, pomodoro_event())
+    with pytest.raises(OSError):
+        queue.flush()
+    assert queue.pending_count() == 1
+    assert queue.load_day(DAY)["pomodoros_completed"] == 1
+    assert queue.flush() == 1
+    queue.close()
+
+def test_failing_flush_backs_off(tmp_path):
+    storage = RecordingStorage(str(tmp_path), fail_times=10 ** 6)
+    queue = WriteBehindQueue(storage, flush_threshold=1, flush_interval=0.05, max_retry_delay=0.2)
+    queue.enqueue(DAY, pomodoro_event())
+    time.sleep(0.6)
+    attempts = 10 ** 6 - storage.fail_times
+    # 0.05 + 0.1 + 0.2 + 0.2 ... rather than a busy loop
+    assert 2 <= attempts <= 8
+    storage.fail_times = 0
+    queue.close()
+    assert [(day, len(events)) for day, events in storage.batches] == [(DAY, 1)]
+
+def test_manager_write_behind(tmp_path):
+    manager = PomodoroDataManager(data_dir=str(tmp_path), cache=StatsCache(), write_behind=True,
+                                  flush_threshold=100, flush_interval=60)
+    assert manager.save_pomodoro_completed()["pomodoros_completed"] == 1
+    manager.save_task_completed("Refactor")
+    assert manager.get_tasks_stats()["total_completed"] == 1
+    assert manager.get_weekly_summary()["total_pomodoros"] == 1
+    manager.close()
+    assert PomodoroDataManager(data_dir=str(tmp_path)).load_daily_stats()["pomodoros_completed"] == 1
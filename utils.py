@@ -1,27 +1,60 @@
 import os
-import base64
-from io import BytesIO
+import time
+import functools
+import streamlit as st
+from assets import sound_html
+from instrumentation import instrumentation
 
 def get_sound_html():
     """
     Returns HTML for a simple notification sound.
-    This is a workaround since we can't directly play sounds in Streamlit.
+    The WAV lives in static/ and the markup is built once per process (see assets.py).
     """
-    html = """
-    <script>
-    function playSound() {
-        const audio = new Audio(
-            "data:audio/wav;base64,UklGRjQnAABXQVZFZm10IBAAAAABAAEAQB8AAEAfAAABAAgAZGF0YRAnAACAgICAgICAgICAgICAgICAgICAgICAgICAf3hxeH+AfXZ1eHx6dnR5fYGFgoOKi42bnJ2cnp6hpKKkoqahn6Cdm5mYlpaTkpCNioeFgoB8e3l1c3FvbGtqaWdmZmRlZGNkZGVmZ2dpbG1vcXJ1dnd6fX+Bg4WGh4iJioqKioqJiIeGhIF+fHl3dHJwbmtoZmRhX11cWlhWVFRTUlFRUVJSU1VXWFpcXmFjZmhrbW9yc3Z4eXt9f4CBgoODhISDg4KBgH99fHp4dnV0cnFwbm1sa2ppZ2ZmZWRkZGRkZWVmZ2lqbG5vcXN1dnh6fH5/gYKEhYaHiImJiYmJiYiHhoWEgoF/fXt5d3VzcW9tamlnZWNiYF9dXFtZWVhXV1hYWFlaW1xeX2FjZWdpa21vcnR2eHp7fX+AgYKDg4SEhIODgoGAf317enl3dXRycXBubWxraWhnZmZlZGRkZGRlZWZnaGprbW9xc3V3eXt8foCAgoOEhYaGh4eHh4eGhoWEg4KBgH59e3p4dnVzcW9ua2poZmVjYmBfXl1bWllZWFhYWFlaW1xeX2FjZWdpa21vcnR2eHp8fX+BgoOEhIWFhYWEhIOCgYB+fXt6eHd1c3JwbmxramhnZmVkY2NjYmJjY2RlZmdpa21vcXN1d3l7fX+AgoOEhYaHiIiIiIiIiIeGhYSCgYB+fHt5d3VzcW9ta2poZmRjYV9eXFtaWVhXV1ZXV1hZWlxdX2BiZGZoa21vcnR2eHp8foCBgoOEhYWFhYWFhIOCgYB/fXt6eHd1dHJwbm1sa2loZ2ZlZGNjY2JjY2RlZmdpam1vcXN1d3l7fX+BgoOFhoeHiIiJiYiIiIeGhYSCgYB+fHp5d3VzcW9ta2hnZWRiYF9dXFpZWFdWVlZWV1hZWlxeYGJkZmhrbW9ydHd5e31/gIKDhIWGhoaGhoaFhIOCgYB/fXx6eXd2dHJwbm1ramloZmVlZGNjYmNjZGVmZ2lrbW9xc3V3eXt9f4CCg4SGh4eIiImJiYmIh4aFhIOBgH58e3l3dXNxb21raGdlY2JgX11cWllYV1ZWVlZXWFlaXF5gYmRmaGttb3J0dnh6fH6AgoOEhYWGhoaGhoWEg4KBf359fHp4d3VzcnBubGtpaGdmZWRjY2NjY2RlZmdpa21vcXN1d3l7fX+BgoOFhoeIiIiJiYmIiIeGhYOCgH9+fHp4dnRycG5samdlZGJhX15cW1lYV1ZWVVZWWFlaXF1fYWNlZ2lrbW9ydHZ4enx+gIGDhIWFhoaGhoWFhIOCgX9+fHt5eHZ0c3Fvbm1ramhnZmVkY2NiYmNjZWZnaWptb3Fzdnd5e31/gYKEhYaHiIiJiYmJiIiHhoWEgoF/fnt6eHZ0cnBubGpoZmViYWBeXVtaWVhXVlVWVldYWVtcXmBiZGZoa21vcnR2eHp8foCBg4SFhYaGhoaGhYWEg4KAfn18e3l3dnRycG5ta2poZ2ZlZGRjY2NkZGVnZ2prbW9ydHZ4ent9f4GCg4WGh4iIiYmJiYmIh4aFg4KBf357enl3dXNxb25samdlZGJhX15dW1pZWFdWVlZXWFlbXV9gYmRmaGptb3F0dnl7fX6AgoOEhYaGhoaGhoWFg4KBgH59e3p4d3VzcXBubGtpaGdmZWRkY2NjZGRmZ2lqbG5wcnR2eHp7fX+BgoOFhoaHiIiIiIiIh4aFhIOBgH99e3p4dnRycG5sa2lnZmRjYWBfXVxbWllYWFdYWFlbXF5fYWNlZ2lrbW9ydHZ4ent9f4CCg4SFhYWGhoWFhYSEg4GAf359e3p4d3VzcXBubGtpaGdmZWRkZGNkZGVmaGlrbG5wcnR2eHp7fX+AgoOEhYaHh4eIiIeHhoaFhIOBgH9+fHt5eHZ0cnFvbWtqaGdlZGNiYWBeXV1bWllZWFhZWVpdXl9hY2VnaWttb3F0dXd5e31+gIGDhIWFhYaGhYWFhISDgoGAfn18e3l4dnVzcW9ubGtpaGdmZWVkZGRkZWZnaWpsbm9xc3V3eXp8fX+BgoOEhYaGh4eHh4eGhoWEg4KBf39+fHt5eHZ1c3Fwbm1raWhmZWRjYmFgX15dXFtaWllZWlpcXV5fYWJkZWdpa21vcXN1d3h6fH1/gIKDg4SEhYWFhYSEg4OCgYB/fXx7enh3dXRycG9ta2ppZ2ZmZWRkZGRlZmdoaWttbnBxc3R2eHl7fH5/gYKDhIWFhoaGhoaGhYWEg4KBgH9+fHt6eHd2dHJxb25sa2poZ2ZlZGNiYWBfXl5dXFtbW1tcXV5fYGFjZGZnaWptbW9xc3R2eHl7fH5/gYGCg4SEhIWFhISDg4KBgH9+fXx6eXh3dXRycXBvbWxraWhnZmZlZWRlZWZnaGlqbG1vcHJzdXZ4eXt8fX+AgoKDhISFhYWFhYWEg4OCgYGAf359fHt6eXd2dXNycG9ubGtqaWdmZWRjYmJhYGBfX19fX2BhYWJjZGVmaGlqa2xucHFydHV2eHl6e3x+f3+BgYKCg4ODg4OCgoGBgH9/fn18e3p5eHd2dXRzcXBvbm1sa2ppZ2ZmZWRkZGRkZGVlZmdoaWprbG1ucHFydHV2d3h5ent8fX5/gICBgYKCgoKCgYGBgH9/fn59fHt7enl4d3Z1dHNycXBvbm1sa2tqaWhnZ2ZmZWVlZWVmZmdnaGlqa2xtbm9wcnJzdXV2d3h5ent7fH1+fn9/gICAgICAgH9/f39+fn18fHt6enl4d3d2dXRzcnJxcG9ubWxramppZ2ZmZWRkZGRkZGRlZWZmZ2hpamtsbnBxc3R2eHp7fX+AgoOEhYWGhoaGhYWEg4KBf359e3l3dXNxb21raWdlY2JgX11cWllYV1ZWVldYWVtdX2FjZWdpa21vcnR2eHp8foCBg4SFhYaGhoaGhYWEg4KAf359e3p4d3VzcW9ubGtpaGdmZWRkY2NjZGVmZ2lqbG5wcnR2eHp7fX+BgoOFhoaHiIiIiIiHhoWEg4GAfnx7eXd1c3Fvbmxq" +
-            "aGdlZGJhX15dXFtaWVlZWVlaW11eYGJkZmdpa21vcnR2eHp8foCBg4SFhYaGhoaFhYSEgoGAf317enl3dnRzcW9ubGtpaGdmZWVkZGRkZWZnaWptbnBydHZ4ent9f4GCg4WGh4eIiIiIiIeHhoWEgoGAfnx7eXh2dHJwbm1raGdlZGJhYF9eXVxbWllZWVlaW1xeX2FjZWZoa21vcnR2eHp8foCBg4SFhYaGhoaGhYWEg4KBf359fHp5d3Z0c3Fwbm1sa2poZ2ZlZWRkZGVlZ2hpa21vcHJ0dnd5e31/gIKDhIWGh4eIiIiIh4eGhYSDgoF/fnx7eXh2dHJxb25sa2lnZmVkY2FgX15dXFtaWVpaWltdXl9hY2RmaGptbnBydHZ4enx9f4GCg4SFhYaGhoaGhYWEg4KBgH59fHt5eHZ1c3Fwbm1samloZ2ZlZWRkZGVmaGlqbG1vcXN0dnh5e31+gIGDhIWGhoaHh4eHh4aFhISCgYB/fnx7enh3dXRycG9ta2poZ2VkY2JhYF9eXVxbW1tbXF1eX2BiY2VmaGlrbG5wcnN1dnd5ent8fn+AgYKDg4SEhISDg4OCgYCAfn59fHt6eXh3dXRzcXBvbWxsamloZ2ZmZWVlZWZnaGlqbGxucHFydHV2eHl6e3x+f3+BgYKDg4SEhISEg4OCgYGAf39+fXx7enl4d3Z1dHNycG9ubWxraWloZ2dmZmZmZmZnaGhpamtsbW5vcHFydHR1dnd4eXp7fH1+fn+AgIGBgYGBgYGAgICAfn5+fXx8e3p5eXh3dnZ1dHNycXBvbm1sa2tqaWloaGdnZ2dnZ2hpamptbm9wcnN0dXZ3eHl6e3x9fn9/gICBgYGBgYGBgICAfn59fXx7e3p5eHd2dXVzcnFwb25tbGtqaWloZ2ZmZWVlZWVmZmdoaWprra6vsLGys7S1tre4uLm6u7u8vLy9vb29vby8u7u6ubi3trW0s7GwsK+uraysq6uqqamop6elo6OioaCgn56enZycm5uampmZmZiYl5eXlpaVlZWUlJSTk5KSkZGRkJCPj4+Ojo6NjY2MjIyLi4uKioqJiYmIiIiHh4eGhoaFhYWEhISDg4OCgoKBgYGAgICAf39/fn5+fX19fHx8e3t7enp6eXl5eHh4d3d3dnZ2dXV1dHR0c3NzcnJycXFxcHBwb29vbm5ubW1tbGxsa2trampqaWlpaGhoZ2dnZmZmZWVlZGRkY2NjYmJiYWFhYGBgX19fXl5eXV1dXFxcW1tbWlpaWVlZWFhYV1dXVlZWVVVVVFRUU1NTUlJSUVFRUFBQT09PTs7ADw8PDg4ODQ0NDAwMCwsLCgoKCQkJCAgIBwcHBgYGBQUFBAQEAwMDAgICAQEBAAAAAP//////////////////////////////////////////////////////////////////////////////AABkYXRhWwUAAP////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////8="
-        );
-        audio.play();
-    }
-    playSound();
-    </script>
-    """
-    return html
+    return sound_html()
 
 def create_directories():
     """Create necessary directories for the application"""
     if not os.path.exists("data"):
-        os.makedirs("data") 
\ No newline at end of file
+        os.makedirs("data") 
+
+def fragments_enabled():
+    """Whether fragments are in use (set POMODORO_FRAGMENTS=0 to measure without them)"""
+    if os.environ.get("POMODORO_FRAGMENTS", "1") == "0":
+        return False
+    return hasattr(st, "fragment") or hasattr(st, "experimental_fragment")
+
+def fragment(func=None, run_every=None):
+    """
+    Decorator that renders ``func`` as an independently rerun unit.
+
+    Uses ``st.fragment`` (Streamlit >= 1.37) or ``st.experimental_fragment``
+    (1.33 - 1.36), so a widget inside the unit reruns only that function.
+    On older versions the function runs as part of the full script, as before.
+    The last render time of each unit is kept in ``st.session_state.unit_timings``.
+    """
+    def decorate(f):
+        @functools.wraps(f)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                timings = st.session_state.setdefault("unit_timings", {})
+                timings[f.__name__] = elapsed
+                instrumentation.record(f"unit/{f.__name__}", elapsed)
+
+        if not fragments_enabled():
+            return timed
+        impl = getattr(st, "fragment", None) or st.experimental_fragment
+        return impl(timed, run_every=run_every)
+
+    return decorate(func) if func is not None else decorate
+
+def rerun(scope="app"):
+    """Rerun the script, or only the current unit when ``scope="fragment"`` is supported"""
+    if scope == "fragment" and fragments_enabled() and hasattr(st, "fragment"):
+        st.rerun(scope="fragment")
+    if hasattr(st, "rerun"):
+        st.rerun()
+    st.experimental_rerun()
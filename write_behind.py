@@ -0,0 +1,158 @@
+import atexit
+import logging
+import threading
+import weakref
+from event_log import apply_event
+
+logger = logging.getLogger(__name__)
+
+
+def _close_at_exit(queue_ref):
+    """Flush a queue that is still alive when the interpreter exits"""
+    queue = queue_ref()
+    if queue is not None:
+        queue.close()
+
+
+class WriteBehindQueue:
+    """
+    Buffers completion events and persists them from a background thread.
+
+    ``enqueue`` only appends to an in-memory buffer, so a Streamlit rerun never
+    waits on disk. The writer thread flushes when ``flush_threshold`` events
+    are pending or every ``flush_interval`` seconds, coalescing each day's
+    events into a single ``storage.append_events`` call (one locked
+    read-modify-write per day file instead of one per event). Pending events
+    are flushed at shutdown, and a failed flush keeps its events for the next
+    attempt, which the writer thread backs off from (``flush_interval``,
+    doubling up to ``max_retry_delay`` seconds).
+
+    Reads go through ``load_day``, which overlays the day's pending events on
+    what storage returns, so callers always see their own writes.
+    """
+
+    def __init__(self, storage, flush_threshold=32, flush_interval=0.5, max_retry_delay=30.0):
+        self.storage = storage
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval
+        self.max_retry_delay = max_retry_delay
+        self.flushes = 0
+        self.events_flushed = 0
+        self.last_error = None
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._pending = {}      # day -> [events] not yet picked up by a flush
+        self._inflight = {}     # day -> [events] currently being written
+        self._written = {}      # day -> number of completed flushes of that day
+        self._pending_count = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="pomodoro-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(_close_at_exit, weakref.ref(self))
+
+    def enqueue(self, day, event):
+        """Buffer an event for ``day``; never touches the disk"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("write-behind queue is closed")
+            self._pending.setdefault(day, []).append(event)
+            self._pending_count += 1
+            if self._pending_count >= self.flush_threshold:
+                self._cond.notify_all()
+
+    def pending_count(self):
+        """Number of events not yet handed to storage"""
+        with self._cond:
+            return self._pending_count + sum(len(events) for events in self._inflight.values())
+
+    def load_day(self, day):
+        """Stored stats for ``day`` with its still-buffered events applied"""
+        while True:
+            with self._cond:
+                # Wait out a flush of this day: its events may or may not be
+                # visible in storage yet
+                self._cond.wait_for(lambda: day not in self._inflight)
+                overlay = list(self._pending.get(day, ()))
+                written = self._written.get(day, 0)
+
+            stats = self.storage.load_day(day)
+
+            with self._cond:
+                if day not in self._inflight and self._written.get(day, 0) == written:
+                    break
+        for event in overlay:
+            apply_event(stats, event)
+        return stats
+
+    def flush(self):
+        """Write every buffered event now and wait for it to complete"""
+        with self._flush_lock:
+            with self._cond:
+                if not self._pending:
+                    return 0
+                batch, self._pending, self._pending_count = self._pending, {}, 0
+                self._inflight = batch
+
+            flushed = 0
+            try:
+                for day in list(batch):
+                    events = batch[day]
+                    self.storage.append_events(day, events)
+                    flushed += len(events)
+                    with self._cond:
+                        del self._inflight[day]
+                        self._written[day] = self._written.get(day, 0) + 1
+                        self._cond.notify_all()
+            except Exception as e:
+                self.last_error = e
+                logger.exception("Write-behind flush failed; keeping %d day(s) for retry", len(self._inflight))
+                raise
+            finally:
+                with self._cond:
+                    # Anything not written goes back in front of newer events
+                    for day, events in self._inflight.items():
+                        self._pending[day] = events + self._pending.get(day, [])
+                        self._pending_count += len(events)
+                    self._inflight = {}
+                    self._cond.notify_all()
+                self.flushes += 1
+                self.events_flushed += flushed
+            return flushed
+
+    def _run(self):
+        """Writer thread: flush on size or time threshold until closed"""
+        retry_delay = 0
+        while True:
+            with self._cond:
+                if retry_delay:
+                    # The failed events are still pending, so the threshold
+                    # would wake us at once; back off unless closing
+                    self._cond.wait_for(lambda: self._closed, timeout=retry_delay)
+                else:
+                    self._cond.wait_for(
+                        lambda: self._closed or self._pending_count >= self.flush_threshold,
+                        timeout=self.flush_interval
+                    )
+                closed = self._closed
+            try:
+                self.flush()
+            except Exception:
+                if closed:
+                    return
+                retry_delay = min(max(retry_delay * 2, self.flush_interval), self.max_retry_delay)
+                continue
+            retry_delay = 0
+            if closed:
+                return
+
+    def close(self):
+        """Stop the writer thread after a final flush"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        # The thread may have exited on a failed flush; try once more here
+        if self.pending_count():
+            self.flush()